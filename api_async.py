@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import api_client
+
+# Limites do controle de concorrência adaptativo (AIMD)
+CONCORRENCIA_INICIAL = 4
+CONCORRENCIA_MINIMA = 1
+CONCORRENCIA_MAXIMA = 32
+# Acima desta latência (s) consideramos o backend sob pressão (ex: Render acordando)
+LATENCIA_ALVO = 2.0
+# Janela (s) em que no máximo um corte multiplicativo é aplicado
+JANELA_CORTE = 2.0
+
+# O limite aprendido sobrevive entre execuções: o próximo lote já começa no ritmo certo
+_limite_lock = threading.Lock()
+_limite_aprendido = float(CONCORRENCIA_INICIAL)
+
+
+def limite_atual():
+    return _limite_aprendido
+
+
+class LimiteAdaptativo:
+    """
+    Semáforo com limite que se ajusta sozinho (additive-increase / multiplicative-decrease):
+    - resposta rápida e sem erro: o limite cresce ~1 a cada "rodada" de requisições;
+    - erro ou latência acima do alvo: o limite cai pela metade (no máximo um corte por janela).
+    """
+
+    def __init__(self, inicial=None, minimo=CONCORRENCIA_MINIMA, maximo=CONCORRENCIA_MAXIMA, latencia_alvo=LATENCIA_ALVO, janela_corte=JANELA_CORTE):
+        self.limite = float(inicial if inicial is not None else _limite_aprendido)
+        self.minimo = minimo
+        self.maximo = maximo
+        self.latencia_alvo = latencia_alvo
+        self.janela_corte = janela_corte
+        self.em_uso = 0
+        self._ultimo_corte = 0.0
+        self._condicao = asyncio.Condition()
+
+    async def adquirir(self):
+        async with self._condicao:
+            await self._condicao.wait_for(lambda: self.em_uso < int(self.limite))
+            self.em_uso += 1
+
+    async def liberar(self, latencia, erro):
+        async with self._condicao:
+            self.em_uso -= 1
+            self._ajustar(latencia, erro)
+            self._condicao.notify_all()
+
+    def _ajustar(self, latencia, erro):
+        global _limite_aprendido
+        agora = time.monotonic()
+        if erro or latencia > self.latencia_alvo:
+            # Um único corte por janela: várias falhas simultâneas não derrubam o limite a zero
+            if agora - self._ultimo_corte > self.janela_corte:
+                self.limite = max(self.minimo, self.limite / 2)
+                self._ultimo_corte = agora
+        else:
+            self.limite = min(self.maximo, self.limite + 1 / self.limite)
+
+        with _limite_lock:
+            _limite_aprendido = self.limite
+
+
+def _resposta_com_erro(resposta):
+    return isinstance(resposta, dict) and "erro" in resposta
+
+
+async def executar_adaptativo(funcao, itens, progresso=None, limitador=None, ao_concluir=None):
+    """
+    Executa funcao(item) para cada item com concorrência adaptativa.
+    Devolve os resultados na MESMA ORDEM de 'itens'.
+    'progresso', se informado, recebe (concluidos, total) a cada resposta.
+    'ao_concluir', se informado, recebe (posicao, resultado) assim que cada resposta chega.
+    """
+    limitador = limitador or LimiteAdaptativo()
+    loop = asyncio.get_running_loop()
+    total = len(itens)
+    resultados = [None] * total
+    concluidos = 0
+
+    with ThreadPoolExecutor(max_workers=limitador.maximo) as executor:
+
+        async def _rodar(posicao, item):
+            nonlocal concluidos
+            await limitador.adquirir()
+            inicio = time.monotonic()
+            erro = True
+            try:
+                resultados[posicao] = await loop.run_in_executor(executor, funcao, item)
+                erro = _resposta_com_erro(resultados[posicao])
+            except Exception as e:
+                resultados[posicao] = {"erro": f"Falha na comunicação: {e}"}
+            finally:
+                await limitador.liberar(time.monotonic() - inicio, erro)
+
+            concluidos += 1
+            if ao_concluir:
+                ao_concluir(posicao, resultados[posicao])
+            if progresso:
+                progresso(concluidos, total)
+
+        await asyncio.gather(*(_rodar(i, item) for i, item in enumerate(itens)))
+
+    return resultados
+
+
+def executar_em_paralelo(funcao, itens, progresso=None, ao_concluir=None):
+    """
+    Porta de entrada síncrona para o Streamlit (o script não roda dentro de um event loop).
+    Os callbacks de progresso rodam na mesma thread do script, então podem chamar st.progress.
+    """
+    itens = list(itens)
+    if not itens:
+        return []
+    return asyncio.run(executar_adaptativo(funcao, itens, progresso=progresso, ao_concluir=ao_concluir))
+
+
+# --- CORRIDA: LOTE SEM DUPLICATAS ---
+def _chave_corrida(dados_corrida):
+    # O ID do atleta não muda o cálculo: só distância, sexo, idade, nível e tempo
+    return (
+        dados_corrida.get("distancia"), dados_corrida.get("sexo"), dados_corrida.get("idade"),
+        dados_corrida.get("nivel"), dados_corrida.get("tempo_segundos"),
+    )
+
+def calcular_corridas_em_paralelo(lista_dados, progresso=None):
+    """
+    Calcula várias corridas de uma vez: remove payloads idênticos, dispara o restante
+    com concorrência adaptativa e devolve os resultados na MESMA ORDEM de 'lista_dados'.
+    """
+    unicos = {}
+    for dados in lista_dados:
+        unicos.setdefault(_chave_corrida(dados), dados)
+
+    chaves = list(unicos)
+    respostas = executar_em_paralelo(api_client.calcular_corrida_api, [unicos[c] for c in chaves], progresso=progresso)
+    por_chave = dict(zip(chaves, respostas))
+
+    return [por_chave[_chave_corrida(dados)] for dados in lista_dados]
@@ -1,68 +1,423 @@
 import os
+import time
+import threading
+from collections import deque
 import requests
+from requests.adapters import HTTPAdapter
+
+from src.cache import CacheLRU
 
 # Este é o endereço onde sua API (main.py) está "escutando"
-API_URL = "https://bioms-api-backend.onrender.com/calcular"
+API_BASE_URL = os.environ.get("BIOMS_API_URL", "https://bioms-api-backend.onrender.com")
+API_URL = f"{API_BASE_URL}/calcular"
+
+# Timeout (segundos) por rota
+TIMEOUTS = {
+    "/calcular": 10,
+    "/calcular-lote": 60,
+    # Aumentado para 30 segundos para dar tempo ao Render de "acordar"
+    "/lista-exercicios": 30,
+    "/consulta-normativa": 30,
+    "/calcular-corrida": 30,
+}
+# Timeout usado enquanto o backend ainda não respondeu (cold start do Render pode levar ~1 min)
+TIMEOUT_FRIO = 60
+# Com o backend quente, o timeout acompanha a latência real (p95 x fator), sem passar do padrão da rota
+FATOR_TIMEOUT_P95 = 4
+TIMEOUT_MINIMO = 5
+
+# Respostas do gateway que merecem nova tentativa (Render acordando / reiniciando)
+STATUS_REPETIR = (502, 503, 504)
+
+# Quantos atletas vão em cada POST para /calcular-lote
+TAMANHO_LOTE = 100
+# Com resultados ao vivo (ao_receber), lotes menores: a tabela é atualizada a cada lote
+TAMANHO_LOTE_AO_VIVO = 10
+
+# Caches do processo (compartilhados entre sessões): as respostas só dependem dos parâmetros
+_cache_exercicios = CacheLRU(maxsize=1, ttl=60 * 60)
+_cache_normativa = CacheLRU(maxsize=1024, ttl=6 * 60 * 60)
+
+
+class SaudeBackend:
+    """
+    Estado de saúde do backend, compartilhado pelo processo:
+    'frio' (nunca respondeu: cold start do Render), 'aquecendo' (ping de warm-up em andamento),
+    'quente' (última chamada ok) e 'suspeito' (a última chamada falhou).
+    O timeout longo de cold start só vale antes da primeira resposta ou falha; depois de uma
+    falha cada rota volta ao seu timeout padrão, para uma queda não prender o usuário por minutos.
+    Guarda uma janela das últimas latências para calcular p50/p95 e escolher timeouts.
+    """
+
+    def __init__(self, janela=50):
+        self.estado = "frio"
+        self.janela = janela
+        self._latencias = deque(maxlen=janela)
+        self._por_rota = {}  # rota -> deque (um lote de 100 atletas não é comparável a um /calcular)
+        self._lock = threading.Lock()
+
+    def registrar(self, latencia, sucesso, rota=None):
+        with self._lock:
+            if sucesso:
+                self._latencias.append(latencia)
+                if rota:
+                    self._por_rota.setdefault(rota, deque(maxlen=self.janela)).append(latencia)
+                self.estado = "quente"
+            else:
+                self.estado = "suspeito"
+
+    def marcar_aquecendo(self):
+        with self._lock:
+            if self.estado == "frio":
+                self.estado = "aquecendo"
+                return True
+            return False
+
+    def percentil(self, p, rota=None):
+        with self._lock:
+            amostras = sorted(self._por_rota.get(rota, ()) if rota else self._latencias)
+        if not amostras:
+            return None
+        return amostras[min(len(amostras) - 1, int(round(p / 100 * (len(amostras) - 1))))]
+
+    def timeout_para(self, rota, padrao):
+        if self.estado in ("frio", "aquecendo"):
+            return max(padrao, TIMEOUT_FRIO)
+        if self.estado == "suspeito":
+            return padrao
+        p95 = self.percentil(95, rota)
+        if p95 is None:
+            # Backend quente, mas ainda sem amostras desta rota: usamos o padrão dela
+            return padrao
+        return min(padrao, max(TIMEOUT_MINIMO, p95 * FATOR_TIMEOUT_P95))
+
+    def resumo(self):
+        return {"estado": self.estado, "p50": self.percentil(50), "p95": self.percentil(95)}
+
+
+# Circuit breaker: depois de N falhas seguidas, falha rápido durante o resfriamento
+FALHAS_PARA_ABRIR = 5
+RESFRIAMENTO_CIRCUITO = 30  # segundos
+MENSAGEM_DEGRADADO = "Servidor BioMS indisponível no momento (modo degradado). Tente novamente em instantes."
+
+
+class CircuitoAberto(requests.exceptions.ConnectionError):
+    """Levantada sem tocar na rede enquanto o circuito está aberto."""
+
+
+class CircuitBreaker:
+    """
+    Disjuntor compartilhado por todas as chamadas do api_client:
+    - 'fechado': tudo passa; falhas seguidas são contadas;
+    - 'aberto': após N falhas seguidas, toda chamada falha na hora até o fim do resfriamento;
+    - 'meio-aberto': passado o resfriamento, UMA chamada de teste é liberada.
+      Se der certo o circuito fecha; se falhar, abre de novo.
+    """
+
+    def __init__(self, falhas_para_abrir=FALHAS_PARA_ABRIR, resfriamento=RESFRIAMENTO_CIRCUITO):
+        self.falhas_para_abrir = falhas_para_abrir
+        self.resfriamento = resfriamento
+        self.estado = "fechado"
+        self.falhas_seguidas = 0
+        self._aberto_em = 0.0
+        self._teste_em_andamento = False
+        self._lock = threading.Lock()
+
+    def permitir(self):
+        with self._lock:
+            if self.estado == "fechado":
+                return True
+            if self.estado == "aberto":
+                if time.monotonic() - self._aberto_em < self.resfriamento:
+                    return False
+                self.estado = "meio-aberto"
+            # meio-aberto: só uma chamada de teste por vez
+            if self._teste_em_andamento:
+                return False
+            self._teste_em_andamento = True
+            return True
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self.estado = "fechado"
+            self.falhas_seguidas = 0
+            self._teste_em_andamento = False
+
+    def registrar_falha(self):
+        with self._lock:
+            self.falhas_seguidas += 1
+            if self.estado == "meio-aberto" or self.falhas_seguidas >= self.falhas_para_abrir:
+                self.estado = "aberto"
+                self._aberto_em = time.monotonic()
+            self._teste_em_andamento = False
+
+    @property
+    def aberto(self):
+        return self.estado != "fechado"
+
+
+class BioMSApiClient:
+    """
+    Cliente HTTP único da API BioMS.
+    Mantém uma requests.Session com pool de conexões (keep-alive), timeouts por rota
+    e novas tentativas com backoff exponencial em 502/503/504 e falhas de conexão
+    (timeouts de leitura só são repetidos em GET).
+    É thread-safe para uso no ThreadPoolExecutor do modo grupo.
+    """
+
+    def __init__(self, base_url=API_BASE_URL, pool_size=32, tentativas=3, backoff=0.5, timeouts=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeouts = {**TIMEOUTS, **(timeouts or {})}
+        # Rotas com timeout passado explicitamente não são ajustadas pela saúde do backend
+        self.timeouts_fixos = set(timeouts or {})
+
+        # As novas tentativas são feitas em _requisitar (e não pelo urllib3) para que cada
+        # tentativa conte no circuit breaker e o laço pare assim que ele abrir
+        self.tentativas = tentativas
+        self.backoff = backoff  # 0.5s, 1s, 2s...
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # None = ainda não sabemos se o servidor tem a rota /calcular-lote
+        self.suporta_lote = None
+        self.saude = SaudeBackend()
+        self.circuito = CircuitBreaker()
+
+    def _requisitar(self, metodo, rota, **kwargs):
+        # O crachá de segurança é lido a cada chamada (o .env pode ser carregado depois do import)
+        cabecalho = {"X-API-KEY": os.environ.get("API_KEY_SECRETA")}
+        timeout = kwargs.pop("timeout", None)
+        if timeout is None:
+            padrao = self.timeouts.get(rota, 30)
+            timeout = padrao if rota in self.timeouts_fixos else self.saude.timeout_para(rota, padrao)
+
+        for tentativa in range(self.tentativas + 1):
+            # O disjuntor é consultado antes de CADA tentativa: durante uma queda, as falhas
+            # das tentativas abrem o circuito e o restante do laço falha na hora
+            if not self.circuito.permitir():
+                raise CircuitoAberto(MENSAGEM_DEGRADADO)
+            ultima = tentativa == self.tentativas
+
+            inicio = time.monotonic()
+            try:
+                response = self.session.request(metodo, f"{self.base_url}{rota}", headers=cabecalho, timeout=timeout, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self.saude.registrar(time.monotonic() - inicio, sucesso=False, rota=rota)
+                self.circuito.registrar_falha()
+                # Timeout de leitura num POST: o servidor recebeu o pedido e travou; repetir só multiplica a espera
+                if ultima or (metodo != "GET" and isinstance(e, requests.exceptions.ReadTimeout)):
+                    raise
+                self._esperar(tentativa)
+                continue
+            except BaseException:
+                # Qualquer outra exceção também precisa resolver a chamada de teste do
+                # meio-aberto; senão o circuito fica preso recusando tudo
+                self.saude.registrar(time.monotonic() - inicio, sucesso=False, rota=rota)
+                self.circuito.registrar_falha()
+                raise
+
+            sucesso = response.status_code < 500
+            self.saude.registrar(time.monotonic() - inicio, sucesso=sucesso, rota=rota)
+            if sucesso:
+                self.circuito.registrar_sucesso()
+                return response
+            self.circuito.registrar_falha()
+            if ultima or response.status_code not in STATUS_REPETIR:
+                return response
+            response.close()
+            self._esperar(tentativa)
+
+    def _esperar(self, tentativa):
+        """Backoff exponencial entre tentativas (backoff, 2x, 4x...)."""
+        if self.backoff:
+            time.sleep(self.backoff * 2 ** tentativa)
+
+    @staticmethod
+    def _erro_conexao(e, mensagem):
+        """Erro padronizado: com o circuito aberto, o app recebe um sinal único de modo degradado."""
+        if isinstance(e, CircuitoAberto):
+            return {"erro": MENSAGEM_DEGRADADO, "circuito_aberto": True}
+        return {"erro": mensagem}
+
+    def aquecer(self):
+        """Ping de warm-up: acorda o Render e já deixa a lista de exercícios no cache."""
+        if not self.saude.marcar_aquecendo():
+            return
+        lista = self.lista_exercicios()
+        if lista:
+            _cache_exercicios.set("lista", lista)
+
+    def calcular(self, dados_atleta):
+        try:
+            response = self._requisitar("POST", "/calcular", json=dados_atleta)
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {"erro": f"Erro na API: {response.status_code}", "detalhe": response.text}
+        except Exception as e:
+            return self._erro_conexao(e, "Não consegui falar com a API. Verifique se o terminal da API está ligado!")
+
+    def calcular_lote(self, lista_atletas):
+        """
+        Envia vários atletas num único POST para /calcular-lote.
+        Retorna uma lista na mesma ordem da entrada (resultado ou {"erro": ...} por linha),
+        ou None quando o servidor não suporta lote ou devolve um corpo que não é JSON.
+        """
+        if self.suporta_lote is False:
+            return None
+
+        try:
+            response = self._requisitar("POST", "/calcular-lote", json={"atletas": lista_atletas})
+        except Exception as e:
+            return [self._erro_conexao(e, "Não consegui falar com a API. Verifique se o terminal da API está ligado!")] * len(lista_atletas)
+
+        if response.status_code in (404, 405, 501):
+            # Backend antigo: lembramos disso para não tentar de novo a cada lote
+            self.suporta_lote = False
+            return None
+        if response.status_code != 200:
+            return [{"erro": f"Erro na API: {response.status_code}", "detalhe": response.text}] * len(lista_atletas)
+
+        try:
+            corpo = response.json()
+        except ValueError:
+            # Corpo que não é JSON (ex: página de erro de um proxy com status 200): este lote
+            # segue pelo caminho atleta a atleta, sem marcar a rota como inexistente
+            print("Aviso: resposta do /calcular-lote não é JSON; calculando atleta a atleta.")
+            return None
+        self.suporta_lote = True
+        resultados = corpo.get("resultados") if isinstance(corpo, dict) else corpo
+        if not isinstance(resultados, list) or len(resultados) != len(lista_atletas):
+            return [{"erro": "Resposta do lote inválida", "detalhe": str(corpo)[:200]}] * len(lista_atletas)
+        return resultados
+
+    def lista_exercicios(self):
+        try:
+            res = self._requisitar("GET", "/lista-exercicios")
+            if res.status_code == 200:
+                return res.json()
+            return []
+        except Exception:
+            return []
+
+    def consulta_normativa(self, exercicio, sexo, idade):
+        payload = {"exercicio": exercicio, "sexo": sexo, "idade": int(idade)}
+        try:
+            res = self._requisitar("POST", "/consulta-normativa", json=payload)
+            if res.status_code == 200:
+                return res.json()
+            return {"erro": "Falha na API"}
+        except Exception as e:
+            return self._erro_conexao(e, "Sem conexão")
+
+    def calcular_corrida(self, dados_corrida):
+        try:
+            res = self._requisitar("POST", "/calcular-corrida", json=dados_corrida)
+            if res.status_code == 200:
+                return res.json()
+            else:
+                return {"erro": f"Erro na API: {res.status_code}", "detalhe": res.text}
+        except Exception as e:
+            return self._erro_conexao(e, "Sem conexão com a API de corrida. Verifique a internet ou o servidor.")
+
+
+# --- CLIENTE COMPARTILHADO (um pool de conexões por processo) ---
+_cliente = None
+_cliente_lock = threading.Lock()
+
+def obter_cliente():
+    global _cliente
+    if _cliente is None:
+        with _cliente_lock:
+            if _cliente is None:
+                _cliente = BioMSApiClient()
+    return _cliente
+
+
+def aquecer_backend():
+    """Dispara o warm-up do backend em segundo plano (não bloqueia o carregamento da página)."""
+    cliente = obter_cliente()
+    if cliente.saude.estado == "frio":
+        threading.Thread(target=cliente.aquecer, name="bioms-warmup", daemon=True).start()
+
+def saude_backend():
+    return obter_cliente().saude.resumo()
+
+def modo_degradado():
+    """True enquanto o circuito está aberto: o app deve mostrar um único aviso de indisponibilidade."""
+    return obter_cliente().circuito.aberto
+
 
 def chamar_api_bioms(dados_atleta):
     """
     Pega os dados do Streamlit e envia para a API calcular, mostrando o crachá de segurança.
     """
-    senha_secreta = os.environ.get("API_KEY_SECRETA")
-    cabecalho = {"X-API-KEY": senha_secreta}
-
-    try:
-        response = requests.post(API_URL, json=dados_atleta, headers=cabecalho, timeout=10)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return {"erro": f"Erro na API: {response.status_code}", "detalhe": response.text}
-    except Exception as e:
-        return {"erro": "Não consegui falar com a API. Verifique se o terminal da API está ligado!"}
+    return obter_cliente().calcular(dados_atleta)
+
+def chamar_api_bioms_batch(lista_atletas, tamanho_lote=TAMANHO_LOTE, progresso=None, ao_receber=None):
+    """
+    Calcula uma lista de atletas em lotes (ex: 100 por requisição).
+    Devolve uma lista na MESMA ORDEM da entrada, com o resultado ou {"erro": ...} de cada atleta.
+    Se o servidor não suportar lote, cai para as chamadas individuais com concorrência adaptativa.
+    'progresso', se informado, recebe (concluidos, total) após cada lote.
+    'ao_receber', se informado, recebe (posicao_na_entrada, resultado) assim que cada atleta volta
+    (lotes de até TAMANHO_LOTE_AO_VIVO atletas, ou um a um nas chamadas individuais).
+    """
+    from api_async import executar_em_paralelo
+
+    cliente = obter_cliente()
+    total = len(lista_atletas)
+    tamanho_lote = max(1, int(tamanho_lote))
+    if ao_receber:
+        # Um elenco de até 100 atletas caberia num lote só e a tabela ao vivo só mudaria no fim
+        tamanho_lote = min(tamanho_lote, TAMANHO_LOTE_AO_VIVO)
+    resultados = []
+
+    while len(resultados) < total:
+        inicio = len(resultados)
+        lote = lista_atletas[inicio:inicio + tamanho_lote]
+
+        res_lote = cliente.calcular_lote(lote)
+        if res_lote is None:
+            if cliente.suporta_lote is False:
+                # Sem rota de lote: o restante vai de uma vez pelas chamadas individuais
+                # (a concorrência adaptativa não fica presa ao tamanho do lote)
+                lote = lista_atletas[inicio:]
+            res_lote = executar_em_paralelo(
+                cliente.calcular, lote,
+                progresso=(lambda c, t: progresso(inicio + c, total)) if progresso else None,
+                ao_concluir=(lambda p, res: ao_receber(inicio + p, res)) if ao_receber else None
+            )
+        elif ao_receber:
+            for posicao, res in enumerate(res_lote, start=inicio):
+                ao_receber(posicao, res)
+
+        resultados.extend(res_lote)
+        if progresso:
+            progresso(len(resultados), total)
+
+    return resultados
 
 def obter_lista_exercicios():
-    senha_secreta = os.environ.get("API_KEY_SECRETA")
-    cabecalho = {"X-API-KEY": senha_secreta}
-    url = "https://bioms-api-backend.onrender.com/lista-exercicios"
-    
-    try:
-        # Aumentado para 30 segundos para dar tempo ao Render de "acordar"
-        res = requests.get(url, headers=cabecalho, timeout=30) 
-        if res.status_code == 200:
-            return res.json()
-        return []
-    except:
-        return []
+    # Lista vazia = falha na API: não guardamos, para tentar de novo no próximo rerun
+    return _cache_exercicios.obter_ou_calcular(
+        "lista", obter_cliente().lista_exercicios, cachear=bool
+    )
 
 def consultar_media_normativa(exercicio, sexo, idade):
-    senha_secreta = os.environ.get("API_KEY_SECRETA")
-    cabecalho = {"X-API-KEY": senha_secreta}
-    url = "https://bioms-api-backend.onrender.com/consulta-normativa"
-    
-    payload = {"exercicio": exercicio, "sexo": sexo, "idade": int(idade)}
-    try:
-        # Aumentado para 30 segundos
-        res = requests.post(url, json=payload, headers=cabecalho, timeout=30)
-        if res.status_code == 200:
-            return res.json()
-        return {"erro": "Falha na API"}
-    except:
-        return {"erro": "Sem conexão"}
+    chave = (exercicio, sexo, int(idade))
+    return _cache_normativa.obter_ou_calcular(
+        chave,
+        lambda: obter_cliente().consulta_normativa(exercicio, sexo, idade),
+        cachear=lambda res: "erro" not in res
+    )
 
 # --- NOVA FUNÇÃO: MÓDULO DE CORRIDA ---
 def calcular_corrida_api(dados_corrida):
     """
     Envia os dados de corrida (distância, tempo, sexo, idade, nível) para a nova rota da API.
     """
-    senha_secreta = os.environ.get("API_KEY_SECRETA")
-    cabecalho = {"X-API-KEY": senha_secreta}
-    url = "https://bioms-api-backend.onrender.com/calcular-corrida"
-    
-    try:
-        res = requests.post(url, json=dados_corrida, headers=cabecalho, timeout=30)
-        if res.status_code == 200:
-            return res.json()
-        else:
-            return {"erro": f"Erro na API: {res.status_code}", "detalhe": res.text}
-    except Exception as e:
-        return {"erro": "Sem conexão com a API de corrida. Verifique a internet ou o servidor."}
\ No newline at end of file
+    return obter_cliente().calcular_corrida(dados_corrida)
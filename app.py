@@ -1,10 +1,13 @@
+from src import perfil_inicio
+perfil = perfil_inicio.iniciar()
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import os
 import time
-import altair as alt
-import base64
+import importlib.util
+from datetime import date
 from PIL import Image, UnidentifiedImageError
 
 from dotenv import load_dotenv
@@ -12,15 +15,25 @@ load_dotenv()
 
 # --- Módulos Internos ---
 from src.data_loader import load_data
-from api_client import chamar_api_bioms, obter_lista_exercicios, consultar_media_normativa, calcular_corrida_api
+from api_async import executar_em_paralelo, calcular_corridas_em_paralelo
+from api_client import chamar_api_bioms, chamar_api_bioms_batch, obter_lista_exercicios, consultar_media_normativa, aquecer_backend, saude_backend, modo_degradado
 from src.statistics import BioMSStatistics
-from src.interpretation import BioMSInterpreter
+from src.interpretation import BioMSInterpreter, RANKING_MAX_BARRAS, paginar_ranking
+from src.artefatos import obter_artefato, estatisticas_artefatos
+from src.figuras import renderizar, memoria_graficos
+from src import graficos_vega
+from src.ativos import html_banner, preparar_ativos
+from src.historico import obter_historico, HISTORICO_PATH, TIPO_FORCA, TIPO_CORRIDA
+from src.evolucao_equipes import analisar_temporada, matriz_mensal, formatar_tempo
+
+# O gerador de PDF (fpdf) só é importado quando um relatório é pedido
+PDF_AVAILABLE = importlib.util.find_spec("fpdf") is not None
+
+def gerador_pdf():
+    from src import pdf_generator
+    return pdf_generator
 
-try:
-    from src.pdf_generator import criar_pdf, criar_relatorio_grupo,criar_relatorio_zscore_universal, criar_relatorio_normativo_longitudinal
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+perfil.marcar("imports")
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -47,7 +60,7 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-
+perfil.marcar("configuração da página")
 
 
 # --- Inicialização do Session State ---
@@ -61,6 +74,21 @@ if 'atleta_dados' not in st.session_state:
 # --- FUNÇÕES AUXILIARES ---
 # --- FUNÇÕES AUXILIARES ---
 
+# "vega" (padrão): o navegador desenha os gráficos a partir de um JSON pequeno; "png": matplotlib no servidor
+BACKEND_GRAFICOS = os.environ.get("BIOMS_GRAFICOS", "vega").lower()
+# Intervalo mínimo (s) entre redesenhos da tabela/ranking parciais do modo grupo
+INTERVALO_AO_VIVO = 0.5
+
+def graficos_interativos():
+    return st.session_state.get("graficos_interativos", BACKEND_GRAFICOS == "vega")
+
+def mostrar_grafico(grafico_vega, gerar_png):
+    """Mostra a versão Vega-Lite (desenhada no navegador) ou o PNG do matplotlib, conforme a preferência."""
+    if graficos_interativos():
+        st.altair_chart(grafico_vega(), use_container_width=True)
+    else:
+        st.image(gerar_png(), use_container_width=True)
+
 def validar_imagem(uploaded_file):
     """Verifica se o arquivo é seguro, menor que 5MB e realmente é uma imagem."""
     if uploaded_file is None:
@@ -84,6 +112,13 @@ def validar_imagem(uploaded_file):
         st.error(f"⚠️ Erro ao processar a imagem: {e}")
         return None
 
+def gerar_labels(nomes):
+    """Iniciais do nome (até 3 letras) para os eixos dos gráficos, calculadas em bloco."""
+    nomes = nomes.map(str)
+    iniciais = nomes.str.findall(r'(\S)\S*').str.join('').str[:3].str.upper()
+    # Nomes curtos (ex: "A1") ficam como estão
+    return iniciais.where(nomes.str.len() > 2, nomes)
+
 def render_premium_card(chave, info, res_finais, interpreter):
     z_score = res_finais.get(f'Z_{chave}', 0)
     p_score = res_finais.get(f'P_{chave}', 50)
@@ -95,29 +130,60 @@ def render_premium_card(chave, info, res_finais, interpreter):
     st.caption(f"💡 *O que isso mede: {info['subtitulo']}*")
     st.markdown(f"**Score:** `{p_score:.0f}/100`")
     
-    fig_gauge = interpreter.plot_gauge_performance(z_score, "")
-    st.pyplot(fig_gauge)
+    # Fundo pré-renderizado + marcador; gauges da mesma faixa de Z vêm prontos do cache
+    st.image(interpreter.gauge_png(z_score), use_container_width=True)
     
     st.write(info['texto'])
     st.markdown("---")
 
-# --- FUNÇÕES DO CARROSSEL (AGORA BANNER ESTÁTICO) ---
-def get_base64_of_image(file_path):
-    """Lê a imagem física e transforma em código de texto (Base64)"""
-    try:
-        with open(file_path, "rb") as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    except Exception as e:
-        return "" 
+def avisar_modo_degradado(respostas):
+    """
+    Se alguma resposta veio do circuito aberto, mostra UM único aviso de indisponibilidade
+    (em vez de um aviso por atleta). Retorna True nesse caso.
+    """
+    bloqueadas = sum(1 for res in respostas if isinstance(res, dict) and res.get("circuito_aberto"))
+    if bloqueadas:
+        st.error(f"🔌 Servidor BioMS indisponível (modo degradado): {bloqueadas} cálculo(s) não foram enviados. Tente novamente em instantes.")
+    return bloqueadas > 0
+
+def render_status_servidor():
+    """Indicador discreto (não bloqueante) do estado do backend na sidebar."""
+    saude = saude_backend()
+    if modo_degradado():
+        st.caption("🔴 Servidor indisponível · modo degradado")
+    elif saude['estado'] == 'quente':
+        latencia = f" · p50 {saude['p50']:.1f}s / p95 {saude['p95']:.1f}s" if saude['p50'] is not None else ""
+        st.caption(f"🟢 Servidor pronto{latencia}")
+    elif saude['estado'] == 'suspeito':
+        # Falhou depois de ter respondido: não é cold start, e o circuito ainda não abriu
+        st.caption("🟠 Servidor instável: a última chamada falhou. Novas falhas ativam o modo degradado.")
+    else:
+        st.caption("⏳ Servidor aquecendo... a primeira análise pode levar até 1 minuto.")
+
+    # Medidor de memória: figuras abertas deveriam ficar sempre em zero
+    memoria = memoria_graficos()
+    cache = estatisticas_artefatos()
+    rss = f"{memoria['rss_mb']:.0f} MB" if memoria['rss_mb'] is not None else "n/d"
+    st.caption(
+        f"🧠 RSS {rss} · figuras abertas {memoria['figuras_abertas']} · "
+        f"cache de gráficos {cache['bytes'] / 1024 / 1024:.1f} MB ({cache['taxa_acerto']:.0%} acertos)"
+    )
+
+    # Tempo de início da execução anterior (desta sessão) contra o orçamento de partida a frio
+    inicio = st.session_state.get('perfil_inicio')
+    if inicio:
+        alerta = "" if inicio['dentro_do_orcamento'] else " ⚠️"
+        st.caption(f"⏱️ Início {inicio['total_ms']:.0f} ms / {inicio['orcamento_ms']:.0f} ms{alerta}")
 
-def render_banner_carrossel():
+# --- FUNÇÕES DO CARROSSEL (AGORA BANNER ESTÁTICO) ---
+def render_banner_carrossel(nome="pg_salto"):
     """Injeta o HTML/CSS de um banner estático e seguro no topo da página"""
-    # Lê apenas a primeira imagem da pasta
-    img_base64 = get_base64_of_image('assets/pg_salto.png')
+    # <picture> com WebP/JPEG reduzidos (desktop e mobile) servidos como arquivos estáticos;
+    # o HTML é montado uma vez por processo, então cada rerun envia só algumas centenas de bytes
+    img_html = html_banner(nome)
 
     # Se faltar a imagem, cancela silenciosamente sem quebrar o software
-    if not img_base64:
+    if not img_html:
         return
 
     # O CSS agora é super simples, sem 'position: absolute', o que impede de sobrepor os botões!
@@ -143,7 +209,7 @@ def render_banner_carrossel():
     }}
     </style>
     
-    <img class="banner-estatico" src="data:image/png;base64,{img_base64}" alt="Banner Principal">
+    {img_html}
     """
     st.markdown(html_code, unsafe_allow_html=True)
 
@@ -152,6 +218,39 @@ def render_banner_carrossel():
 # 1. Certifique-se de que o import no topo do arquivo app.py inclua:
 # from src.pdf_generator import criar_pdf, criar_relatorio_grupo
 
+# Medidas que definem o resultado da API para um atleta (o nome não entra no cálculo)
+CAMPOS_IMPRESSAO = ("SEXO", "AGE", "HEIGHT", "WEIGHT", "R", "Xc")
+
+def impressao_atleta(dados_atleta):
+    """Impressão digital de uma linha da tabela: mesma medida, mesmo resultado da API."""
+    return tuple(round(float(dados_atleta.get(campo, 0)), 4) for campo in CAMPOS_IMPRESSAO)
+
+def com_id(resultado, dados_atleta):
+    """Resultado reaproveitado com o nome da linha atual (o nome pode ter sido corrigido)."""
+    if "erro" in resultado or "ID" not in resultado:
+        return resultado
+    return {**resultado, "ID": dados_atleta["ID"]}
+
+def pontuar_grupo(resultados_api, stats=None):
+    """
+    Respostas da API (na ordem da tabela) -> DataFrame com Z-Score, Percentis, Quadrante e Label.
+    Sem 'stats', a referência é o próprio grupo (Intra-Time); serve à tabela parcial e à final.
+    """
+    df_calculado = pd.DataFrame(resultados_api)
+    if stats is None:
+        stats = BioMSStatistics(df_calculado)
+
+    # Z-Score, Percentis e Quadrante do time inteiro de uma vez (vetorizado)
+    res_stats = stats.compare_group(df_calculado)
+
+    # Unimos os dados da API com os dados estatísticos
+    df_resultado = df_calculado.copy()
+    df_resultado[res_stats.columns] = res_stats
+
+    # Adicionamos a Label (Iniciais do nome) para os gráficos
+    df_resultado['Label'] = gerar_labels(df_resultado['ID'] if 'ID' in df_resultado.columns else pd.Series('', index=df_resultado.index))
+    return df_resultado
+
 # --- FUNÇÃO DE GRUPO ATUALIZADA (COM NOME DA EQUIPE) ---
 def render_interface_grupo(df_ref):
     """
@@ -235,10 +334,8 @@ def render_interface_grupo(df_ref):
                 df_proc['SEXO'] = df_proc['Sexo'].map(mapa_sexo).fillna(0).astype(int)
                 df_proc = df_proc.rename(columns={'Idade': 'AGE', 'Peso (kg)': 'WEIGHT', 'Altura (cm)': 'HEIGHT'})
 
-                # B. Cálculo via API (Em Paralelo para Alta Performance)
-                from concurrent.futures import ThreadPoolExecutor, as_completed
-                
-                resultados_api = []
+                # B. Cálculo via API (Em Lotes para Alta Performance)
+                intra_time = "Intra-Time" in modo_comparacao
                 total_atletas = len(df_proc)
                 progresso = st.progress(0)
                 
@@ -256,65 +353,99 @@ def render_interface_grupo(df_ref):
                     }
                     lista_dados_atletas.append(dados_atleta)
 
-                # 2. Dispara as requisições para a API simultaneamente (10 "caixas de banco" atendendo ao mesmo tempo)
-                concluidos = 0
-                with ThreadPoolExecutor(max_workers=10) as executor:
-                    # Mapeia as tarefas
-                    futuros = {executor.submit(chamar_api_bioms, atleta): atleta for atleta in lista_dados_atletas}
-                    
-                    # Conforme a API for respondendo (não importa a ordem), vamos salvando
-                    for futuro in as_completed(futuros):
-                        atleta_info = futuros[futuro]
-                        try:
-                            res = futuro.result()
-                            if "erro" not in res:
-                                resultados_api.append(res)
-                            else:
-                                st.warning(f"⚠️ Pulei o atleta {atleta_info['ID']}: {res['erro']}")
-                        except Exception as e:
-                            st.warning(f"⚠️ Falha na comunicação para o atleta {atleta_info['ID']}: {e}")
-                        
-                        # Atualiza a barra de progresso visual
-                        concluidos += 1
-                        progresso.progress(concluidos / total_atletas)
-
-                # 3. Transformamos a lista de respostas da API em um DataFrame
-                df_calculado = pd.DataFrame(resultados_api)
+                # 2. Só vão para a API as linhas novas ou alteradas: as demais reaproveitam o resultado
+                # da execução anterior (pela impressão digital das medidas, não pelo nome)
+                cache_api = st.session_state.setdefault('grupo_cache_api', {})
+                chaves = [impressao_atleta(dados) for dados in lista_dados_atletas]
+                pendentes = {}  # impressão -> posições na tabela (linhas idênticas vão uma vez só)
+                for posicao, chave in enumerate(chaves):
+                    if chave not in cache_api:
+                        pendentes.setdefault(chave, []).append(posicao)
+                envio = [lista_dados_atletas[posicoes[0]] for posicoes in pendentes.values()]
+                destinos = list(pendentes.values())
+
+                # 3. Resultados ao vivo: cada resposta entra na sua posição da tabela original
+                # e a tabela/ranking parciais são redesenhados (no máximo a cada INTERVALO_AO_VIVO s)
+                parciais = [
+                    com_id(cache_api[chave], dados) if chave in cache_api else None
+                    for chave, dados in zip(chaves, lista_dados_atletas)
+                ]
+                stats_elite = None if intra_time else BioMSStatistics(df_ref)
+                tabela_viva, ranking_vivo = st.empty(), st.empty()
+                ultima_pintura = [0.0]
+
+                def pintar_parcial():
+                    recebidos = [res for res in parciais if res is not None and "erro" not in res]
+                    if not recebidos:
+                        return
+                    df_vivo = pontuar_grupo(recebidos, stats_elite)
+                    tabela_viva.dataframe(df_vivo, use_container_width=True, hide_index=True)
+                    # Ranking parcial só no navegador (Vega-Lite): redesenhar PNG a cada resposta custaria caro
+                    if graficos_interativos() and 'Z_BioMS_8' in df_vivo.columns:
+                        ranking_vivo.altair_chart(
+                            graficos_vega.ranking_vega(df_vivo, 'Z_BioMS_8', f"Parcial: {len(df_vivo)} de {total_atletas} atletas"),
+                            use_container_width=True
+                        )
+
+                def ao_receber(indice_envio, res):
+                    for posicao in destinos[indice_envio]:
+                        parciais[posicao] = com_id(res, lista_dados_atletas[posicao])
+                    agora = time.monotonic()
+                    if agora - ultima_pintura[0] >= INTERVALO_AO_VIVO:
+                        ultima_pintura[0] = agora
+                        pintar_parcial()
+
+                if envio:
+                    if len(envio) < total_atletas:
+                        st.caption(f"♻️ {total_atletas - len(envio)} atleta(s) sem alteração reaproveitados; calculando {len(envio)}.")
+                        pintar_parcial()
+                    # Envia os atletas em lotes (ex: 200 atletas = 2 requisições).
+                    # Se o servidor não tiver a rota de lote, o client cai sozinho para as chamadas individuais em paralelo.
+                    respostas_envio = chamar_api_bioms_batch(
+                        envio,
+                        progresso=lambda concluidos, total: progresso.progress(concluidos / total),
+                        ao_receber=ao_receber
+                    )
+                    # ao_receber já colocou cada resposta na tabela; guardamos os sucessos para a próxima execução
+                    for indice_envio, res in enumerate(respostas_envio):
+                        if "erro" not in res:
+                            cache_api[impressao_atleta(envio[indice_envio])] = res
+                progresso.progress(1.0)
+                tabela_viva.empty()
+                ranking_vivo.empty()
+
+                # O cache guarda só o elenco atual (não cresce a cada edição da tabela)
+                st.session_state['grupo_cache_api'] = {chave: cache_api[chave] for chave in chaves if chave in cache_api}
+                respostas = parciais
+
+                # A resposta vem na mesma ordem da tabela: separamos os sucessos dos erros por linha
+                resultados_api = []
+                avisar_modo_degradado(respostas)
+                for atleta_info, res in zip(lista_dados_atletas, respostas):
+                    if "erro" not in res:
+                        resultados_api.append(res)
+                    elif not res.get("circuito_aberto"):
+                        st.warning(f"⚠️ Pulei o atleta {atleta_info['ID']}: {res['erro']}")
 
                 # C. Estatísticas
-                if df_calculado.empty:
+                if not resultados_api:
                     st.error("❌ Nenhum dado foi processado pela API.")
                     st.stop()
-                    
-                if "Intra-Time" in modo_comparacao:
-                    stats = BioMSStatistics(df_calculado) 
-                else:
-                    stats = BioMSStatistics(df_ref)
 
-                # --- O PONTO QUE FALTAVA: Gerar os resultados com estatísticas ---
-                resultados_finais = []
-                for idx, row in df_calculado.iterrows():
-                    atleta_dict = row.to_dict()
-                    
-                    # Aqui o sistema calcula Z-Score e Percentis para cada atleta
-                    res_stats = stats.compare_athlete(atleta_dict)
-                    
-                    # Unimos os dados da API com os dados estatísticos
-                    dados = {**atleta_dict, **res_stats}
-                    
-                    # Adicionamos a Label (Iniciais do nome) para os gráficos
-                    nome = str(atleta_dict.get('ID', ''))
-                    iniciais = "".join([n[0] for n in nome.split() if n])[:3].upper() if len(nome) > 2 else nome
-                    dados['Label'] = iniciais
-                    
-                    resultados_finais.append(dados)
+                # Z-Score, Percentis, Quadrante e Label do time inteiro, na ordem da tabela de entrada
+                df_resultado = pontuar_grupo(resultados_api, stats_elite)
                 
                 # D. Salvar no Session State (Agora sim com os dados completos!)
-                st.session_state['grupo_resultado'] = pd.DataFrame(resultados_finais)
+                st.session_state['grupo_resultado'] = df_resultado
+
+                historico = obter_historico()
+                if historico:
+                    for _, row in df_resultado.iterrows():
+                        historico.registrar_bioms(str(row.get("ID", "")), row.to_dict(), clube=nome_equipe)
                 st.session_state['grupo_nome'] = nome_equipe
                 st.session_state['grupo_modo'] = modo_comparacao
 
-                st.success(f"✔ Análise concluída: {len(resultados_finais)} atletas processados via API.")
+                st.success(f"✔ Análise concluída: {len(df_resultado)} atletas processados via API.")
 
     # --- 4. EXIBIÇÃO DE RESULTADOS E RELATÓRIOS ---
     # Verifica se existe resultado processado na memória
@@ -343,12 +474,18 @@ def render_interface_grupo(df_ref):
                 # Chama a função que você definiu no final do seu código
                 # Passamos o logo_upload diretamente
                 try:
-                    pdf_bytes = criar_relatorio_grupo(
-                        df_final, 
-                        interp_pdf, 
-                        disclaimer_pdf, 
-                        nome_equipe=nome_atual, 
-                        logo_file=logo_upload # Passando o arquivo carregado 
+                    # O PDF só é refeito quando muda o time, o nome, a logo, o modo de comparação
+                    # ou o dia (o cabeçalho traz a data de emissão)
+                    pdf_bytes = obter_artefato(
+                        "pdf_grupo",
+                        [df_final, nome_atual, logo_upload.getvalue() if logo_upload else None, disclaimer_pdf, date.today()],
+                        lambda: gerador_pdf().criar_relatorio_grupo(
+                            df_final, 
+                            interp_pdf, 
+                            disclaimer_pdf, 
+                            nome_equipe=nome_atual, 
+                            logo_file=logo_upload # Passando o arquivo carregado 
+                        )
                     )
 
                     st.download_button(
@@ -372,6 +509,7 @@ def render_interface_grupo(df_ref):
             st.caption("Z-Score 0 representa a média. Barras à esquerda indicam valores acima da referência.") # [cite: 44]
             
             interp_graf = BioMSInterpreter()
+
             # Gráficos de barra horizontal (Altair ou Matplotlib)
             metrics = [
                 ('Z_BioMS_8', 'Eficiência Metabólica (BioMS-8)'), # [cite: 70]
@@ -380,16 +518,43 @@ def render_interface_grupo(df_ref):
                 ('Z_BioMS_9', 'Resiliência e Velocidade (BioMS-9)') # [cite: 105]
             ]
             
+            # Times grandes: resumo de tamanho fixo ou páginas de RANKING_MAX_BARRAS atletas
+            # (conta só quem tem valor: atletas sem a métrica não entram no ranking)
+            visao, pagina = "completo", 0
+            n_ranking = max((int(df_final[m].notna().sum()) for m, _ in metrics if m in df_final.columns), default=0)
+            if n_ranking > RANKING_MAX_BARRAS:
+                c_visao, c_pagina = st.columns([2, 1])
+                with c_visao:
+                    visao = st.radio(
+                        "Visualização do ranking:",
+                        ["resumo", "paginas"],
+                        format_func=lambda v: {"resumo": "📊 Distribuição + melhores/piores", "paginas": "📄 Ranking completo por páginas"}[v],
+                        horizontal=True
+                    )
+                if visao == "paginas":
+                    total_paginas = -(-n_ranking // RANKING_MAX_BARRAS)
+                    with c_pagina:
+                        pagina = st.number_input(f"Página (de {total_paginas})", 1, total_paginas, 1) - 1
+
             for metrica, titulo in metrics:
                 if metrica in df_final.columns:
-                    # Renderiza o gráfico usando sua função existente
-                    fig = interp_graf.plot_ranking_batch(df_final, metrica, titulo)
+                    # Renderiza o gráfico usando sua função existente (ou reaproveita o PNG do rerun anterior)
+                    col_label = 'Label' if 'Label' in df_final.columns else 'ID'
+                    df_grafico, titulo_grafico = df_final, titulo
+                    if visao == "paginas":
+                        df_grafico, pagina_metrica, _ = paginar_ranking(df_final, metrica, pagina)
+                        inicio = pagina_metrica * RANKING_MAX_BARRAS
+                        titulo_grafico = f"{titulo} · posições {inicio + 1}-{inicio + len(df_grafico)} de {df_final[metrica].notna().sum()}"
+                    gerar_png = lambda: obter_artefato(
+                        "ranking", [titulo_grafico, df_grafico[[col_label, metrica]]],
+                        lambda: renderizar(lambda: interp_graf.plot_ranking_batch(df_grafico, metrica, titulo_grafico))
+                    )
                     
                     # Colocamos o gráfico dentro de colunas para limitar a largura máxima dele na tela
                     col_espaco1, col_grafico, col_espaco2 = st.columns([0.99, 9, 0.99]) 
                     with col_grafico:
                         # O use_container_width=True faz ele respeitar os limites da coluna 'col_grafico'
-                        st.pyplot(fig, use_container_width=True)
+                        mostrar_grafico(lambda: graficos_vega.ranking_vega(df_grafico, metrica, titulo_grafico), gerar_png)
                     
         with tab2:
             st.dataframe(df_final.style.format("{:.2f}", subset=[c for c in df_final.columns if df_final[c].dtype == 'float64']), use_container_width=True)
@@ -452,30 +617,25 @@ def render_interface_zscore_universal():
             
             df_calc["Label"] = df_calc["Nome do Atleta"]
             
-            # Manipulação segura da Logo Temporária
-            logo_path = None
-            if logo_upload_z:
-                import tempfile
-                ext = os.path.splitext(logo_upload_z.name)[1]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-                    tmp.write(logo_upload_z.getvalue())
-                    logo_path = tmp.name
+            # A logo segue em memória (bytes) para o gráfico e para o PDF
+            logo_bytes = logo_upload_z.getvalue() if logo_upload_z else None
 
             # Renderização passando as cores e a logo
             interp_graf = BioMSInterpreter()
-            fig = interp_graf.plot_ranking_batch(df_calc, "Z_Score", f"Ranking: {nome_teste}", cor_positiva=cor_pos, cor_negativa=cor_neg, logo_path=logo_path)
+            # A figura vira PNG e é fechada na hora; o mesmo PNG serve para a tela e para o PDF
+            png_ranking = renderizar(lambda: interp_graf.plot_ranking_batch(df_calc, "Z_Score", f"Ranking: {nome_teste}", cor_positiva=cor_pos, cor_negativa=cor_neg, logo=logo_bytes))
             
             st.success(f"Cálculo concluído! Média do grupo: {media:.2f}")
             
             col_espaco1, col_grafico, col_espaco2 = st.columns([0.5, 9, 0.5]) 
             with col_grafico:
-                st.pyplot(fig, use_container_width=True)
+                mostrar_grafico(lambda: graficos_vega.ranking_vega(df_calc, "Z_Score", f"Ranking: {nome_teste}", cor_positiva=cor_pos, cor_negativa=cor_neg), lambda: png_ranking)
             
             # --- DOWNLOAD DO PDF ---
             if PDF_AVAILABLE:
                 st.write("---")
                 try:
-                    pdf_bytes = criar_relatorio_zscore_universal(df_calc, nome_teste, fig, logo_path)
+                    pdf_bytes = gerador_pdf().criar_relatorio_zscore_universal(df_calc, nome_teste, png_ranking, logo_bytes)
                     st.download_button(
                         label="📥 BAIXAR RELATÓRIO DO TESTE (PDF)",
                         data=pdf_bytes,
@@ -489,11 +649,6 @@ def render_interface_zscore_universal():
             st.subheader("📋 Tabela de Dados Calculada")
             st.dataframe(df_calc[["Nome do Atleta", "Valor do Teste", "Z_Score"]].style.format({"Valor do Teste": "{:.2f}", "Z_Score": "{:.2f}"}), use_container_width=True)
 
-            # Limpeza do arquivo temporário da logo
-            if logo_path and os.path.exists(logo_path):
-                try: os.remove(logo_path)
-                except: pass
-
 # --- FUNÇÃO NOVA: AVALIAÇÃO NORMATIVA (LONGITUDINAL E 1RM) ---
 def render_interface_normativa():
     st.header("📊 Avaliação Normativa & Evolução (1RM)")
@@ -533,6 +688,14 @@ def render_interface_normativa():
             "Repetições": st.column_config.NumberColumn("Repetições", min_value=0, step=1, width="small")
         }
         
+        # Com o histórico local ligado, as coletas já salvas deste aluno voltam para o editor
+        historico = obter_historico()
+        if historico:
+            df_salvo = historico.historico(nome, TIPO_FORCA)
+            if not df_salvo.empty:
+                df_template = df_salvo.rename(columns={"Metrica": "Exercício"}).reindex(columns=list(config_colunas))
+                st.caption(f"📚 {len(df_template)} coleta(s) de {nome} carregadas do histórico local.")
+        
         df_input = st.data_editor(df_template, num_rows="dynamic", column_config=config_colunas, use_container_width=True, hide_index=True)
 
     if st.button("🚀 GERAR RELATÓRIO DE PROGRESSO", type="primary"):
@@ -566,15 +729,18 @@ def render_interface_normativa():
                 valores_finais.append(val)
             
             df_calc["Valor_Final"] = valores_finais
+
+            if historico:
+                # Linhas apagadas ou corrigidas no editor também saem do histórico
+                historico.reconciliar(nome, TIPO_FORCA, zip(df_calc["Exercício"], df_calc["Data"]))
+                historico.registrar(nome, TIPO_FORCA, [
+                    {"metrica": row["Exercício"], "data": row["Data"], "valor": row["Valor_Final"],
+                     "Carga (kg)": float(row.get("Carga (kg)", 0)), "Repetições": int(row.get("Repetições", 0))}
+                    for _, row in df_calc.iterrows()
+                ], sexo=sexo, idade=idade)
             
             # --- TRATAMENTO DA LOGO DO TREINADOR ---
-            logo_path = None
-            if logo_upload:
-                import tempfile
-                ext = os.path.splitext(logo_upload.name)[1]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-                    tmp.write(logo_upload.getvalue())
-                    logo_path = tmp.name
+            logo_bytes = logo_upload.getvalue() if logo_upload else None
 
             st.write("---")
             st.subheader(f"Evolução: {nome} ({idade} anos)")
@@ -585,6 +751,11 @@ def render_interface_normativa():
             # Identifica quais exercícios diferentes o treinador preencheu
             exercicios_unicos = df_calc["Exercício"].unique()
             
+            # Consulta as médias normativas de todos os exercícios em paralelo (concorrência adaptativa)
+            respostas_normativas = dict(zip(exercicios_unicos, executar_em_paralelo(
+                lambda exe: consultar_media_normativa(exe, sexo, idade), exercicios_unicos
+            )))
+            
             # Vamos guardar os dados finais na memória para depois mandarmos para o PDF!
             st.session_state['dados_pdf_normativo'] = []
             
@@ -593,21 +764,22 @@ def render_interface_normativa():
                 df_exe = df_calc[df_calc["Exercício"] == exe].copy()
                 
                 # Consulta a API para pegar a média sem ver a tabela secreta!
-                resposta_api = consultar_media_normativa(exe, sexo, idade)
+                resposta_api = respostas_normativas[exe]
                 if "erro" in resposta_api:
                     st.warning(f"Sem dados normativos na literatura para {exe}.")
                     continue
                 
                 media_oficial = resposta_api["media"]
                 
-                # Desenha o gráfico longitudinal
-                fig = interp_graf.plot_longitudinal_evolution(df_exe, media_oficial, exe, cor_aluno)
-                
                 # Layout de Exibição: Gráfico à esquerda, Tabela à direita
                 col_graf, col_tab = st.columns([7, 3])
                 
                 with col_graf:
-                    st.pyplot(fig, use_container_width=True)
+                    # Gráfico longitudinal (Vega-Lite ou PNG; nenhuma figura sobrevive ao rerun)
+                    mostrar_grafico(
+                        lambda: graficos_vega.longitudinal_vega(df_exe, media_oficial, exe, cor_aluno),
+                        lambda: renderizar(lambda: interp_graf.plot_longitudinal_evolution(df_exe, media_oficial, exe, cor_aluno))
+                    )
                 
                 with col_tab:
                     st.markdown(f"**Detalhes ({exe}):**")
@@ -631,11 +803,12 @@ def render_interface_normativa():
                 st.write("---")
                 
                 # Salva o pacote deste exercício na memória para o Passo 3 (PDF)
+                # Só dados: o PDF redesenha o gráfico quando precisar
                 st.session_state['dados_pdf_normativo'].append({
                     "exercicio": exe,
-                    "df": df_exe,
+                    "df": df_exe[["Data", "Valor_Final"]],
                     "media_grupo": media_oficial,
-                    "figura": fig,
+                    "cor": cor_aluno,
                     "evolucao": progresso_txt
                 })
 
@@ -643,11 +816,11 @@ def render_interface_normativa():
             if PDF_AVAILABLE and len(st.session_state['dados_pdf_normativo']) > 0:
                 st.write("---")
                 try:
-                    pdf_bytes = criar_relatorio_normativo_longitudinal(
+                    pdf_bytes = gerador_pdf().criar_relatorio_normativo_longitudinal(
                         nome, 
                         idade, 
                         st.session_state['dados_pdf_normativo'], 
-                        logo_path
+                        logo_bytes
                     )
                     st.download_button(
                         label="📥 BAIXAR RELATÓRIO DE PROGRESSO (PDF)",
@@ -659,8 +832,123 @@ def render_interface_normativa():
                 except Exception as e:
                     st.error(f"Erro ao gerar PDF: {e}")
 
+# --- EVOLUÇÃO DE EQUIPES (TEMPORADA INTEIRA DE CORRIDA) ---
+def ler_planilha_temporada(arquivo):
+    """CSV (vírgula ou ponto e vírgula) ou Excel com uma linha por sessão."""
+    if arquivo.name.lower().endswith((".xlsx", ".xls")):
+        return pd.read_excel(arquivo)
+    return pd.read_csv(arquivo, sep=None, engine="python")
+
+def render_interface_temporada():
+    st.markdown("Acompanhe a evolução de **centenas de corredores ao longo de toda a temporada**. Cada corredor é comparado com ele mesmo: a tendência mostra quanto o tempo caiu (ou subiu) a cada 30 dias.")
+
+    with st.expander("📝 Sessões da Temporada", expanded=True):
+        c1, c2 = st.columns([2, 1])
+        with c1: nome_equipe_temp = st.text_input("Nome da Equipe:", "Runners Club", key="nome_equipe_temporada")
+        with c2:
+            logo_raw_t = st.file_uploader("Logo da Equipe", type=["png", "jpg"], key="logo_temporada")
+            logo_upload_t = validar_imagem(logo_raw_t) if logo_raw_t else None
+
+        st.markdown("<small><b>Uma linha por sessão, com as colunas:</b> Nome, Distância, Data (dd/mm/aaaa ou Jan/26), Minutos, Segundos (ou Tempo_Seg). Sexo é opcional.</small>", unsafe_allow_html=True)
+        arquivo = st.file_uploader("Planilha da temporada (CSV ou Excel)", type=["csv", "xlsx", "xls"], key="planilha_temporada")
+
+        # Com o histórico local ligado, as sessões gravadas da equipe podem ser usadas direto
+        historico = obter_historico()
+        usar_historico = historico is not None and st.checkbox(f"Usar as corridas de '{nome_equipe_temp}' salvas no histórico local")
+
+    if st.button("🚀 ANALISAR TEMPORADA", type="primary"):
+        try:
+            if usar_historico:
+                paginas = [
+                    pagina.rename(columns={"Atleta": "Nome", "Metrica": "Distância"})
+                    for pagina in historico.paginar_clube(nome_equipe_temp, TIPO_CORRIDA)
+                ]
+                if not paginas:
+                    st.error(f"⚠️ Nenhuma corrida salva no histórico local para a equipe '{nome_equipe_temp}'. Preencha 'Equipe (histórico)' no relatório de corrida Individual para gravar as corridas sob a equipe.")
+                    return
+                df_sessoes = pd.concat(paginas, ignore_index=True)
+            elif arquivo is not None:
+                df_sessoes = ler_planilha_temporada(arquivo)
+            else:
+                st.error("⚠️ Envie a planilha da temporada.")
+                return
+
+            with st.spinner(f"Analisando {len(df_sessoes)} sessões..."):
+                analise = analisar_temporada(df_sessoes)
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+            return
+
+        if analise is None:
+            st.error("Nenhuma sessão válida (confira datas e tempos).")
+            return
+        st.session_state['temporada'] = analise
+        st.session_state['temporada_nome'] = nome_equipe_temp
+
+    if 'temporada' not in st.session_state:
+        return
+
+    analise = st.session_state['temporada']
+    nome_atual = st.session_state['temporada_nome']
+    sessoes, resumo, tendencias, mensal = analise['sessoes'], analise['resumo'], analise['tendencias'], analise['mensal']
+
+    st.write("---")
+    if analise['descartadas']:
+        st.warning(f"⚠️ {analise['descartadas']} sessão(ões) ignoradas por falta de data, nome ou tempo válido.")
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("Sessões", f"{len(sessoes):,}".replace(",", "."))
+    k2.metric("Corredores", sessoes['Nome'].nunique())
+    k3.metric("Período", f"{sessoes['Data'].min():%m/%y} - {sessoes['Data'].max():%m/%y}")
+
+    # Small multiples: um painel por distância (Vega-Lite ou PNG em cache)
+    titulo = f"Evolução da Temporada: {nome_atual}"
+    interp_graf = BioMSInterpreter()
+    gerar_png = lambda: obter_artefato(
+        "temporada", [titulo, mensal],
+        lambda: renderizar(lambda: interp_graf.plot_evolucao_equipe(mensal, titulo), dpi=120)
+    )
+    mostrar_grafico(lambda: graficos_vega.evolucao_equipe_vega(mensal, titulo), gerar_png)
+
+    st.subheader("📊 Resumo por Distância")
+    st.dataframe(
+        resumo.assign(Melhor_Tempo=resumo['Melhor_Tempo'].map(formatar_tempo)).style.format(
+            {"Melhorou_Pct": "{:.0f}%", "Tendencia_Mediana": "{:+.1f}%", "Evolucao_Mediana": "{:+.1f}%"}, na_rep="-"
+        ),
+        hide_index=True, use_container_width=True
+    )
+
+    for dist in resumo['Distância']:
+        tend_dist = tendencias[tendencias['Distância'] == dist].sort_values('Tendencia_Pct', ascending=False)
+        with st.expander(f"🏃 {dist}: {len(tend_dist)} corredores"):
+            df_view = tend_dist[["Nome", "Sessoes", "Primeiro_Tempo", "Ultimo_Tempo", "Melhor_Tempo", "Tendencia_Pct", "Evolucao_Pct"]].copy()
+            for col in ("Primeiro_Tempo", "Ultimo_Tempo", "Melhor_Tempo"):
+                df_view[col] = df_view[col].map(formatar_tempo)
+            st.dataframe(df_view.style.format({"Tendencia_Pct": "{:+.1f}%", "Evolucao_Pct": "{:+.1f}%"}, na_rep="-"), hide_index=True, use_container_width=True)
+            st.caption("Melhor tempo de cada corredor em cada mês:")
+            st.dataframe(matriz_mensal(sessoes, dist).map(formatar_tempo), use_container_width=True)
+
+    if PDF_AVAILABLE:
+        try:
+            logo_bytes = logo_upload_t.getvalue() if logo_upload_t else None
+            pdf_bytes = obter_artefato(
+                "pdf_temporada", [nome_atual, resumo, tendencias, logo_bytes, date.today()],
+                lambda: gerador_pdf().criar_relatorio_temporada(nome_atual, analise, gerar_png(), logo_bytes)
+            )
+            st.download_button(
+                label="📥 BAIXAR RELATÓRIO DA TEMPORADA (PDF)", data=pdf_bytes,
+                file_name=f"Temporada_{nome_atual.replace(' ', '_')}.pdf", mime="application/pdf", use_container_width=True
+            )
+        except Exception as e:
+            st.error(f"Erro ao gerar PDF: {e}")
+
 # --- MAIN ---
-def main():
+def main(perfil):
+    # 0. Acorda o backend em segundo plano enquanto a base de elite carrega
+    aquecer_backend()
+    # Variantes otimizadas dos banners e do logo do PDF (uma vez por processo, em segundo plano)
+    preparar_ativos()
+
     # 1. Carregamento do Banco
     try:
         df_ref = load_data()
@@ -678,6 +966,16 @@ def main():
             st.image("logo.svg", width=180)
         else:
             st.title("🧬 BioMS Pro")
+        render_status_servidor()
+        historico_ativo = obter_historico() is not None
+        if historico_ativo:
+            st.caption(f"💾 Histórico local ativo: as coletas ficam gravadas neste servidor ({os.path.abspath(HISTORICO_PATH)}).")
+        st.toggle(
+            "Gráficos interativos (no navegador)",
+            value=BACKEND_GRAFICOS == "vega",
+            key="graficos_interativos",
+            help="Desligado, os gráficos voltam a ser imagens geradas no servidor. Os PDFs não mudam."
+        )
             
         # SELETOR DE MODO
         # SELETOR DE MODO
@@ -696,12 +994,17 @@ def main():
 
         #  INSERIR ESTE BLOCO AQUI 
         with st.expander("📜 Termos de Uso e Privacidade"):
-            st.markdown("""
+            # Com BIOMS_HISTORICO_DB configurado os dados ficam gravados: o termo precisa dizer isso
+            if historico_ativo:
+                privacidade = f"""**3. Privacidade:** Este servidor está com o **histórico local ativado**: nome, sexo, idade, equipe e resultados de cada atleta analisado são **gravados em disco** no arquivo `{os.path.abspath(HISTORICO_PATH)}`, neste servidor, até serem removidos por quem o administra. O BioMS não comercializa esses dados."""
+            else:
+                privacidade = "**3. Privacidade:** O BioMS não armazena, retém ou comercializa os dados sensíveis inseridos. Eles existem apenas na memória temporária para gerar o relatório."
+            st.markdown(f"""
             **1. Isenção:** O BioMS é uma ferramenta de apoio à decisão esportiva. Não substitui avaliações clínicas.
             
             **2. LGPD:** O Treinador atua como **Controlador** e garante ter o consentimento do aluno. O BioMS é apenas o **Operador** técnico.
             
-            **3. Privacidade:** O BioMS não armazena, retém ou comercializa os dados sensíveis inseridos. Eles existem apenas na memória temporária para gerar o relatório.
+            {privacidade}
             """)
         #  FIM DO BLOCO INSERIDO 
 
@@ -709,6 +1012,8 @@ def main():
     # CHAMA O CARROSSEL (ELE APARECERÁ NO TOPO DA TELA)
     # =========================================================
     render_banner_carrossel()
+    perfil.marcar("primeira pintura")
+    st.session_state['perfil_inicio'] = perfil_inicio.reportar(perfil)
 
 
     # =========================================================
@@ -739,7 +1044,11 @@ def main():
                 st.markdown("###")
                 btn_analisar = st.form_submit_button("ANALISAR PERFORMANCE 🚀", type="primary")
 
-                aceite_termos = st.checkbox("☑️ Declaro ter consentimento do aluno para calcular as métricas e concordo com os Termos (o BioMS não armazena estes dados).")
+                if historico_ativo:
+                    texto_aceite = "☑️ Declaro ter consentimento do aluno para calcular as métricas e para gravar nome, sexo, idade e resultados no histórico local deste servidor, e concordo com os Termos."
+                else:
+                    texto_aceite = "☑️ Declaro ter consentimento do aluno para calcular as métricas e concordo com os Termos (o BioMS não armazena estes dados)."
+                aceite_termos = st.checkbox(texto_aceite)
 
             
 
@@ -771,8 +1080,14 @@ def main():
                 with st.spinner("Calculando via API..."):
                     res_atleta = chamar_api_bioms(atleta_atual)
                 
+                avisar_modo_degradado([res_atleta])
+
                 # Comparação estatística e geração de relatório
                 res_finais = stats.compare_athlete(res_atleta)
+
+                historico = obter_historico()
+                if historico and "erro" not in res_atleta:
+                    historico.registrar_bioms(atleta_nome, res_finais, sexo=sexo, idade=idade)
                 relatorio_dict = interpreter.gerar_relatorio_inteligente(res_finais)
 
                 # Salva no estado da sessão para exibição
@@ -813,13 +1128,18 @@ def main():
 
             with col_left:
                 st.subheader("Matriz de Performance")
-                fig_radar = interp.plot_radar_chart(res) 
-                st.pyplot(fig_radar)
+                mostrar_grafico(
+                    lambda: graficos_vega.radar_vega(res),
+                    lambda: obter_artefato("radar", [res], lambda: renderizar(lambda: interp.plot_radar_chart(res)))
+                )
                 
                 if PDF_AVAILABLE:
                     with st.spinner("Gerando PDF..."):
                         try:
-                            pdf_data = criar_pdf(atleta, res, rel_dict, fig_radar, disclaimer)
+                            pdf_data = obter_artefato(
+                                "pdf_individual", [atleta, res, disclaimer, date.today()],
+                                lambda: gerador_pdf().criar_pdf(atleta, res, rel_dict, disclaimer)
+                            )
                             st.download_button(
                                 "📥 Baixar Relatório (PDF)", 
                                 pdf_data, 
@@ -892,8 +1212,12 @@ def main():
                 with c4: nivel = st.selectbox("Nível de Comparação:", ["Amador", "Elite"])
                 
                 st.write("---")
+                historico = obter_historico()
                 cor_col, logo_col = st.columns([1, 2])
-                with cor_col: cor_aluno = st.color_picker("Cor das Barras do Aluno:", "#3498db")
+                with cor_col:
+                    cor_aluno = st.color_picker("Cor das Barras do Aluno:", "#3498db")
+                    # As corridas ficam no histórico sob a equipe: é por ela que a Evolução de Equipes as encontra
+                    equipe_runner = st.text_input("Equipe (histórico):", "", key="equipe_runner").strip() if historico else ""
                 with logo_col: 
                     logo_raw_r = st.file_uploader("Logo do Treinador/Equipe (Opcional)", type=["png", "jpg"], key="logo_runner")
                     logo_upload_runner = validar_imagem(logo_raw_r) if logo_raw_r else None
@@ -915,6 +1239,12 @@ def main():
                     "Segundos": st.column_config.NumberColumn("Segundos", min_value=0, max_value=59, step=1, width="small")
                 }
                 
+                if historico:
+                    df_salvo = historico.historico(nome_runner, TIPO_CORRIDA, clube=equipe_runner)
+                    if not df_salvo.empty:
+                        df_template_runner = df_salvo.rename(columns={"Metrica": "Distância"}).reindex(columns=list(config_colunas_runner))
+                        st.caption(f"📚 {len(df_template_runner)} coleta(s) de {nome_runner} carregadas do histórico local.")
+                
                 df_input_runner = st.data_editor(df_template_runner, num_rows="dynamic", column_config=config_colunas_runner, use_container_width=True, hide_index=True, key="grid_runner")
 
             if st.button("🚀 GERAR RELATÓRIO DE CORRIDA", type="primary"):
@@ -930,32 +1260,48 @@ def main():
                         tempos_formatados = []
                         erro_api = False 
 
+                        # 1. Monta todos os payloads primeiro (linhas sem tempo não vão para a API)
+                        pedidos = {}
+                        for idx, row in df_calc_runner.iterrows():
+                            tempo_total = (int(row.get("Minutos", 0)) * 60) + int(row.get("Segundos", 0))
+                            if tempo_total > 0:
+                                pedidos[idx] = {
+                                    "ID": nome_runner,
+                                    "distancia": row["Distância"],
+                                    "sexo": "M" if sexo_runner == "Masculino" else "F",
+                                    "idade": int(idade_runner),
+                                    "nivel": nivel,
+                                    "tempo_segundos": float(tempo_total)
+                                }
+
+                        # 2. Dispara tudo em paralelo (sem repetir payloads idênticos), com barra de progresso
+                        progresso_run = st.progress(0)
+                        respostas = dict(zip(pedidos, calcular_corridas_em_paralelo(
+                            list(pedidos.values()),
+                            progresso=lambda concluidos, total: progresso_run.progress(concluidos / total)
+                        )))
+
+                        # 3. Junta as respostas de volta às linhas, na ordem original
+                        erro_api = avisar_modo_degradado(respostas.values())
+                        sem_resultado = []  # linhas sem tempo ou com erro na API: o 0 delas é só marcador
                         for idx, row in df_calc_runner.iterrows():
                             dist = row["Distância"]
                             mins = int(row.get("Minutos", 0))
                             segs = int(row.get("Segundos", 0))
                             
-                            tempo_total = (mins * 60) + segs
-                            
-                            if tempo_total <= 0:
+                            if idx not in respostas:
+                                sem_resultado.append(idx)
                                 valores_percentil.append(0)
                                 z_scores_visuais.append(0)
                                 tempos_formatados.append("00m 00s")
                                 continue
                                 
-                            dados_req = {
-                                "ID": nome_runner,
-                                "distancia": dist,
-                                "sexo": "M" if sexo_runner == "Masculino" else "F",
-                                "idade": int(idade_runner),
-                                "nivel": nivel,
-                                "tempo_segundos": float(tempo_total)
-                            }
-                            
-                            res_api = calcular_corrida_api(dados_req)
+                            res_api = respostas[idx]
                             
                             if "erro" in res_api:
-                                st.warning(f"Erro ao calcular {dist} em {row['Data']}: {res_api['erro']}")
+                                sem_resultado.append(idx)
+                                if not res_api.get("circuito_aberto"):
+                                    st.warning(f"Erro ao calcular {dist} em {row['Data']}: {res_api['erro']}")
                                 valores_percentil.append(0)
                                 z_scores_visuais.append(0)
                                 tempos_formatados.append(f"{mins}m {segs}s")
@@ -970,17 +1316,20 @@ def main():
                         df_calc_runner["Valor_Final"] = valores_percentil 
                         df_calc_runner["Z_Score_Visual"] = z_scores_visuais
                         df_calc_runner["Tempo_Txt"] = tempos_formatados
+
+                        if historico:
+                            historico.reconciliar(nome_runner, TIPO_CORRIDA, zip(df_calc_runner["Distância"], df_calc_runner["Data"]), clube=equipe_runner)
+                            # Só as corridas calculadas: um 0 de erro viraria um percentil 0 "real" no histórico
+                            historico.registrar(nome_runner, TIPO_CORRIDA, [
+                                {"metrica": row["Distância"], "data": row["Data"], "valor": row["Valor_Final"],
+                                 "Minutos": int(row.get("Minutos", 0)), "Segundos": int(row.get("Segundos", 0))}
+                                for _, row in df_calc_runner.drop(index=sem_resultado).iterrows()
+                            ], clube=equipe_runner, sexo=sexo_runner, idade=idade_runner)
                         
                         if not erro_api:
                             st.success("Cálculos concluídos com sucesso!")
                         
-                        logo_path = None
-                        if logo_upload_runner:
-                            import tempfile
-                            ext = os.path.splitext(logo_upload_runner.name)[1]
-                            with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-                                tmp.write(logo_upload_runner.getvalue())
-                                logo_path = tmp.name
+                        logo_bytes = logo_upload_runner.getvalue() if logo_upload_runner else None
 
                         st.write("---")
                         st.subheader(f"Evolução de Performance: {nome_runner} ({idade_runner} anos)")
@@ -993,11 +1342,12 @@ def main():
                             df_dist = df_calc_runner[df_calc_runner["Distância"] == dist].copy()
                             media_oficial = 50.0 
                             
-                            fig = interp_graf.plot_longitudinal_evolution(df_dist, media_oficial, f"Performance ({dist})", cor_aluno)
-                            
                             col_graf, col_tab = st.columns([7, 3])
                             with col_graf:
-                                st.pyplot(fig, use_container_width=True)
+                                mostrar_grafico(
+                                    lambda: graficos_vega.longitudinal_vega(df_dist, media_oficial, f"Performance ({dist})", cor_aluno),
+                                    lambda: renderizar(lambda: interp_graf.plot_longitudinal_evolution(df_dist, media_oficial, f"Performance ({dist})", cor_aluno))
+                                )
                             
                             with col_tab:
                                 st.markdown(f"**Detalhes ({dist}):**")
@@ -1020,16 +1370,16 @@ def main():
                             
                             st.session_state['dados_pdf_corrida'].append({
                                 "exercicio": dist,
-                                "df": df_dist,
+                                "df": df_dist[["Data", "Valor_Final"]],
                                 "media_grupo": media_oficial,
-                                "figura": fig,
+                                "cor": cor_aluno,
                                 "evolucao": progresso_txt
                             })
 
                         if PDF_AVAILABLE and len(st.session_state['dados_pdf_corrida']) > 0:
                             try:
-                                pdf_bytes = criar_relatorio_normativo_longitudinal(
-                                    nome_runner, idade_runner, st.session_state['dados_pdf_corrida'], logo_path,
+                                pdf_bytes = gerador_pdf().criar_relatorio_normativo_longitudinal(
+                                    nome_runner, idade_runner, st.session_state['dados_pdf_corrida'], logo_bytes,
                                     titulo_relatorio="Relatório de Progresso e Performance de Corrida"
                                 )
                                 st.download_button(
@@ -1111,17 +1461,29 @@ def main():
                         
                         # --- MOTOR 2: COMPARAÇÃO GLOBAL (API) ---
                         else:
+                            linhas_validas = []
+                            pedidos = []
                             for idx, row in df_calc.iterrows():
                                 t = row.get("Minutos",0)*60 + row.get("Segundos",0)
                                 if t <= 0: continue
                                 
-                                req = {
+                                linhas_validas.append((row, t))
+                                pedidos.append({
                                     "ID": row["Nome"], "distancia": row["Distância"],
                                     "sexo": "M" if row["Sexo"]=="Masculino" else "F",
                                     "idade": int(row["Idade"]), "nivel": row["Nível"],
                                     "tempo_segundos": float(t)
-                                }
-                                res_api = calcular_corrida_api(req)
+                                })
+
+                            # Todos os atletas em paralelo (payloads idênticos só vão uma vez para a API)
+                            progresso_run = st.progress(0)
+                            respostas = calcular_corridas_em_paralelo(
+                                pedidos,
+                                progresso=lambda concluidos, total: progresso_run.progress(concluidos / total)
+                            )
+
+                            avisar_modo_degradado(respostas)
+                            for (row, t), res_api in zip(linhas_validas, respostas):
                                 if "erro" not in res_api:
                                     # Inverte visualmente o Z-Score que veio da API
                                     z_visual = res_api["z_score"] * -1
@@ -1140,13 +1502,7 @@ def main():
                             df_res = pd.DataFrame(resultados)
                             st.success("Cálculo concluído com sucesso!")
                             
-                            logo_path = None
-                            if logo_upload_g:
-                                import tempfile
-                                ext = os.path.splitext(logo_upload_g.name)[1]
-                                with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-                                    tmp.write(logo_upload_g.getvalue())
-                                    logo_path = tmp.name
+                            logo_bytes = logo_upload_g.getvalue() if logo_upload_g else None
                                     
                             interp = BioMSInterpreter()
                             
@@ -1157,8 +1513,9 @@ def main():
                                 st.subheader(f"🏆 Ranking de Performance: {dist}")
                                 
                                 # Gráfico Z-Score Global / Individual
-                                fig = interp.plot_ranking_batch(df_dist_res, "Z_Score", f"Comparativo ({modo_comp_run.split(' ')[1]})")
-                                st.pyplot(fig, use_container_width=True)
+                                titulo_ranking = f"Comparativo ({modo_comp_run.split(' ')[1]})"
+                                png_ranking = renderizar(lambda: interp.plot_ranking_batch(df_dist_res, "Z_Score", titulo_ranking))
+                                mostrar_grafico(lambda: graficos_vega.ranking_vega(df_dist_res, "Z_Score", titulo_ranking), lambda: png_ranking)
                                 
                                 # Tabela de Dados Exatos
                                 with st.expander("📋 Ver Tabela de Tempos Exatos"):
@@ -1167,7 +1524,7 @@ def main():
                                 # PDF usando o Z-Score Universal!
                                 if PDF_AVAILABLE:
                                     try:
-                                        pdf_bytes = criar_relatorio_zscore_universal(df_dist_res, f"Corrida {dist} - {nome_equipe_run}", fig, logo_path)
+                                        pdf_bytes = gerador_pdf().criar_relatorio_zscore_universal(df_dist_res, f"Corrida {dist} - {nome_equipe_run}", png_ranking, logo_bytes)
                                         st.download_button(
                                             label=f"📥 BAIXAR RELATÓRIO {dist} (PDF)", 
                                             data=pdf_bytes, 
@@ -1181,6 +1538,6 @@ def main():
         # CAMINHO C: EQUIPE LONGITUDINAL (ISCA PREMIUM)
         # ---------------------------------------------------------
         elif "Premium" in modo_runner:
-            st.info("🚀 **Recurso Premium:** Acompanhe a evolução de centenas de corredores ao longo de toda a temporada simultaneamente. Entre em contato para ativar este módulo no seu plano SaaS.")
+            render_interface_temporada()
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(perfil)
\ No newline at end of file
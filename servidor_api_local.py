@@ -0,0 +1,172 @@
+"""
+Servidor local que imita a API BioMS (main.py) para desenvolvimento e testes offline.
+
+Uso:
+    python servidor_api_local.py --porta 8000            # com a rota de lote
+    python servidor_api_local.py --porta 8000 --sem-lote # imita um backend antigo (404 em /calcular-lote)
+
+    BIOMS_API_URL=http://127.0.0.1:8000 streamlit run app.py
+
+ATENÇÃO: as fórmulas abaixo são apenas substitutas determinísticas. Elas NÃO são os
+índices BioMS reais; servem só para exercitar o app e o api_client sem internet.
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+EXERCICIOS = ["Supino Reto", "Agachamento Livre", "Levantamento Terra", "Flexão de Braço (Reps)", "Abdominal (Reps)"]
+
+# Tempo médio (segundos) por distância, usado pela rota de corrida
+TEMPOS_REFERENCIA = {
+    "100m": (14.0, 1.5), "400m": (70.0, 8.0), "1500m": (360.0, 45.0),
+    "5km": (1650.0, 240.0), "10km": (3450.0, 480.0),
+}
+
+
+def calcular_atleta(dados):
+    """Versão substituta do /calcular: devolve os dados de entrada + BioMS_1/5/8/9."""
+    try:
+        altura = float(dados.get("HEIGHT", 0))
+        peso = float(dados.get("WEIGHT", 0))
+        r = float(dados.get("R", 0))
+        xc = float(dados.get("Xc", 0))
+    except (TypeError, ValueError):
+        return {"erro": "Dados inválidos", "detalhe": "Campos numéricos não reconhecidos"}
+
+    if altura <= 0 or peso <= 0 or r <= 0 or xc <= 0:
+        return {"erro": "Dados inválidos", "detalhe": "Altura, Peso, R e Xc precisam ser maiores que zero"}
+
+    angulo_fase = math.degrees(math.atan(xc / r))
+    indice_impedancia = altura ** 2 / r
+
+    resultado = dict(dados)
+    resultado.update({
+        "BioMS_1": indice_impedancia / peso,
+        "BioMS_5": angulo_fase,
+        "BioMS_8": xc / altura * 10,
+        "BioMS_9": angulo_fase * indice_impedancia / 100,
+    })
+    return resultado
+
+
+def calcular_corrida(dados):
+    media, desvio = TEMPOS_REFERENCIA.get(dados.get("distancia"), (None, None))
+    if media is None:
+        return None
+    if dados.get("nivel") == "Elite":
+        media *= 0.8
+    z = (float(dados.get("tempo_segundos", 0)) - media) / desvio
+    percentil = 100 * (1 - 0.5 * (1 + math.erf(z / math.sqrt(2))))
+    return {"ID": dados.get("ID"), "z_score": z, "percentil": percentil}
+
+
+def referencia_elite(n=600):
+    rng = random.Random(42)
+    linhas = []
+    for i in range(n):
+        atleta = {
+            "ID": f"Elite_{i}", "SEXO": i % 2, "AGE": rng.randint(18, 35),
+            "HEIGHT": rng.gauss(178, 8), "WEIGHT": rng.gauss(76, 9),
+            "R": rng.gauss(470, 50), "Xc": rng.gauss(60, 7),
+        }
+        linhas.append(calcular_atleta(atleta))
+    return linhas
+
+
+class ServidorBioMS(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como o backend real
+    suporta_lote = True
+    _referencia = None
+
+    def _responder(self, status, corpo, cabecalhos=None):
+        dados = json.dumps(corpo).encode("utf-8") if corpo is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        for chave, valor in (cabecalhos or {}).items():
+            self.send_header(chave, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _ler_json(self):
+        tamanho = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(tamanho) or b"{}")
+
+    def do_GET(self):
+        if self.path == "/lista-exercicios":
+            self._responder(200, EXERCICIOS)
+        elif self.path == "/referencia-elite":
+            if ServidorBioMS._referencia is None:
+                ServidorBioMS._referencia = referencia_elite()
+            corpo = ServidorBioMS._referencia
+            etag = '"' + hashlib.sha1(json.dumps(corpo).encode()).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self._responder(304, None, {"ETag": etag})
+            else:
+                self._responder(200, corpo, {"ETag": etag})
+        elif self.path in ("/", "/health"):
+            self._responder(200, {"status": "ok"})
+        else:
+            self._responder(404, {"detail": "Not Found"})
+
+    def do_POST(self):
+        try:
+            dados = self._ler_json()
+        except ValueError:
+            self._responder(422, {"detail": "JSON inválido"})
+            return
+
+        if self.path == "/calcular":
+            resultado = calcular_atleta(dados)
+            self._responder(422 if "erro" in resultado else 200, resultado)
+
+        elif self.path == "/calcular-lote" and self.suporta_lote:
+            atletas = dados.get("atletas", []) if isinstance(dados, dict) else []
+            # Erros são reportados por linha, sem derrubar o lote inteiro
+            self._responder(200, {"resultados": [calcular_atleta(a) for a in atletas]})
+
+        elif self.path == "/consulta-normativa":
+            if dados.get("exercicio") not in EXERCICIOS:
+                self._responder(404, {"detail": "Exercício sem norma"})
+                return
+            base = 40 + 5 * EXERCICIOS.index(dados["exercicio"])
+            fator_sexo = 1.0 if dados.get("sexo") == "Masculino" else 0.7
+            fator_idade = max(0.5, 1 - max(0, int(dados.get("idade", 30)) - 30) * 0.01)
+            self._responder(200, {"media": round(base * fator_sexo * fator_idade, 1)})
+
+        elif self.path == "/calcular-corrida":
+            resultado = calcular_corrida(dados)
+            if resultado is None:
+                self._responder(422, {"detail": "Distância desconhecida"})
+            else:
+                self._responder(200, resultado)
+
+        else:
+            self._responder(404, {"detail": "Not Found"})
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def criar_servidor(host="127.0.0.1", porta=8000, suporta_lote=True):
+    """Cria (sem iniciar) o servidor. Use porta=0 para uma porta livre aleatória."""
+    handler = type("ServidorBioMSConfigurado", (ServidorBioMS,), {"suporta_lote": suporta_lote})
+    return ThreadingHTTPServer((host, porta), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local substituto da API BioMS")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--sem-lote", action="store_true", help="Responde 404 em /calcular-lote")
+    args = parser.parse_args()
+
+    servidor = criar_servidor(args.host, args.porta, suporta_lote=not args.sem_lote)
+    print(f"API BioMS local em http://{args.host}:{servidor.server_port} (lote: {'não' if args.sem_lote else 'sim'})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,94 @@
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from src.cache import CacheLRU
+
+# Teto de memória para PNGs e PDFs já renderizados (compartilhado por todas as sessões)
+LIMITE_BYTES = 256 * 1024 * 1024
+LIMITE_ITENS = 512
+
+# Mudou o desenho de algum gráfico/relatório? Suba a versão para invalidar o que está em cache
+VERSAO_ARTEFATOS = "1"
+
+
+class CacheArtefatos(CacheLRU):
+    """CacheLRU que também respeita um teto em bytes (PDFs de grupo passam de 1 MB cada)."""
+
+    def __init__(self, maxsize=LIMITE_ITENS, max_bytes=LIMITE_BYTES):
+        super().__init__(maxsize=maxsize)
+        self.max_bytes = max_bytes
+        self.bytes = 0
+
+    def set(self, chave, valor):
+        with self._lock:
+            antigo = self._dados.pop(chave, None)
+            if antigo is not None:
+                self.bytes -= len(antigo[1])
+            self._dados[chave] = (None, valor)
+            self.bytes += len(valor)
+            # Descarta os usados há mais tempo até caber (mas nunca o que acabou de entrar)
+            while len(self._dados) > 1 and (len(self._dados) > self.maxsize or self.bytes > self.max_bytes):
+                _, (_, descartado) = self._dados.popitem(last=False)
+                self.bytes -= len(descartado)
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+            self.bytes = 0
+
+    def estatisticas(self):
+        resumo = super().estatisticas()
+        resumo["bytes"] = self.bytes
+        return resumo
+
+
+_cache = CacheArtefatos()
+
+
+def _atualizar_hash(h, parte):
+    """Alimenta o hash com uma representação estável de cada tipo de entrada."""
+    if parte is None:
+        h.update(b"\x00none")
+    elif isinstance(parte, (bytes, bytearray, memoryview)):
+        h.update(b"\x01bytes")
+        h.update(bytes(parte))
+    elif isinstance(parte, pd.DataFrame):
+        h.update(b"\x02df")
+        h.update(json.dumps([str(c) for c in parte.columns]).encode())
+        h.update(pd.util.hash_pandas_object(parte, index=False).values.tobytes())
+    elif isinstance(parte, pd.Series):
+        h.update(b"\x03serie")
+        h.update(pd.util.hash_pandas_object(parte, index=False).values.tobytes())
+    else:
+        # dicts, listas, números e textos: JSON ordenado (numpy vira float/str)
+        h.update(b"\x04json")
+        h.update(json.dumps(parte, sort_keys=True, default=_json_padrao).encode())
+    h.update(b"\xff")
+
+
+def _json_padrao(valor):
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return str(valor)
+
+
+def chave_artefato(tipo, *partes):
+    """Hash do conteúdo: mesmo tipo + mesmas entradas = mesmo artefato."""
+    h = hashlib.sha256(f"{VERSAO_ARTEFATOS}:{tipo}".encode())
+    for parte in partes:
+        _atualizar_hash(h, parte)
+    return f"{tipo}:{h.hexdigest()}"
+
+
+def obter_artefato(tipo, partes, gerar):
+    """
+    Devolve os bytes (PNG/PDF) já renderizados para estas entradas ou chama gerar() uma vez.
+    Reruns do Streamlit com os mesmos dados não redesenham nada.
+    """
+    return _cache.obter_ou_calcular(chave_artefato(tipo, *partes), gerar)
+
+
+def estatisticas_artefatos():
+    return _cache.estatisticas()
@@ -0,0 +1,184 @@
+import io
+import os
+import base64
+import threading
+
+from PIL import Image, features
+
+from src.cache import CacheLRU
+
+# Imagens originais (PNG de 1-2 MB) e variantes otimizadas geradas a partir delas
+PASTA_ORIGEM = "assets"
+PASTA_ESTATICA = os.path.join("static", "ativos")  # servida pelo Streamlit (enableStaticServing)
+URL_ESTATICA = "app/static/ativos"
+
+BANNERS = ("pg_salto", "pg_corre", "pg_academia")
+LARGURAS = {"desktop": 1366, "mobile": 768}
+LARGURA_MOBILE_MAX = 768  # px: mesmo corte do @media do banner
+QUALIDADE_WEBP = 80
+QUALIDADE_JPEG = 82
+
+# O logo do sistema ocupa no máximo 40 mm no cabeçalho do PDF: ~480 px dá 300 dpi
+LOGO_ORIGEM = "logo.png"
+LOGO_PDF_LARGURA = 480
+QUALIDADE_LOGO = 92  # bordas nítidas do logo pedem menos compressão que as fotos
+
+_cache = CacheLRU(maxsize=16)
+_preparacao = {"iniciada": False}
+_preparacao_lock = threading.Lock()
+
+
+def _formatos():
+    """WebP quando o Pillow tem suporte; JPEG sempre, como alternativa para navegadores antigos."""
+    return ("webp", "jpg") if features.check("webp") else ("jpg",)
+
+
+def _reduzir(img, largura):
+    if img.width <= largura:
+        return img
+    altura = round(img.height * largura / img.width)
+    return img.resize((largura, altura), Image.LANCZOS)
+
+
+def _rgb(img):
+    """Achata a transparência sobre fundo branco (JPEG não tem canal alfa)."""
+    if img.mode == "RGB":
+        return img
+    img = img.convert("RGBA")
+    fundo = Image.new("RGB", img.size, (255, 255, 255))
+    fundo.paste(img, mask=img.getchannel("A"))
+    return fundo
+
+
+def _codificar(img, formato, qualidade=None):
+    buffer = io.BytesIO()
+    if formato == "webp":
+        img.save(buffer, format="WEBP", quality=qualidade or QUALIDADE_WEBP, method=6)
+    else:
+        img.save(buffer, format="JPEG", quality=qualidade or QUALIDADE_JPEG, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def _gravar(destino, dados):
+    """Gravação atômica (temporário + rename). Devolve False se o disco não for gravável."""
+    try:
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        tmp = destino + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(dados)
+        os.replace(tmp, destino)
+        return True
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar {destino}, servindo o banner pela memória: {e}")
+        return False
+
+
+def _gerar_banner(nome):
+    """
+    Gera as variantes desktop/mobile (WebP + JPEG) de um banner. Arquivos já gerados e
+    mais novos que o PNG de origem são reaproveitados, então o custo é pago uma vez por deploy.
+    Devolve {variante: {formato: {"arquivo", "dados"}}} ou None se o PNG não existir.
+    """
+    origem = os.path.join(PASTA_ORIGEM, f"{nome}.png")
+    if not os.path.exists(origem):
+        return None
+    mtime_origem = os.path.getmtime(origem)
+
+    img = None
+    variantes = {}
+    for variante, largura in LARGURAS.items():
+        variantes[variante] = {}
+        for formato in _formatos():
+            arquivo = f"{nome}-{variante}.{formato}"
+            destino = os.path.join(PASTA_ESTATICA, arquivo)
+            dados = None
+            if not os.path.exists(destino) or os.path.getmtime(destino) < mtime_origem:
+                if img is None:
+                    with Image.open(origem) as aberta:
+                        img = _rgb(aberta).copy()
+                dados = _codificar(_reduzir(img, largura), formato)
+                if _gravar(destino, dados):
+                    dados = None  # já está no disco: o navegador busca pela URL estática
+            variantes[variante][formato] = {"arquivo": arquivo, "dados": dados}
+    return variantes
+
+
+def _variantes_banner(nome):
+    return _cache.obter_ou_calcular(("banner", nome), lambda: _gerar_banner(nome))
+
+
+def preparar_ativos():
+    """Gera em segundo plano, uma vez por processo, as variantes de todos os banners e do logo."""
+    with _preparacao_lock:
+        if _preparacao["iniciada"]:
+            return
+        _preparacao["iniciada"] = True
+
+    def _preparar():
+        for nome in BANNERS:
+            try:
+                _variantes_banner(nome)
+            except Exception as e:
+                print(f"Aviso: falha ao otimizar o banner {nome}: {e}")
+        try:
+            logo_pdf()
+        except Exception as e:
+            print(f"Aviso: falha ao otimizar o logo: {e}")
+
+    threading.Thread(target=_preparar, name="bioms-ativos", daemon=True).start()
+
+
+def _src(item, formato):
+    """URL estática do arquivo ou, sem disco gravável, data URI da variante já comprimida."""
+    if item["dados"] is None:
+        return f"{URL_ESTATICA}/{item['arquivo']}"
+    mime = "image/webp" if formato == "webp" else "image/jpeg"
+    return f"data:{mime};base64,{base64.b64encode(item['dados']).decode()}"
+
+
+def _montar_html_banner(nome, classe, alt):
+    variantes = _variantes_banner(nome)
+    if not variantes:
+        return ""
+    desktop, mobile = variantes["desktop"], variantes["mobile"]
+    em_memoria = any(item["dados"] is not None for v in variantes.values() for item in v.values())
+    if em_memoria:
+        # Sem arquivos estáticos vai uma única imagem (a mais leve), e não o PNG original de 1.9 MB em base64
+        formato = "webp" if "webp" in desktop else "jpg"
+        return f'<img class="{classe}" src="{_src(desktop[formato], formato)}" alt="{alt}">'
+
+    fontes = []
+    for formato in ("webp", "jpg"):
+        if formato not in desktop:
+            continue
+        mime = "image/webp" if formato == "webp" else "image/jpeg"
+        fontes.append(
+            f'<source media="(max-width: {LARGURA_MOBILE_MAX}px)" type="{mime}" srcset="{_src(mobile[formato], formato)}">'
+        )
+        fontes.append(f'<source type="{mime}" srcset="{_src(desktop[formato], formato)}">')
+    return (
+        f'<picture>{"".join(fontes)}'
+        f'<img class="{classe}" src="{_src(desktop["jpg"], "jpg")}" alt="{alt}" decoding="async"></picture>'
+    )
+
+
+def html_banner(nome, classe="banner-estatico", alt="Banner Principal"):
+    """
+    HTML responsivo (<picture> com WebP/JPEG para desktop e mobile) de um banner,
+    montado uma vez por processo. Vazio se a imagem de origem não existir.
+    """
+    return _cache.obter_ou_calcular(("html", nome, classe, alt), lambda: _montar_html_banner(nome, classe, alt))
+
+
+def _gerar_logo_pdf():
+    try:
+        with Image.open(LOGO_ORIGEM) as img:
+            # JPEG RGB entra no PDF sem recompressão (DCTDecode)
+            return _codificar(_rgb(_reduzir(img, LOGO_PDF_LARGURA)), "jpg", QUALIDADE_LOGO)
+    except OSError:
+        return None
+
+
+def logo_pdf():
+    """Logo do sistema reduzido para o tamanho em que aparece no PDF (JPEG de poucos KB, em memória)."""
+    return _cache.obter_ou_calcular(("logo_pdf",), _gerar_logo_pdf)
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache em memória, compartilhado por todas as sessões do processo.
+    - Tamanho limitado (descarta o item usado há mais tempo - LRU);
+    - Validade opcional por item (ttl em segundos);
+    - Single-flight: chamadas simultâneas para a mesma chave viram UM único cálculo,
+      e as outras threads esperam o resultado dele.
+    """
+
+    def __init__(self, maxsize=256, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._dados = OrderedDict()  # chave -> (expira_em, valor)
+        self._em_voo = {}            # chave -> cálculo em andamento (evento + resultado)
+        self._lock = threading.Lock()
+
+    def _buscar(self, chave):
+        """Procura a chave (precisa ser chamado com o lock). Retorna (achou, valor)."""
+        item = self._dados.get(chave)
+        if item is None:
+            return False, None
+        expira_em, valor = item
+        if expira_em is not None and time.monotonic() > expira_em:
+            del self._dados[chave]
+            return False, None
+        self._dados.move_to_end(chave)
+        return True, valor
+
+    def get(self, chave, padrao=None):
+        with self._lock:
+            achou, valor = self._buscar(chave)
+            if achou:
+                self.hits += 1
+                return valor
+            self.misses += 1
+            return padrao
+
+    def set(self, chave, valor):
+        with self._lock:
+            expira_em = time.monotonic() + self.ttl if self.ttl else None
+            self._dados[chave] = (expira_em, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.maxsize:
+                self._dados.popitem(last=False)
+
+    def obter_ou_calcular(self, chave, funcao, cachear=None):
+        """
+        Devolve o valor em cache ou executa 'funcao()' uma única vez por chave.
+        'cachear(valor)' decide se o resultado deve ser guardado (ex: não guardar erros);
+        mesmo quando não é guardado, quem estava esperando recebe o mesmo resultado.
+        """
+        while True:
+            with self._lock:
+                achou, valor = self._buscar(chave)
+                if achou:
+                    self.hits += 1
+                    return valor
+
+                voo = self._em_voo.get(chave)
+                lider = voo is None
+                if lider:
+                    # Esta thread é a "líder": as demais vão esperar por ela
+                    self.misses += 1
+                    voo = {"evento": threading.Event(), "valor": None, "ok": False}
+                    self._em_voo[chave] = voo
+
+            if not lider:
+                voo["evento"].wait()
+                if voo["ok"]:
+                    with self._lock:
+                        self.hits += 1
+                    return voo["valor"]
+                # O líder levantou exceção: tentamos de novo (talvez como líder)
+                continue
+
+            try:
+                valor = funcao()
+                voo["valor"], voo["ok"] = valor, True
+                if cachear is None or cachear(valor):
+                    self.set(chave, valor)
+                return valor
+            finally:
+                with self._lock:
+                    self._em_voo.pop(chave, None)
+                voo["evento"].set()
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+
+    def estatisticas(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "itens": len(self._dados),
+                "hits": self.hits,
+                "misses": self.misses,
+                "taxa_acerto": (self.hits / total) if total else 0.0,
+            }
@@ -1,34 +1,157 @@
 import os
+import json
+import time
+import threading
 import pandas as pd
 import streamlit as st
 import requests
 
 # Endereço da sua API para buscar o banco de dados
-API_URL = "https://bioms-api-backend.onrender.com/referencia-elite"
+API_URL = os.environ.get("BIOMS_API_URL", "https://bioms-api-backend.onrender.com") + "/referencia-elite"
+
+# Snapshot local da base de elite (sobrevive a reinícios do container / cold start do Render)
+SNAPSHOT_DIR = os.environ.get("BIOMS_CACHE_DIR", ".cache")
+SNAPSHOT_PATH = os.path.join(SNAPSHOT_DIR, "referencia_elite.parquet")
+META_PATH = os.path.join(SNAPSHOT_DIR, "referencia_elite.json")
+
+# Depois desse prazo o snapshot continua sendo servido, mas é revalidado em segundo plano
+REVALIDAR_APOS = 2 * 60 * 60  # 2h (o mesmo ttl do antigo st.cache_data)
+
+# Estado compartilhado por todas as sessões do processo
+_lock = threading.Lock()
+_estado = {"df": None, "etag": None, "baixado_em": 0.0, "revalidando": False}
+
+
+def _cabecalho():
+    senha_secreta = os.environ.get("API_KEY_SECRETA", "BioMS_Ultra_Token_2026")
+    return {"X-API-KEY": senha_secreta}
+
+
+def _ler_snapshot():
+    """Lê o último snapshot bom do disco. Retorna (df, meta) ou (None, {})."""
+    try:
+        df = pd.read_parquet(SNAPSHOT_PATH)
+        meta = {}
+        if os.path.exists(META_PATH):
+            with open(META_PATH, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        return df, meta
+    except Exception:
+        return None, {}
+
+
+def _salvar_snapshot(df, meta):
+    """Grava o snapshot de forma atômica (arquivo temporário + rename)."""
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp_parquet = SNAPSHOT_PATH + ".tmp"
+        df.to_parquet(tmp_parquet, index=False)
+        os.replace(tmp_parquet, SNAPSHOT_PATH)
+
+        tmp_meta = META_PATH + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, META_PATH)
+    except Exception as e:
+        # Sem pyarrow ou sem disco gravável: seguimos só com a memória
+        print(f"Aviso: não foi possível gravar o snapshot da base de elite: {e}")
+
+
+def _baixar_referencia(etag=None):
+    """
+    Busca a base de elite na API, enviando o ETag conhecido.
+    Retorna (df, etag); df é None quando a API responde 304 (nada mudou).
+    """
+    cabecalho = _cabecalho()
+    if etag:
+        cabecalho["If-None-Match"] = etag
+
+    response = requests.get(API_URL, headers=cabecalho, timeout=15)
+
+    if response.status_code == 304:
+        return None, etag
+    if response.status_code != 200:
+        raise requests.exceptions.HTTPError(f"Erro na API: Código {response.status_code}", response=response)
+
+    novo_etag = response.headers.get("ETag") or response.headers.get("X-Data-Version")
+    return pd.DataFrame(response.json()), novo_etag
+
+
+def _aplicar_download(df, etag):
+    """Atualiza a memória e o disco após um download bem-sucedido."""
+    agora = time.time()
+    with _lock:
+        # Uma resposta vazia nunca substitui o último snapshot bom
+        if df is not None and (not df.empty or _estado["df"] is None):
+            _estado["df"] = df
+        _estado["etag"] = etag
+        _estado["baixado_em"] = agora
+        df_atual = _estado["df"]
+
+    if df is not None and not df.empty:
+        _salvar_snapshot(df, {"etag": etag, "baixado_em": agora})
+    elif df is None and df_atual is not None:
+        # 304: os dados são os mesmos, só renovamos a validade
+        _salvar_snapshot(df_atual, {"etag": etag, "baixado_em": agora})
+
+
+def _revalidar():
+    """Roda em segundo plano: nunca bloqueia o usuário e nunca apaga o último snapshot bom."""
+    try:
+        # Lê o etag sob o lock (load_data pode estar trocando o snapshot), mas baixa fora dele
+        with _lock:
+            etag_atual = _estado["etag"]
+        df, etag = _baixar_referencia(etag_atual)
+        _aplicar_download(df, etag)
+    except Exception as e:
+        print(f"Aviso: revalidação da base de elite falhou, mantendo o snapshot atual: {e}")
+    finally:
+        with _lock:
+            _estado["revalidando"] = False
+
+
+def _agendar_revalidacao():
+    with _lock:
+        if _estado["revalidando"]:
+            return
+        _estado["revalidando"] = True
+    threading.Thread(target=_revalidar, name="bioms-revalidar-elite", daemon=True).start()
+
 
-@st.cache_data(show_spinner="Baixando base de elite da nuvem...", ttl="2h")
 def load_data():
     """
-    Busca a base de elite já calculada pela API, usando o crachá de segurança.
+    Devolve a base de elite imediatamente a partir do snapshot (memória ou disco)
+    e revalida com a API em segundo plano (stale-while-revalidate).
+    Só bloqueia na primeira execução, quando ainda não existe nenhum snapshot.
     """
-    senha_secreta = os.environ.get("API_KEY_SECRETA", "BioMS_Ultra_Token_2026")
-    cabecalho = {"X-API-KEY": senha_secreta}
+    with _lock:
+        if _estado["df"] is None:
+            df_disco, meta = _ler_snapshot()
+            if df_disco is not None:
+                _estado["df"] = df_disco
+                _estado["etag"] = meta.get("etag")
+                _estado["baixado_em"] = meta.get("baixado_em", 0.0)
+        df = _estado["df"]
+        vencido = time.time() - _estado["baixado_em"] > REVALIDAR_APOS
+
+    if df is not None:
+        if vencido:
+            _agendar_revalidacao()
+        return df
 
+    # Primeira execução sem snapshot: não há o que servir, então buscamos na hora
     try:
-        # Pede os dados para a API e mostra o crachá
-        response = requests.get(API_URL, headers=cabecalho, timeout=15)
-        
-        if response.status_code == 200:
-            dados = response.json()
-            df = pd.DataFrame(dados)
-            
-            if df.empty:
-                st.warning("⚠️ O banco de elite do Supabase está vazio.")
-            return df
-        else:
-            st.error(f"Erro na API: Código {response.status_code}")
-            return pd.DataFrame()
-            
+        with st.spinner("Baixando base de elite da nuvem..."):
+            df, etag = _baixar_referencia()
+        _aplicar_download(df, etag)
+
+        if df.empty:
+            st.warning("⚠️ O banco de elite do Supabase está vazio.")
+        return df
+
+    except requests.exceptions.HTTPError as e:
+        st.error(str(e))
+        return pd.DataFrame()
     except requests.exceptions.RequestException as e:
         st.error("🚨 CRÍTICO: Não foi possível conectar à API.")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
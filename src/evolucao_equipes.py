@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+from src.historico import data_ordenavel
+
+# Motor da "Evolução de Equipes (Premium)": uma temporada inteira de sessões de corrida
+# (dezenas de milhares de linhas) resolvida com groupby/quantis em bloco, sem laço por linha
+# e sem chamada à API (a evolução é do corredor contra ele mesmo).
+
+DISTANCIAS_KM = {"100m": 0.1, "400m": 0.4, "1500m": 1.5, "5km": 5.0, "10km": 10.0, "21km": 21.0975, "42km": 42.195}
+COLUNAS_OBRIGATORIAS = ("Nome", "Distância", "Data")
+
+# Tendência = inclinação da reta tempo x dias, expressa em % do tempo médio a cada JANELA_DIAS
+JANELA_DIAS = 30
+MIN_SESSOES_TENDENCIA = 2
+
+
+def preparar_sessoes(df):
+    """
+    Normaliza a planilha da temporada: Nome, Distância, Data (datetime), Tempo_Seg e Ritmo_Seg_Km.
+    Aceita o tempo em 'Tempo_Seg' ou em 'Minutos' + 'Segundos'. Linhas sem data, nome
+    ou tempo válido são descartadas. Devolve (sessoes, descartadas).
+    """
+    faltando = [c for c in COLUNAS_OBRIGATORIAS if c not in df.columns]
+    if "Tempo_Seg" not in df.columns and "Minutos" not in df.columns:
+        faltando.append("Minutos/Segundos")
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+
+    if "Tempo_Seg" in df.columns:
+        tempo = pd.to_numeric(df["Tempo_Seg"], errors="coerce")
+    else:
+        segundos = pd.to_numeric(df["Segundos"], errors="coerce").fillna(0) if "Segundos" in df.columns else 0
+        tempo = pd.to_numeric(df["Minutos"], errors="coerce").fillna(0) * 60 + segundos
+
+    # Datas: o formato do editor (dd/mm/aaaa) vai em bloco; os demais ("Jan/26", ISO)
+    # são convertidos uma vez por valor distinto, não uma vez por linha
+    texto = df["Data"].astype(str).str.strip()
+    datas = pd.to_datetime(texto, format="%d/%m/%Y", errors="coerce")
+    faltam = datas.isna()
+    if faltam.any():
+        mapa = {valor: data_ordenavel(valor, padrao="") for valor in texto[faltam].unique()}
+        datas[faltam] = pd.to_datetime(texto[faltam].map(mapa), format="%Y-%m-%d", errors="coerce")
+
+    sessoes = pd.DataFrame({
+        "Nome": df["Nome"].astype(str).str.strip(),
+        "Distância": df["Distância"].astype(str).str.strip(),
+        "Data": datas,
+        "Tempo_Seg": tempo.astype(float),
+    })
+    if "Sexo" in df.columns:
+        sessoes["Sexo"] = df["Sexo"].to_numpy()
+
+    validas = sessoes["Data"].notna() & (sessoes["Tempo_Seg"] > 0) & (sessoes["Nome"] != "") & (sessoes["Nome"] != "nan")
+    sessoes = sessoes[validas]
+    sessoes = sessoes.assign(Ritmo_Seg_Km=sessoes["Tempo_Seg"] / sessoes["Distância"].map(DISTANCIAS_KM))
+    sessoes = sessoes.sort_values(["Nome", "Distância", "Data"], kind="stable").reset_index(drop=True)
+    return sessoes, int((~validas).sum())
+
+
+def tendencias_corredores(sessoes):
+    """
+    Uma linha por (Nome, Distância): sessões, período, primeiro/último/melhor tempo,
+    evolução entre a primeira e a última sessão e a tendência (mínimos quadrados) por JANELA_DIAS.
+    Valores positivos = o corredor está ficando mais rápido.
+    """
+    dias = (sessoes["Data"] - sessoes["Data"].min()).dt.days.astype(float)
+    tempo = sessoes["Tempo_Seg"]
+    grupos = sessoes.assign(x=dias, xy=dias * tempo, xx=dias * dias).groupby(["Nome", "Distância"], sort=True)
+
+    # 'sessoes' já vem ordenado por data dentro de cada corredor: first/last = primeira/última sessão
+    tend = grupos.agg(
+        Sessoes=("Tempo_Seg", "size"),
+        Inicio=("Data", "min"),
+        Fim=("Data", "max"),
+        Primeiro_Tempo=("Tempo_Seg", "first"),
+        Ultimo_Tempo=("Tempo_Seg", "last"),
+        Melhor_Tempo=("Tempo_Seg", "min"),
+        Tempo_Medio=("Tempo_Seg", "mean"),
+        sx=("x", "sum"), sy=("Tempo_Seg", "sum"), sxy=("xy", "sum"), sxx=("xx", "sum"),
+    )
+
+    # Inclinação da regressão linear de cada grupo, direto das somas (segundos por dia)
+    n = tend["Sessoes"].to_numpy(dtype=float)
+    denominador = n * tend["sxx"].to_numpy() - tend["sx"].to_numpy() ** 2
+    numerador = n * tend["sxy"].to_numpy() - tend["sx"].to_numpy() * tend["sy"].to_numpy()
+    valida = (n >= MIN_SESSOES_TENDENCIA) & (denominador > 0)
+    inclinacao = np.divide(numerador, denominador, out=np.full(len(tend), np.nan), where=valida)
+
+    tend["Tendencia_Pct"] = -inclinacao * JANELA_DIAS / tend["Tempo_Medio"].to_numpy() * 100
+    tend["Evolucao_Pct"] = (tend["Primeiro_Tempo"] - tend["Ultimo_Tempo"]) / tend["Primeiro_Tempo"] * 100
+    return tend.drop(columns=["sx", "sy", "sxy", "sxx"]).reset_index()
+
+
+def resumo_distancias(tendencias):
+    """Uma linha por distância: corredores, sessões, % que melhorou e tendência mediana da equipe."""
+    com_tendencia = tendencias["Tendencia_Pct"].notna()
+    resumo = tendencias.assign(
+        Melhorou=(tendencias["Tendencia_Pct"] > 0).where(com_tendencia),
+    ).groupby("Distância", sort=False).agg(
+        Corredores=("Nome", "size"),
+        Sessoes=("Sessoes", "sum"),
+        Melhorou_Pct=("Melhorou", "mean"),
+        Tendencia_Mediana=("Tendencia_Pct", "median"),
+        Evolucao_Mediana=("Evolucao_Pct", "median"),
+        Melhor_Tempo=("Melhor_Tempo", "min"),
+    )
+    resumo["Melhorou_Pct"] = resumo["Melhorou_Pct"] * 100
+    return _ordenar_distancias(resumo.reset_index())
+
+
+def serie_mensal(sessoes):
+    """
+    Evolução mensal da equipe por distância: mediana e faixa p25-p75 do MELHOR tempo
+    de cada corredor no mês (quem corre muito não pesa mais que quem corre pouco).
+    """
+    mes = sessoes["Data"].dt.to_period("M").dt.to_timestamp()
+    melhores = (
+        sessoes.assign(Mes=mes)
+        .groupby(["Distância", "Mes", "Nome"], sort=False)["Tempo_Seg"].min()
+    )
+    por_mes = melhores.groupby(level=["Distância", "Mes"])
+    mensal = por_mes.quantile([0.25, 0.5, 0.75]).unstack()
+    mensal.columns = ["p25", "Mediana", "p75"]
+    mensal["Corredores"] = por_mes.size()
+    return _ordenar_distancias(mensal.reset_index().sort_values(["Distância", "Mes"]))
+
+
+def matriz_mensal(sessoes, distancia):
+    """Corredores x meses (pivot) com o melhor tempo de cada um em cada mês, para uma distância."""
+    dados = sessoes[sessoes["Distância"] == distancia]
+    return dados.assign(Mes=dados["Data"].dt.to_period("M").astype(str)).pivot_table(
+        index="Nome", columns="Mes", values="Tempo_Seg", aggfunc="min"
+    )
+
+
+def _ordenar_distancias(df):
+    """Distâncias conhecidas na ordem natural (100m ... 42km), as demais no fim."""
+    ordem = {d: i for i, d in enumerate(DISTANCIAS_KM)}
+    chave = df["Distância"].map(ordem).fillna(len(ordem))
+    return df.assign(_ordem=chave).sort_values("_ordem", kind="stable").drop(columns="_ordem").reset_index(drop=True)
+
+
+def analisar_temporada(df):
+    """Pipeline completo: sessões normalizadas, tendências por corredor, resumo e série mensal."""
+    sessoes, descartadas = preparar_sessoes(df)
+    if sessoes.empty:
+        return None
+    tendencias = tendencias_corredores(sessoes)
+    return {
+        "sessoes": sessoes,
+        "descartadas": descartadas,
+        "tendencias": tendencias,
+        "resumo": resumo_distancias(tendencias),
+        "mensal": serie_mensal(sessoes),
+    }
+
+
+def formatar_tempo(segundos):
+    """1234.5 -> '20:34' (ou '1:05:10' acima de uma hora)."""
+    if segundos is None or np.isnan(segundos):
+        return "-"
+    total = int(round(segundos))
+    horas, resto = divmod(total, 3600)
+    minutos, seg = divmod(resto, 60)
+    return f"{horas}:{minutos:02d}:{seg:02d}" if horas else f"{minutos}:{seg:02d}"
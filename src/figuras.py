@@ -0,0 +1,68 @@
+import io
+import os
+import sys
+import weakref
+
+# Figuras criadas por nova_figura e ainda não liberadas. As do app não passam pelo pyplot,
+# então plt.get_fignums() não as vê: uma figura presa (ex: guardada no session_state) só aparece aqui.
+_figuras_vivas = weakref.WeakSet()
+
+
+def _pyplot():
+    """O pyplot só existe se alguém já o importou (as figuras do app não passam por ele)."""
+    return sys.modules.get("matplotlib.pyplot")
+
+
+def registrar_figura(fig):
+    _figuras_vivas.add(fig)
+    return fig
+
+
+def liberar_figura(fig):
+    """Tira a figura da contagem de vivas (e do pyplot, se ela tiver passado por ele)."""
+    _figuras_vivas.discard(fig)
+    plt = _pyplot()
+    if plt is not None:
+        plt.close(fig)
+
+
+def png_da_figura(fig, dpi=200, **kwargs):
+    """Renderiza a figura em PNG (padrões do st.pyplot) e a fecha em seguida, mesmo com erro."""
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches=kwargs.pop("bbox_inches", "tight"), **kwargs)
+        return buffer.getvalue()
+    finally:
+        liberar_figura(fig)
+
+
+def renderizar(fabrica, dpi=200, tamanho=None, **kwargs):
+    """
+    Único caminho para transformar gráfico em imagem: fabrica() cria a figura,
+    que vira bytes PNG e é liberada na hora. Nada de figura viva no session_state.
+    """
+    fig = fabrica()
+    if tamanho:
+        fig.set_size_inches(*tamanho)
+    return png_da_figura(fig, dpi=dpi, **kwargs)
+
+
+def _rss_mb():
+    """Memória residente do processo (MB). Sem /proc, cai para o pico (ru_maxrss)."""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        except (ImportError, OSError):
+            return None
+
+
+def memoria_graficos():
+    """Medidor para produção: figuras criadas e não liberadas (próprias e do pyplot) e memória do processo."""
+    plt = _pyplot()
+    abertas = len(_figuras_vivas) + (len(plt.get_fignums()) if plt else 0)
+    return {"figuras_abertas": abertas, "rss_mb": _rss_mb()}
@@ -0,0 +1,258 @@
+"""
+Versões Vega-Lite (Altair) dos gráficos do BioMSInterpreter para o dashboard.
+O servidor só monta um JSON pequeno com os dados; quem desenha é o navegador.
+Os PDFs continuam usando o matplotlib / desenho vetorial do FPDF.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import altair as alt
+
+from src.interpretation import RANKING_MAX_BARRAS, RANKING_EXTREMOS
+
+COR_TEXTO = '#2c3e50'
+COR_EIXO = '#64748b'
+COR_REFERENCIA = '#94a3b8'
+COR_REFERENCIA_SUAVE = '#cbd5e1'
+
+
+def _finalizar(grafico):
+    """Acabamento comum: sem moldura, sem grade e com as cores de texto do app."""
+    return (
+        grafico.configure_view(strokeWidth=0)
+        .configure_axis(grid=False, labelColor=COR_EIXO, titleColor=COR_EIXO, domainColor=COR_REFERENCIA_SUAVE, tickColor=COR_REFERENCIA_SUAVE)
+        .configure_title(color=COR_TEXTO, anchor='start', fontSize=16, fontWeight='normal')
+    )
+
+
+def _eixo_rotulado(chaves, rotulos, **axis):
+    """
+    Eixo categórico cuja chave é única (posição/ordem) e o texto vem de 'rotulos':
+    iniciais ou datas repetidas não se fundem numa só banda.
+    """
+    mapa = json.dumps({str(c): str(r) for c, r in zip(chaves, rotulos)}, ensure_ascii=False)
+    return alt.Axis(labelExpr=f"{mapa}[datum.value]", **axis)
+
+
+def _linhas_referencia(valores_y=(0, 1, -1)):
+    ref = pd.DataFrame({'y': list(valores_y), 'principal': [v == 0 for v in valores_y]})
+    return alt.Chart(ref).mark_rule(strokeWidth=1).encode(
+        y='y:Q',
+        color=alt.condition('datum.principal', alt.value(COR_REFERENCIA), alt.value(COR_REFERENCIA_SUAVE)),
+        strokeDash=alt.condition('datum.principal', alt.value([1, 0]), alt.value([4, 4])),
+    )
+
+
+def _dados_ranking(df_grupo, metrica_z):
+    col_label = 'Label' if 'Label' in df_grupo.columns else 'ID'
+    df_plot = df_grupo.dropna(subset=[metrica_z]).sort_values(by=metrica_z, ascending=False)
+    dados = pd.DataFrame({
+        'atleta': df_plot[col_label].fillna("Sem ID").astype(str).to_numpy(),
+        'z': df_plot[metrica_z].astype(float).round(3).to_numpy(),
+    })
+    # Nome completo só no tooltip (o eixo usa as iniciais)
+    if 'ID' in df_plot.columns and col_label != 'ID':
+        dados['nome'] = df_plot['ID'].fillna("Sem ID").astype(str).to_numpy()
+    dados['posicao'] = np.arange(1, len(dados) + 1)
+    dados['sinal'] = np.where(dados['z'] >= 0, 'acima', 'abaixo')
+    return dados
+
+
+def _barras(dados, eixo_x, cor_positiva, cor_negativa, dominio_y, largura_barra=0.65):
+    tooltip = [alt.Tooltip('posicao:Q', title='Posição'), alt.Tooltip('atleta:N', title='Atleta')]
+    if 'nome' in dados.columns:
+        tooltip.append(alt.Tooltip('nome:N', title='Nome'))
+    tooltip.append(alt.Tooltip('z:Q', title='Z-Score', format='.2f'))
+
+    base = alt.Chart(dados).encode(x=eixo_x)
+    barras = base.mark_bar(width={'band': largura_barra}).encode(
+        y=alt.Y('z:Q', title='Z-Score', scale=alt.Scale(domain=dominio_y)),
+        color=alt.Color('sinal:N', scale=alt.Scale(domain=['acima', 'abaixo'], range=[cor_positiva, cor_negativa]), legend=None),
+        tooltip=tooltip,
+    )
+    # Valor em cima (positivos) ou embaixo (negativos) de cada barra
+    texto_pos = base.transform_filter('datum.z >= 0').mark_text(dy=-8, fontSize=11, color=COR_TEXTO).encode(y='z:Q', text=alt.Text('z:Q', format='.2f'))
+    texto_neg = base.transform_filter('datum.z < 0').mark_text(dy=10, fontSize=11, color=COR_TEXTO).encode(y='z:Q', text=alt.Text('z:Q', format='.2f'))
+    return barras + texto_pos + texto_neg
+
+
+def _dominio_y(valores):
+    return [min(float(np.min(valores)), -1.5) - 0.5, max(float(np.max(valores)), 1.5) + 0.5]
+
+
+def ranking_vega(df_grupo, metrica_z, titulo, cor_positiva="#69FF89", cor_negativa="#bc88ff"):
+    """Equivalente do plot_ranking_batch (inclusive o resumo para grupos grandes)."""
+    dados = _dados_ranking(df_grupo, metrica_z)
+    if dados.empty:
+        return _finalizar(alt.Chart(dados).mark_bar().properties(title=titulo))
+    if len(dados) > RANKING_MAX_BARRAS:
+        return ranking_resumo_vega(dados, titulo, cor_positiva, cor_negativa)
+
+    eixo = _eixo_rotulado(dados['posicao'], dados['atleta'], labelAngle=-45, labelFontSize=12)
+    eixo_x = alt.X('posicao:O', sort='ascending', title=None, axis=eixo)
+    grafico = alt.layer(
+        _linhas_referencia(),
+        _barras(dados, eixo_x, cor_positiva, cor_negativa, _dominio_y(dados['z'])),
+    ).properties(title=titulo, height=380, width='container')
+    return _finalizar(grafico)
+
+
+def ranking_resumo_vega(dados, titulo, cor_positiva, cor_negativa, n_extremos=RANKING_EXTREMOS):
+    """Distribuição de todos os atletas + barras dos N melhores e N piores (como o plot_ranking_resumo)."""
+    n = len(dados)
+    k = min(n_extremos, n // 2)
+    dados = dados.copy()
+    dados['jitter'] = np.random.default_rng(0).uniform(-0.35, 0.35, n).round(3)
+    dados['destaque'] = (dados['posicao'] <= k) | (dados['posicao'] > n - k)
+
+    cores = alt.Scale(domain=['acima', 'abaixo'], range=[cor_positiva, cor_negativa])
+    tooltip = [alt.Tooltip('posicao:Q', title='Posição'), alt.Tooltip('atleta:N', title='Atleta'), alt.Tooltip('z:Q', title='Z-Score', format='.2f')]
+    mediana = float(dados['z'].median())
+
+    pontos = alt.Chart(dados).mark_circle(size=40, opacity=0.6).encode(
+        x=alt.X('z:Q', title='Z-Score'),
+        y=alt.Y('jitter:Q', axis=None, scale=alt.Scale(domain=[-0.6, 0.6])),
+        color=alt.Color('sinal:N', scale=cores, legend=None),
+        tooltip=tooltip,
+    )
+    aneis = alt.Chart(dados).transform_filter('datum.destaque').mark_point(size=90, color=COR_TEXTO, strokeWidth=1).encode(
+        x='z:Q', y='jitter:Q', tooltip=tooltip,
+    )
+    ref = pd.DataFrame({'x': [0, 1, -1, mediana], 'tipo': ['zero', 'sd', 'sd', 'mediana']})
+    linhas = alt.Chart(ref).mark_rule().encode(
+        x='x:Q',
+        color=alt.Color('tipo:N', scale=alt.Scale(domain=['zero', 'sd', 'mediana'], range=[COR_REFERENCIA, COR_REFERENCIA_SUAVE, COR_TEXTO]), legend=None),
+        strokeDash=alt.condition("datum.tipo == 'zero'", alt.value([1, 0]), alt.value([4, 4])),
+    )
+    distribuicao = alt.layer(linhas, pontos, aneis).properties(
+        title=f"Distribuição (N={n}) · mediana {mediana:.2f} · {(dados['z'] >= 0).mean():.0%} acima da média",
+        width=380, height=320,
+    )
+
+    extremos = dados[dados['destaque']].copy()
+    rotulos = extremos['posicao'].astype(str) + 'º ' + extremos['atleta']
+    eixo_x = alt.X('posicao:O', sort='ascending', title=None, axis=_eixo_rotulado(extremos['posicao'], rotulos, labelAngle=-45))
+    barras = alt.layer(
+        _linhas_referencia(),
+        _barras(extremos, eixo_x, cor_positiva, cor_negativa, _dominio_y(dados['z'])),
+    ).properties(title=f"{k} melhores e {k} piores", width=520, height=320)
+
+    return _finalizar(alt.hconcat(distribuicao, barras).properties(title=titulo))
+
+
+def longitudinal_vega(df_coletas, media_grupo, nome_exercicio, cor_aluno="#8b5cf6"):
+    """Equivalente do plot_longitudinal_evolution: média da idade + uma barra por coleta."""
+    dados = pd.DataFrame({
+        'rotulo': ['Média da Idade'] + df_coletas['Data'].astype(str).tolist(),
+        'valor': [float(media_grupo)] + df_coletas['Valor_Final'].astype(float).round(2).tolist(),
+        'tipo': ['media'] + ['aluno'] * len(df_coletas),
+    })
+    # A mesma data pode aparecer duas vezes: a ordem da tabela é o que vale no eixo
+    dados['ordem'] = np.arange(len(dados))
+
+    eixo = _eixo_rotulado(dados['ordem'], dados['rotulo'], labelAngle=0, labelFontSize=12)
+    base = alt.Chart(dados).encode(x=alt.X('ordem:O', sort='ascending', title=None, axis=eixo))
+    # Sem eixo y em nenhuma camada (um eixo nulo misturado a eixos padrão quebra o layer)
+    eixo_y = alt.Y('valor:Q', axis=None, scale=alt.Scale(domain=[0, float(dados['valor'].max()) * 1.25 or 1]))
+    barras = base.mark_bar(width={'band': 0.4}).encode(
+        y=eixo_y,
+        color=alt.Color('tipo:N', scale=alt.Scale(domain=['media', 'aluno'], range=['#cbd5e1', cor_aluno]), legend=None),
+        tooltip=[alt.Tooltip('rotulo:N', title='Coleta'), alt.Tooltip('valor:Q', title=nome_exercicio, format='.1f')],
+    )
+    texto = base.mark_text(dy=-8, fontSize=12, fontWeight='bold', color=COR_TEXTO).encode(y=eixo_y, text=alt.Text('valor:Q', format='.1f'))
+    media = alt.Chart(pd.DataFrame({'y': [float(media_grupo)]})).mark_rule(color=COR_REFERENCIA, strokeDash=[6, 4], strokeWidth=1.5).encode(y=alt.Y('y:Q', axis=None))
+
+    return _finalizar(alt.layer(media, barras, texto).properties(height=260, width='container'))
+
+
+def evolucao_equipe_vega(mensal, titulo, cor="#3498db"):
+    """Equivalente do plot_evolucao_equipe: um painel por distância (mediana mensal + faixa p25-p75)."""
+    dados = mensal.assign(
+        mes=mensal['Mes'].dt.strftime('%Y-%m-%d'),
+        p25=(mensal['p25'] / 60).round(2), mediana=(mensal['Mediana'] / 60).round(2), p75=(mensal['p75'] / 60).round(2),
+    )[['Distância', 'mes', 'p25', 'mediana', 'p75', 'Corredores']]
+    ordem = list(dict.fromkeys(dados['Distância']))
+
+    base = alt.Chart(dados).encode(x=alt.X('mes:T', title=None, axis=alt.Axis(format='%m/%y', labelAngle=0)))
+    faixa = base.mark_area(opacity=0.18, color=cor).encode(
+        y=alt.Y('p25:Q', title='Tempo (min) · menor é melhor', scale=alt.Scale(zero=False)), y2='p75:Q'
+    )
+    linha = base.mark_line(point=True, color=cor, strokeWidth=2.2).encode(
+        y='mediana:Q',
+        tooltip=[
+            alt.Tooltip('mes:T', title='Mês', format='%m/%Y'),
+            alt.Tooltip('mediana:Q', title='Mediana (min)', format='.2f'),
+            alt.Tooltip('p25:Q', title='p25 (min)', format='.2f'),
+            alt.Tooltip('p75:Q', title='p75 (min)', format='.2f'),
+            alt.Tooltip('Corredores:Q', title='Corredores'),
+        ],
+    )
+    grafico = alt.layer(faixa, linha).properties(width=220, height=200).facet(
+        facet=alt.Facet('Distância:N', sort=ordem, title=None), columns=3
+    ).resolve_scale(y='independent').properties(title=titulo)
+    return _finalizar(grafico)
+
+
+# --- RADAR (Vega-Lite não tem eixo polar: os polígonos vão como GeoJSON em projeção identidade) ---
+RADAR_EIXOS = [('(Estrutura)', 'Z_BioMS_1'), ('(Potência)', 'Z_BioMS_5'), ('(Velocidade)', 'Z_BioMS_9'), ('(Integridade)', 'Z_BioMS_8')]
+RADAR_Z_MIN, RADAR_Z_MAX = -2.5, 2.5
+
+
+def _raio(z):
+    return (np.clip(z, RADAR_Z_MIN, RADAR_Z_MAX) - RADAR_Z_MIN) / (RADAR_Z_MAX - RADAR_Z_MIN)
+
+
+def _poligono(raios, angulos):
+    pontos = [[round(float(r * np.cos(a)), 4), round(float(r * np.sin(a)), 4)] for r, a in zip(raios, angulos)]
+    return {'type': 'Polygon', 'coordinates': [pontos + pontos[:1]]}
+
+
+def radar_vega(resultados):
+    """Equivalente do plot_radar_chart: fundo, anéis -1.5/0/+1.5, média global e atleta."""
+    angulos = np.linspace(0, 2 * np.pi, len(RADAR_EIXOS), endpoint=False)
+    circulo = np.linspace(0, 2 * np.pi, 73)[:-1]
+    valores = [float(resultados.get(k, 0) or 0) for _, k in RADAR_EIXOS]
+    valores = [0.0 if np.isnan(v) else v for v in valores]
+
+    def feicao(geometria, camada):
+        return {'type': 'Feature', 'geometry': geometria, 'properties': {'camada': camada}}
+
+    feicoes = [feicao(_poligono([1.0] * len(circulo), circulo), 'fundo')]
+    feicoes += [feicao(_poligono([_raio(z)] * len(circulo), circulo), 'anel') for z in (-1.5, 1.5)]
+    feicoes.append(feicao(_poligono([_raio(0)] * len(angulos), angulos), 'media'))
+    feicoes.append(feicao(_poligono([_raio(v) for v in valores], angulos), 'atleta'))
+
+    projecao = dict(type='identity', reflectY=True)
+    estilos = {
+        'fundo': dict(fill='#eeeeee', stroke='#bcbcbc', strokeWidth=1),
+        'anel': dict(fill=None, filled=False, stroke='#ffffff', strokeWidth=1),
+        'media': dict(fill='#e2e8f0', fillOpacity=0.5, stroke='#94a3b8', strokeDash=[5, 4], strokeWidth=1.2),
+        'atleta': dict(fill='#3498db', fillOpacity=0.2, stroke='#2980b9', strokeWidth=2.5),
+    }
+    camadas = [
+        alt.Chart(alt.Data(values=[f for f in feicoes if f['properties']['camada'] == nome]))
+        .mark_geoshape(**estilo).project(**projecao)
+        for nome, estilo in estilos.items()
+    ]
+
+    # Eixos (raios) e rótulos
+    raios = pd.DataFrame({
+        'lon': [0.0] * len(angulos), 'lat': [0.0] * len(angulos),
+        'lon2': np.cos(angulos).round(4), 'lat2': np.sin(angulos).round(4),
+    })
+    camadas.insert(3, alt.Chart(raios).mark_rule(color='#ffffff', strokeWidth=1).encode(
+        longitude='lon:Q', latitude='lat:Q', longitude2='lon2:Q', latitude2='lat2:Q'
+    ).project(**projecao))
+
+    rotulos = pd.DataFrame({
+        'lon': (1.14 * np.cos(angulos)).round(4), 'lat': (1.1 * np.sin(angulos)).round(4),
+        'texto': [r for r, _ in RADAR_EIXOS],
+        'z': [round(v, 2) for v in valores],
+    })
+    camadas.append(alt.Chart(rotulos).mark_text(fontSize=12, color='#4a5568').encode(
+        longitude='lon:Q', latitude='lat:Q', text='texto:N',
+        tooltip=[alt.Tooltip('texto:N', title='Eixo'), alt.Tooltip('z:Q', title='Z-Score', format='.2f')],
+    ).project(**projecao))
+
+    return alt.layer(*camadas).properties(width=360, height=360).configure_view(strokeWidth=0)
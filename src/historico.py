@@ -0,0 +1,258 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import date
+
+import pandas as pd
+
+from src.statistics import METRICAS
+
+# Opcional: só liga quando o treinador aponta um arquivo (o BioMS hospedado não guarda dados de atletas)
+HISTORICO_PATH = os.environ.get("BIOMS_HISTORICO_DB", "")
+
+# Tipos de coleta guardados
+TIPO_BIOMS = "bioms"
+TIPO_FORCA = "forca"
+TIPO_CORRIDA = "corrida"
+
+TAMANHO_PAGINA = 1000
+
+_MESES = {
+    "jan": 1, "fev": 2, "mar": 3, "abr": 4, "mai": 5, "jun": 6,
+    "jul": 7, "ago": 8, "set": 9, "out": 10, "nov": 11, "dez": 12,
+}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS atletas (
+    id INTEGER PRIMARY KEY,
+    clube TEXT NOT NULL DEFAULT '',
+    nome TEXT NOT NULL,
+    sexo TEXT,
+    idade INTEGER,
+    UNIQUE (clube, nome)
+);
+CREATE TABLE IF NOT EXISTS coletas (
+    id INTEGER PRIMARY KEY,
+    atleta_id INTEGER NOT NULL REFERENCES atletas(id),
+    tipo TEXT NOT NULL,
+    metrica TEXT NOT NULL,
+    data TEXT NOT NULL,
+    data_ordem TEXT NOT NULL,
+    valor REAL,
+    dados TEXT,
+    UNIQUE (atleta_id, tipo, metrica, data)
+);
+CREATE INDEX IF NOT EXISTS idx_coletas_atleta ON coletas (atleta_id, tipo, metrica, data_ordem);
+CREATE INDEX IF NOT EXISTS idx_coletas_temporada ON coletas (tipo, metrica, data_ordem, id);
+"""
+
+
+def data_ordenavel(texto, padrao=None):
+    """
+    Converte a data digitada no editor ("01/01/2026", "2026-01-01", "Jan/26") em AAAA-MM-DD,
+    para ordenar e filtrar por período. Sem formato reconhecido, usa 'padrao' (None = hoje).
+    """
+    texto = str(texto).strip()
+    m = re.fullmatch(r"(\d{1,2})/(\d{1,2})/(\d{2,4})", texto)
+    if m:
+        dia, mes, ano = (int(g) for g in m.groups())
+        ano += 2000 if ano < 100 else 0
+        return f"{ano:04d}-{mes:02d}-{dia:02d}"
+    m = re.fullmatch(r"(\d{4})-(\d{2})-(\d{2})", texto)
+    if m:
+        return texto
+    m = re.fullmatch(r"([A-Za-zç]{3})[a-zç]*[/ -](\d{2,4})", texto)
+    if m and m.group(1).lower() in _MESES:
+        ano = int(m.group(2))
+        ano += 2000 if ano < 100 else 0
+        return f"{ano:04d}-{_MESES[m.group(1).lower()]:02d}-01"
+    return date.today().isoformat() if padrao is None else padrao
+
+
+class HistoricoAtletas:
+    """
+    Histórico longitudinal local (SQLite) de atletas, resultados BioMS e coletas de força/corrida.
+    - Uma linha por coleta, indexada por atleta, métrica e data: a série de um gráfico
+      longitudinal sai de uma única consulta pelo índice;
+    - Gravar a mesma coleta (atleta, tipo, métrica, data) de novo atualiza em vez de duplicar;
+    - Temporadas inteiras de um clube são lidas em páginas, sem carregar tudo na memória.
+    """
+
+    def __init__(self, caminho):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        # Uma conexão por processo, protegida por lock (as sessões do Streamlit são threads)
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.executescript(_ESQUEMA)
+
+    def _atleta_id(self, nome, clube, sexo, idade):
+        """Cria o atleta (ou atualiza sexo/idade) e devolve o id. Chamar com o lock."""
+        self._conexao.execute(
+            "INSERT INTO atletas (clube, nome, sexo, idade) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (clube, nome) DO UPDATE SET "
+            "sexo = COALESCE(excluded.sexo, sexo), idade = COALESCE(excluded.idade, idade)",
+            (clube, nome, sexo, idade),
+        )
+        return self._conexao.execute(
+            "SELECT id FROM atletas WHERE clube = ? AND nome = ?", (clube, nome)
+        ).fetchone()[0]
+
+    def registrar(self, nome, tipo, coletas, clube="", sexo=None, idade=None):
+        """
+        Grava as coletas de um atleta. Cada coleta é um dict com 'metrica', 'data' e 'valor';
+        as demais chaves (Carga, Repetições, Minutos...) vão junto para reabrir o editor depois.
+        """
+        linhas = []
+        for coleta in coletas:
+            extras = {k: v for k, v in coleta.items() if k not in ("metrica", "data", "valor")}
+            valor = coleta.get("valor")
+            linhas.append((
+                str(coleta["metrica"]), str(coleta["data"]), data_ordenavel(coleta["data"]),
+                None if valor is None or pd.isna(valor) else float(valor),
+                json.dumps(extras, default=str),
+            ))
+        if not linhas:
+            return 0
+
+        with self._lock, self._conexao:
+            atleta_id = self._atleta_id(nome, clube, sexo, None if idade is None else int(idade))
+            self._conexao.executemany(
+                "INSERT INTO coletas (atleta_id, tipo, metrica, data, data_ordem, valor, dados) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (atleta_id, tipo, metrica, data) DO UPDATE SET "
+                "data_ordem = excluded.data_ordem, valor = excluded.valor, dados = excluded.dados",
+                [(atleta_id, tipo, *linha) for linha in linhas],
+            )
+        return len(linhas)
+
+    def remover(self, nome, tipo, metrica, data, clube=""):
+        """Apaga uma coleta (atleta, tipo, métrica, data). Devolve quantas linhas saíram."""
+        with self._lock, self._conexao:
+            cursor = self._conexao.execute(
+                "DELETE FROM coletas WHERE tipo = ? AND metrica = ? AND data = ? "
+                "AND atleta_id = (SELECT id FROM atletas WHERE clube = ? AND nome = ?)",
+                (tipo, str(metrica), str(data), clube, nome),
+            )
+        return cursor.rowcount
+
+    def reconciliar(self, nome, tipo, mantidas, clube=""):
+        """
+        O editor é a fonte da verdade: apaga as coletas gravadas do atleta cujo (métrica, data)
+        não está em 'mantidas' (linhas que o treinador removeu ou corrigiu). Devolve quantas saíram.
+        """
+        mantidas = {(str(m), str(d)) for m, d in mantidas}
+        salvas = self.historico(nome, tipo, clube=clube)
+        return sum(
+            self.remover(nome, tipo, metrica, data, clube)
+            for metrica, data in zip(salvas["Metrica"], salvas["Data"])
+            if (metrica, data) not in mantidas
+        )
+
+    def historico(self, nome, tipo, metrica=None, clube=""):
+        """
+        Série do atleta em ordem cronológica (uma consulta pelo índice atleta/tipo/métrica/data).
+        Colunas: Metrica, Data, Valor_Final e as colunas originais da coleta.
+        """
+        sql = (
+            "SELECT c.metrica, c.data, c.valor, c.dados FROM coletas c "
+            "JOIN atletas a ON a.id = c.atleta_id "
+            "WHERE a.clube = ? AND a.nome = ? AND c.tipo = ?"
+        )
+        parametros = [clube, nome, tipo]
+        if metrica is not None:
+            sql += " AND c.metrica = ?"
+            parametros.append(metrica)
+        sql += " ORDER BY c.metrica, c.data_ordem, c.id"
+
+        with self._lock:
+            linhas = self._conexao.execute(sql, parametros).fetchall()
+        return _para_dataframe(linhas, ["Metrica", "Data", "Valor_Final"])
+
+    def paginar_clube(self, clube, tipo, metrica=None, desde=None, ate=None, tamanho_pagina=TAMANHO_PAGINA):
+        """
+        Percorre as coletas de um clube em ordem cronológica, 'tamanho_pagina' linhas por vez
+        (paginação por chave: cada página continua de onde a anterior parou, sem OFFSET).
+        Gera DataFrames com Atleta, Sexo, Idade, Metrica, Data, Data_Ordem, Valor_Final e as colunas originais.
+        """
+        filtros = ["a.clube = ?", "c.tipo = ?"]
+        parametros = [clube, tipo]
+        if metrica is not None:
+            filtros.append("c.metrica = ?")
+            parametros.append(metrica)
+        if desde is not None:
+            filtros.append("c.data_ordem >= ?")
+            parametros.append(data_ordenavel(desde))
+        if ate is not None:
+            filtros.append("c.data_ordem <= ?")
+            parametros.append(data_ordenavel(ate))
+
+        ultimo = ("", 0)
+        while True:
+            sql = (
+                "SELECT a.nome, a.sexo, a.idade, c.metrica, c.data, c.data_ordem, c.valor, c.dados, c.id "
+                "FROM coletas c JOIN atletas a ON a.id = c.atleta_id "
+                f"WHERE {' AND '.join(filtros)} AND (c.data_ordem, c.id) > (?, ?) "
+                "ORDER BY c.data_ordem, c.id LIMIT ?"
+            )
+            with self._lock:
+                linhas = self._conexao.execute(sql, [*parametros, *ultimo, tamanho_pagina]).fetchall()
+            if not linhas:
+                return
+            ultimo = (linhas[-1][5], linhas[-1][8])
+            yield _para_dataframe(
+                [linha[:8] for linha in linhas],
+                ["Atleta", "Sexo", "Idade", "Metrica", "Data", "Data_Ordem", "Valor_Final"],
+            )
+            if len(linhas) < tamanho_pagina:
+                return
+
+    def registrar_bioms(self, nome, resultado, clube="", sexo=None, idade=None, data=None):
+        """
+        Grava um resultado BioMS (uma coleta por índice, com Z e percentil junto) na data informada ou hoje.
+        Índices sem valor ficam de fora: não sobrescrevem com NULL o que já foi gravado nesta data.
+        """
+        data = data or date.today().strftime("%d/%m/%Y")
+        def numero(chave):
+            valor = resultado.get(chave)
+            return None if valor is None or pd.isna(valor) else float(valor)
+
+        coletas = [
+            {"metrica": m, "data": data, "valor": numero(m), "Z": numero(f"Z_{m}"), "P": numero(f"P_{m}")}
+            for m in METRICAS if numero(m) is not None
+        ]
+        return self.registrar(nome, TIPO_BIOMS, coletas, clube=clube, sexo=sexo, idade=idade)
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+
+def _para_dataframe(linhas, colunas):
+    """Linhas (..., valor, dados_json) -> DataFrame com o JSON de cada coleta aberto em colunas."""
+    if not linhas:
+        return pd.DataFrame(columns=colunas)
+    base = pd.DataFrame([linha[:-1] for linha in linhas], columns=colunas)
+    extras = pd.DataFrame([json.loads(linha[-1] or "{}") for linha in linhas], index=base.index)
+    return pd.concat([base, extras.drop(columns=[c for c in extras.columns if c in base.columns])], axis=1)
+
+
+_historico = None
+_historico_lock = threading.Lock()
+
+
+def obter_historico():
+    """O histórico do processo, ou None quando BIOMS_HISTORICO_DB não está configurado."""
+    global _historico
+    if not HISTORICO_PATH:
+        return None
+    if _historico is None:
+        with _historico_lock:
+            if _historico is None:
+                _historico = HistoricoAtletas(HISTORICO_PATH)
+    return _historico
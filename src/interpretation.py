@@ -1,6 +1,91 @@
-import matplotlib.pyplot as plt
+import io
 import numpy as np
 import pandas as pd
+from PIL import Image, ImageDraw
+
+from src.cache import CacheLRU
+from src.figuras import registrar_figura, liberar_figura
+
+# Gauge da tela: resolução do st.pyplot e tamanho de cada faixa de Z
+# (0.02 de Z desloca o marcador ~1 px na largura em que o card aparece)
+GAUGE_DPI = 200
+GAUGE_PASSO_Z = 0.02
+
+# Fundo do gauge por título (nunca muda) e gauges já compostos por (título, faixa de Z)
+_sprites_gauge = {}
+_cache_gauges = CacheLRU(maxsize=512)
+
+# Visual 'bmh' aplicado figura a figura (plt.style.use mexe no rcParams global,
+# o que vaza entre sessões do Streamlit e threads que desenham ao mesmo tempo)
+ESTILO_BMH = {
+    'fundo_eixo': '#eeeeee', 'borda_eixo': '#bcbcbc',
+    'grade': dict(color='#b2b2b2', linestyle='--', linewidth=0.5),
+}
+
+# Rankings grandes: acima de RANKING_MAX_BARRAS o gráfico vira um resumo de tamanho fixo
+# (distribuição do grupo + os N melhores e N piores), e o dashboard pagina de RANKING_MAX_BARRAS em RANKING_MAX_BARRAS
+RANKING_MAX_BARRAS = 40
+RANKING_EXTREMOS = 10
+
+def _estilizar_eixo(ax):
+    ax.set_facecolor(ESTILO_BMH['fundo_eixo'])
+    for spine in ax.spines.values():
+        spine.set_edgecolor(ESTILO_BMH['borda_eixo'])
+    ax.grid(True, **ESTILO_BMH['grade'])
+    ax.tick_params(direction='in')
+
+def nova_figura(figsize, polar=False, colunas=1, proporcoes=None):
+    """
+    Figura independente do pyplot (Figure + canvas Agg próprio): não entra no registro
+    global, pode ser desenhada em qualquer thread e é liberada pelo coletor de lixo.
+    Até passar por png_da_figura ela conta como aberta no memoria_graficos.
+    Com colunas > 1 devolve a lista de eixos lado a lado.
+    O matplotlib só é importado aqui, no primeiro gráfico (o app abre sem ele).
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = registrar_figura(Figure(figsize=figsize))
+    FigureCanvasAgg(fig)
+    if colunas == 1:
+        ax = fig.add_subplot(projection='polar' if polar else None)
+        _estilizar_eixo(ax)
+        return fig, ax
+
+    eixos = list(fig.subplots(1, colunas, gridspec_kw={'width_ratios': proporcoes} if proporcoes else None))
+    for ax in eixos:
+        _estilizar_eixo(ax)
+    return fig, eixos
+
+def _limpar_eixo_ranking(ax):
+    """Visual 'clean' dos rankings: fundo branco, só o eixo de baixo e sem grade."""
+    ax.set_facecolor('#ffffff')
+    ax.spines['bottom'].set_color('#cbd5e1')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_visible(False)
+    ax.grid(False)
+
+def _inserir_logo(ax, logo):
+    """Logo customizada no canto superior direito do eixo (bytes do upload ou caminho)."""
+    from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+    try:
+        img = Image.open(io.BytesIO(logo) if isinstance(logo, (bytes, bytearray)) else logo)
+        imagebox = OffsetImage(np.array(img), zoom=0.12) # Zoom para não ficar gigante
+        ab = AnnotationBbox(imagebox, (0.98, 0.95), xycoords='axes fraction', frameon=False, box_alignment=(1,1))
+        ax.add_artist(ab)
+    except Exception:
+        pass # Se a imagem falhar, apenas segue sem quebrar o gráfico
+
+def paginar_ranking(df_grupo, metrica_z, pagina, por_pagina=RANKING_MAX_BARRAS):
+    """
+    Fatia 'pagina' (começando em 0) do ranking já ordenado. Devolve (df_pagina, pagina, total_paginas),
+    com a página já limitada às que existem para esta métrica (use-a para numerar as posições).
+    """
+    df_ordenado = df_grupo.dropna(subset=[metrica_z]).sort_values(by=metrica_z, ascending=False)
+    total_paginas = max(1, -(-len(df_ordenado) // por_pagina))
+    pagina = min(max(0, pagina), total_paginas - 1)
+    return df_ordenado.iloc[pagina * por_pagina:(pagina + 1) * por_pagina], pagina, total_paginas
 
 class BioMSInterpreter:
     """
@@ -9,8 +94,6 @@ class BioMSInterpreter:
     """
     
     def __init__(self):
-        plt.style.use('bmh')
-        
         # --- KNOWLEDGE BASE: Engenharia de Performance (Perspectiva de Elite) ---
         self.knowledge_base = {
             'BioMS_1': { 
@@ -107,7 +190,7 @@ class BioMSInterpreter:
         angles += angles[:1]
 
         # Reduzimos um pouco o tamanho para não ficar gigante na tela
-        fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
+        fig, ax = nova_figura((6, 6), polar=True)
         
         # Média Global: Fundo cinza super claro e linha pontilhada sutil
         ax.fill(angles, [0]*len(angles), color="#e2e8f0", alpha=0.5, label='Média Global')
@@ -126,13 +209,14 @@ class BioMSInterpreter:
         ax.set_xticklabels(labels, fontsize=10, weight='normal', color="#4a5568")
         
         # Legenda flutuante (frameon=False remove a borda dura da caixinha)
-        plt.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=9, frameon=False)
-        #plt.title("Matriz BioMS", pad=20, fontsize=14, fontweight='bold', color='#2c3e50')
+        ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=9, frameon=False)
+        #ax.set_title("Matriz BioMS", pad=20, fontsize=14, fontweight='bold', color='#2c3e50')
         
         return fig
     
-    def plot_gauge_performance(self, valor_z, titulo):
-        fig, ax = plt.subplots(figsize=(8, 1.2))
+    def _gauge_fundo(self, titulo):
+        """Parte fixa do gauge (faixas, legendas e título), sem o marcador."""
+        fig, ax = nova_figura((8, 1.2))
         
         # UX Tip: Paleta "Médica" (tons pastéis relaxantes em vez de neon)
         cores = ['#fca5a5', '#fcd34d', '#e2e8f0', '#93c5fd', '#86efac']
@@ -142,11 +226,6 @@ class BioMSInterpreter:
         for i in range(len(cores)):
             ax.barh(0, limites[i+1]-limites[i], left=limites[i], color=cores[i], alpha=0.8, height=0.35)
         
-        val_plot = np.clip(valor_z, -2.9, 2.9)
-        # Marcador mais elegante
-        ax.axvline(val_plot, color='#2c3e50', linewidth=2, ymin=0.2, ymax=0.8)
-        ax.scatter(val_plot, 0, color='#2c3e50', s=60, zorder=5)
-        
         ax.set_xlim(-3, 3)
         ax.set_yticks([])
         ax.set_xticks([-2.25, 0, 2.25])
@@ -157,20 +236,86 @@ class BioMSInterpreter:
         for spine in ax.spines.values(): spine.set_visible(False)
         
         # UX Tip: Aumenta o espaço em branco na base para as letras "respirarem"
-        plt.subplots_adjust(bottom=0.45, top=0.85)
-        return fig
+        fig.subplots_adjust(bottom=0.45, top=0.85)
+        # Trava os limites verticais: o marcador não pode mudar a escala do fundo
+        ax.set_ylim(ax.get_ylim())
+        return fig, ax
+
+    def gauge_png(self, valor_z, titulo=""):
+        """
+        Gauge pronto em PNG, para a tela. O fundo é desenhado uma vez (sprite) e só o marcador
+        é colado por cima; o Z é arredondado em faixas e cada faixa fica em cache.
+        """
+        z = float(np.clip(0.0 if valor_z is None or np.isnan(valor_z) else valor_z, -2.9, 2.9))
+        faixa = round(z / GAUGE_PASSO_Z)
+        return _cache_gauges.obter_ou_calcular((titulo, faixa), lambda: self._compor_gauge(faixa * GAUGE_PASSO_Z, titulo))
+
+    def _sprite_gauge(self, titulo):
+        sprite = _sprites_gauge.get(titulo)
+        if sprite is None:
+            fig, ax = self._gauge_fundo(titulo)
+            try:
+                fig.set_dpi(GAUGE_DPI)
+                fig.canvas.draw()
+                fundo = np.asarray(fig.canvas.buffer_rgba()).copy()
+                altura_px = fundo.shape[0]
+
+                # Mesmo recorte do bbox_inches='tight' (pad 0.1") usado pelo st.pyplot
+                caixa = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+                x0, x1 = int(caixa.x0 * GAUGE_DPI), int(np.ceil(caixa.x1 * GAUGE_DPI))
+                y0, y1 = int(altura_px - caixa.y1 * GAUGE_DPI), int(np.ceil(altura_px - caixa.y0 * GAUGE_DPI))
+                x0, y0 = max(x0, 0), max(y0, 0)
+
+                # Posições em pixels do eixo Z e da barra, já descontado o recorte
+                (xa, ya), (xb, _) = ax.transData.transform([(-3, 0), (3, 0)])
+                topo = ax.transAxes.transform((0, 0.8))[1]
+                base = ax.transAxes.transform((0, 0.2))[1]
+                sprite = {
+                    'imagem': Image.fromarray(fundo[y0:y1, x0:x1]),
+                    'x_menos3': xa - x0, 'x_mais3': xb - x0,
+                    'y_centro': altura_px - ya - y0,
+                    'y_topo': altura_px - topo - y0, 'y_base': altura_px - base - y0,
+                }
+            finally:
+                fig.clear()
+                liberar_figura(fig)
+            _sprites_gauge[titulo] = sprite
+        return sprite
+
+    def _compor_gauge(self, z, titulo):
+        sprite = self._sprite_gauge(titulo)
+        imagem = sprite['imagem'].copy()
+        x = sprite['x_menos3'] + (z + 3) / 6 * (sprite['x_mais3'] - sprite['x_menos3'])
+
+        # Marcador desenhado 4x maior e reduzido (bordas suaves como as do matplotlib),
+        # só num recorte ao redor dele: o resto do fundo fica intocado
+        s = 4
+        raio = np.sqrt(60) / 2 * GAUGE_DPI / 72
+        meia_linha = 2 * GAUGE_DPI / 72 / 2
+        esquerda = max(int(x - raio) - 2, 0)
+        direita = min(int(np.ceil(x + raio)) + 2, imagem.width)
+        recorte = (direita - esquerda, imagem.height)
+
+        camada = Image.new('RGBA', (recorte[0] * s, recorte[1] * s), (0, 0, 0, 0))
+        desenho = ImageDraw.Draw(camada)
+        cor = (44, 62, 80, 255)  # #2c3e50
+        xl, yc = (x - esquerda) * s, sprite['y_centro'] * s
+        desenho.rectangle([xl - meia_linha * s, sprite['y_topo'] * s, xl + meia_linha * s, sprite['y_base'] * s], fill=cor)
+        desenho.ellipse([xl - raio * s, yc - raio * s, xl + raio * s, yc + raio * s], fill=cor)
+        imagem.alpha_composite(camada.resize(recorte, Image.LANCZOS), dest=(esquerda, 0))
+
+        buffer = io.BytesIO()
+        imagem.save(buffer, format='PNG', compress_level=1)
+        return buffer.getvalue()
     
     # --- NOVA FUNÇÃO ADICIONADA: RANKING DE GRUPO ---
     # No arquivo src/interpretation.py, garanta que esta função esteja assim:
 
-    def plot_ranking_batch(self, df_grupo, metrica_z, titulo, cor_positiva="#69FF89", cor_negativa="#bc88ff", logo_path=None):
+    def plot_ranking_batch(self, df_grupo, metrica_z, titulo, cor_positiva="#69FF89", cor_negativa="#bc88ff", logo=None):
         """
         Gera um gráfico de colunas verticais (Ranking) personalizável e sem linhas de grade.
+        Grupos maiores que RANKING_MAX_BARRAS viram o resumo de tamanho fixo (plot_ranking_resumo).
         """
-        import matplotlib.pyplot as plt
-        from PIL import Image
-        from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-
         # 1. Preparação e Limpeza
         col_label = 'Label' if 'Label' in df_grupo.columns else 'ID'
         df_plot = df_grupo.dropna(subset=[metrica_z]).copy()
@@ -178,35 +323,51 @@ class BioMSInterpreter:
         df_plot[col_label] = df_plot[col_label].fillna("Sem ID").astype(str)
         df_plot = df_plot.sort_values(by=metrica_z, ascending=False)
 
+        if len(df_plot) > RANKING_MAX_BARRAS:
+            return self.plot_ranking_resumo(df_plot, metrica_z, titulo, cor_positiva, cor_negativa, logo)
+
         # 2. Configuração do Canvas
         largura = max(10, len(df_plot) * 0.6)
-        fig, ax = plt.subplots(figsize=(largura, 6.5))
+        fig, ax = nova_figura((largura, 6.5))
         fig.patch.set_facecolor("#ffffff") 
-        ax.set_facecolor('#ffffff')
 
-        # 3. Barras (Usando as cores escolhidas pelo usuário)
-        x_pos = range(len(df_plot))
+        # 3-6. Barras, eixo X, linhas de referência e rótulos
         valores = df_plot[metrica_z]
-        nomes = df_plot[col_label]
+        self._desenhar_barras_ranking(ax, valores.tolist(), df_plot[col_label].tolist(), cor_positiva, cor_negativa)
+
+        # 7. Inserção da Logo Customizada no Gráfico (Canto Superior Direito)
+        if logo:
+            _inserir_logo(ax, logo)
+
+        # 8. Acabamento (SEM GRADES)
+        ax.set_title(titulo, fontsize=14, weight='normal', loc='left', color='#2c3e50', pad=20)
+        ax.set_ylabel("Z-Score", fontsize=10, color='#64748b')
+        ax.tick_params(axis='y', colors='#64748b', length=0)
+        
+        ymax = max(valores.max(), 1.5) + 0.5
+        ymin = min(valores.min(), -1.5) - 0.5
+        ax.set_ylim(ymin, ymax)
+        
+        fig.subplots_adjust(bottom=0.25, top=0.90, left=0.08, right=0.98)
+        
+        return fig
+
+    def _desenhar_barras_ranking(self, ax, valores, nomes, cor_positiva, cor_negativa, posicoes=None):
+        """Barras coloridas pelo sinal do Z, com o valor em cima de cada uma."""
+        x_pos = list(posicoes) if posicoes is not None else list(range(len(valores)))
         
         cores_dinamicas = [cor_positiva if val >= 0 else cor_negativa for val in valores]
         bars = ax.bar(x_pos, valores, color=cores_dinamicas, edgecolor='none', width=0.65, zorder=3)
 
-        # 4. Eixo X
         ax.set_xticks(x_pos)
         ax.set_xticklabels(nomes, rotation=45, ha='right', fontsize=10, weight='normal', color='#4a5568')
-        
-        ax.spines['bottom'].set_color('#cbd5e1')
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_visible(False)
+        _limpar_eixo_ranking(ax)
 
-        # 5. Linhas de Referência (Discretas)
+        # Linhas de Referência (Discretas)
         ax.axhline(0, color='#94a3b8', linestyle='-', linewidth=1, zorder=2) 
         ax.axhline(1, color='#cbd5e1', linestyle='--', linewidth=1, zorder=2) 
         ax.axhline(-1, color='#cbd5e1', linestyle='--', linewidth=1, zorder=2) 
 
-        # 6. Rótulos de Valores nas Barras
         for bar in bars:
             height = bar.get_height()
             offset = 0.08 if height >= 0 else -0.25
@@ -217,32 +378,66 @@ class BioMSInterpreter:
                     ha='center', va=va_align, 
                     fontsize=9, weight='normal', color='#2c3e50')
 
-        # 7. Inserção da Logo Customizada no Gráfico (Canto Superior Direito)
-        if logo_path:
-            try:
-                img = Image.open(logo_path)
-                import numpy as np
-                img_array = np.array(img)
-                imagebox = OffsetImage(img_array, zoom=0.12) # Zoom para não ficar gigante
-                ab = AnnotationBbox(imagebox, (0.98, 0.95), xycoords='axes fraction', frameon=False, box_alignment=(1,1))
-                ax.add_artist(ab)
-            except Exception as e:
-                pass # Se a imagem falhar, apenas segue sem quebrar o gráfico
+    def plot_ranking_resumo(self, df_grupo, metrica_z, titulo, cor_positiva="#69FF89", cor_negativa="#bc88ff", logo=None, n_extremos=RANKING_EXTREMOS):
+        """
+        Ranking para grupos grandes, com custo fixo qualquer que seja o tamanho do time:
+        à esquerda a distribuição de todos os atletas (um ponto por atleta, melhores e piores
+        destacados); à direita os N melhores e os N piores em barras.
+        """
+        col_label = 'Label' if 'Label' in df_grupo.columns else 'ID'
+        df_plot = df_grupo.dropna(subset=[metrica_z]).copy()
+        df_plot[col_label] = df_plot[col_label].fillna("Sem ID").astype(str)
+        df_plot = df_plot.sort_values(by=metrica_z, ascending=False)
+        valores = df_plot[metrica_z].to_numpy(dtype=float)
+        nomes = df_plot[col_label].tolist()
+        n = len(valores)
+        k = min(n_extremos, n // 2)
 
-        # 8. Acabamento (SEM GRADES)
-        ax.set_title(titulo, fontsize=14, weight='normal', loc='left', color='#2c3e50', pad=20)
-        ax.set_ylabel("Z-Score", fontsize=10, color='#64748b')
-        ax.tick_params(axis='y', colors='#64748b', length=0)
-        
-        ymax = max(valores.max(), 1.5) + 0.5
-        ymin = min(valores.min(), -1.5) - 0.5
-        ax.set_ylim(ymin, ymax)
-        
-        # GRADE REMOVIDA: A linha abaixo foi apagada para deixar o fundo 100% limpo!
-        ax.grid(False) 
-        
-        plt.subplots_adjust(bottom=0.25, top=0.90, left=0.08, right=0.98)
-        
+        fig, (ax_dist, ax_ext) = nova_figura((16, 6.5), colunas=2, proporcoes=[1, 1.6])
+        fig.patch.set_facecolor("#ffffff")
+
+        # --- Distribuição: pontos espalhados na vertical (jitter fixo: o gráfico não muda entre reruns) ---
+        jitter = np.random.default_rng(0).uniform(-0.35, 0.35, n)
+        cores = np.where(valores >= 0, cor_positiva, cor_negativa)
+        ax_dist.scatter(valores, jitter, s=14, c=cores, alpha=0.6, edgecolors='none', zorder=3)
+        destaque = np.r_[0:k, n - k:n] if k else np.array([], dtype=int)
+        ax_dist.scatter(valores[destaque], jitter[destaque], s=36, facecolors='none', edgecolors='#2c3e50', linewidths=1, zorder=4)
+
+        for z_ref, estilo in ((0, '-'), (1, '--'), (-1, '--')):
+            ax_dist.axvline(z_ref, color='#94a3b8' if z_ref == 0 else '#cbd5e1', linestyle=estilo, linewidth=1, zorder=2)
+        ax_dist.axvline(np.median(valores), color='#2c3e50', linestyle=':', linewidth=1.2, zorder=2)
+
+        _limpar_eixo_ranking(ax_dist)
+        ax_dist.set_yticks([])
+        ax_dist.set_ylim(-0.6, 0.6)
+        ax_dist.set_xlabel("Z-Score", fontsize=10, color='#64748b')
+        ax_dist.tick_params(axis='x', colors='#64748b')
+        ax_dist.set_title(
+            f"Distribuição (N={n}) · mediana {np.median(valores):.2f} · "
+            f"{(valores >= 0).mean():.0%} acima da média",
+            fontsize=10, loc='left', color='#64748b'
+        )
+
+        # --- Extremos: top N, separador e bottom N ---
+        if k:
+            posicoes = list(range(k)) + list(range(k + 1, 2 * k + 1))
+            self._desenhar_barras_ranking(
+                ax_ext, list(valores[:k]) + list(valores[n - k:]),
+                [f"{i + 1}º {nomes[i]}" for i in range(k)] + [f"{i + 1}º {nomes[i]}" for i in range(n - k, n)],
+                cor_positiva, cor_negativa, posicoes=posicoes
+            )
+            ax_ext.text(k, 0, '···', ha='center', va='center', fontsize=14, color='#94a3b8')
+        else:
+            _limpar_eixo_ranking(ax_ext)
+        ax_ext.set_title(f"{k} melhores e {k} piores", fontsize=10, loc='left', color='#64748b')
+        ax_ext.tick_params(axis='y', colors='#64748b', length=0)
+        ax_ext.set_ylim(min(valores.min(), -1.5) - 0.5, max(valores.max(), 1.5) + 0.5)
+
+        if logo:
+            _inserir_logo(ax_ext, logo)
+
+        fig.suptitle(titulo, fontsize=14, x=0.05, ha='left', color='#2c3e50')
+        fig.subplots_adjust(bottom=0.25, top=0.85, left=0.03, right=0.98, wspace=0.08)
         return fig
     
 
@@ -252,9 +447,6 @@ class BioMSInterpreter:
             Gera um gráfico de barras verticais comparando a média normativa 
             com as múltiplas coletas do aluno ao longo do tempo.
             """
-            import matplotlib.pyplot as plt
-            from PIL import Image
-            from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 
             # 1. Preparação dos dados para o gráfico
             # A primeira coluna é forçada a ser a "Média do Grupo"
@@ -267,7 +459,7 @@ class BioMSInterpreter:
             # 2. Configuração do Canvas (Fundo Branco Premium)
             # A largura cresce automaticamente se tiverem muitas coletas!
             largura = max(6, len(datas) * 1.2) 
-            fig, ax = plt.subplots(figsize=(largura, 3.5))
+            fig, ax = nova_figura((largura, 3.5))
             fig.patch.set_facecolor('#ffffff')
             ax.set_facecolor('#ffffff')
 
@@ -305,6 +497,36 @@ class BioMSInterpreter:
             
             ax.set_xlim(-0.75, max(len(datas), 4) - 0.25)
 
-            plt.tight_layout()
+            fig.tight_layout()
             
-            return fig
\ No newline at end of file
+            return fig
+
+    def plot_evolucao_equipe(self, mensal, titulo, cor="#3498db"):
+        """
+        Small multiples da temporada: um painel por distância com a mediana mensal
+        da equipe e a faixa p25-p75 (tempo em minutos; quanto mais baixo, melhor).
+        """
+        distancias = list(dict.fromkeys(mensal['Distância']))
+        fig, eixos = nova_figura((max(4.5, 3.6 * len(distancias)), 3.4), colunas=max(1, len(distancias)))
+        eixos = eixos if isinstance(eixos, list) else [eixos]
+        fig.patch.set_facecolor('#ffffff')
+
+        for ax, dist in zip(eixos, distancias):
+            serie = mensal[mensal['Distância'] == dist]
+            meses = serie['Mes'].dt.strftime('%m/%y').tolist()
+            x = np.arange(len(serie))
+            ax.fill_between(x, serie['p25'] / 60, serie['p75'] / 60, color=cor, alpha=0.18, linewidth=0, zorder=2)
+            ax.plot(x, serie['Mediana'] / 60, color=cor, linewidth=2.2, marker='o', markersize=4, zorder=3)
+
+            ax.set_title(dist, fontsize=12, color='#2c3e50', loc='left')
+            passo = max(1, len(x) // 6)  # no máximo ~6 rótulos de mês por painel
+            ax.set_xticks(x[::passo])
+            ax.set_xticklabels(meses[::passo], fontsize=8, color='#4a5568')
+            ax.tick_params(axis='y', labelsize=8, labelcolor='#4a5568')
+            ax.set_xlim(-0.5, max(len(x), 2) - 0.5)
+
+        eixos[0].set_ylabel('Tempo (min) · menor é melhor', fontsize=9, color='#4a5568')
+        fig.suptitle(titulo, fontsize=14, color='#2c3e50', x=0.01, ha='left')
+        fig.tight_layout()
+        return fig
+
@@ -1,8 +1,15 @@
 from fpdf import FPDF
 import os
-import tempfile
-import matplotlib.pyplot as plt
+import io
+import zlib
+import hashlib
+import numpy as np
+import pandas as pd
+from PIL import Image
 from datetime import datetime
+from src.figuras import renderizar
+from src.interpretation import RANKING_MAX_BARRAS, RANKING_EXTREMOS
+from src.ativos import logo_pdf
 
 def clean_text(text):
     if not isinstance(text, str): return str(text)
@@ -10,17 +17,212 @@ def clean_text(text):
     for char, rep in replacements.items(): text = text.replace(char, rep)
     return text.encode('latin-1', 'ignore').decode('latin-1')
 
+def _linhas_png(pixels):
+    """Prefixa cada linha com o filtro PNG 'None' (0), formato esperado pelo /Predictor 15."""
+    altura = pixels.shape[0]
+    linhas = pixels.reshape(altura, -1)
+    return np.hstack([np.zeros((altura, 1), dtype=np.uint8), linhas]).tobytes()
+
+def _info_imagem(dados):
+    """
+    Converte bytes PNG/JPEG no dicionário de imagem que o FPDF usa internamente,
+    para embutir a imagem a partir da memória.
+    """
+    img = Image.open(io.BytesIO(dados))
+    largura, altura = img.size
+
+    # JPEG RGB/Cinza vai direto, sem recompressão
+    if img.format == 'JPEG' and img.mode in ('RGB', 'L'):
+        cs = 'DeviceRGB' if img.mode == 'RGB' else 'DeviceGray'
+        return {'w': largura, 'h': altura, 'cs': cs, 'bpc': 8, 'f': 'DCTDecode', 'data': dados}
+
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA' if 'A' in img.getbands() or 'transparency' in img.info else 'RGB')
+
+    pixels = np.asarray(img, dtype=np.uint8)
+    info = {
+        'w': largura, 'h': altura, 'cs': 'DeviceRGB', 'bpc': 8, 'f': 'FlateDecode',
+        'dp': f'/Predictor 15 /Colors 3 /BitsPerComponent 8 /Columns {largura}',
+        'data': zlib.compress(_linhas_png(pixels[:, :, :3])),
+    }
+    if img.mode == 'RGBA':
+        # Canal alfa vira a máscara suave (SMask), como o FPDF faz com PNGs transparentes
+        info['smask'] = zlib.compress(_linhas_png(pixels[:, :, 3]))
+    return info
+
+# Geometria dos gráficos vetoriais (a mesma do BioMSInterpreter)
+RADAR_EIXOS = [('(Estrutura)', 'Z_BioMS_1'), ('(Potência)', 'Z_BioMS_5'), ('(Velocidade)', 'Z_BioMS_9'), ('(Integridade)', 'Z_BioMS_8')]
+RADAR_Z_MIN, RADAR_Z_MAX = -2.5, 2.5
+GAUGE_CORES = ['#fca5a5', '#fcd34d', '#e2e8f0', '#93c5fd', '#86efac']
+GAUGE_LIMITES = [-3, -1.5, -0.5, 0.5, 1.5, 3]
+GAUGE_LEGENDAS = ['Desenvolvimento', 'Média Atlética', 'Alta Performance']
+
+def _cor_rgb(cor, alpha=1.0, fundo='#ffffff'):
+    """'#rrggbb' -> (r, g, b). O FPDF 1.7 não tem transparência: alpha < 1 mistura a cor com o fundo."""
+    rgb = [int(cor[i:i + 2], 16) for i in (1, 3, 5)]
+    base = [int(fundo[i:i + 2], 16) for i in (1, 3, 5)]
+    return tuple(round(alpha * c + (1 - alpha) * b) for c, b in zip(rgb, base))
+
+def _bytes_logo_sistema():
+    """Logo do sistema já reduzido para o cabeçalho (JPEG gerado uma vez por processo)."""
+    return logo_pdf()
+
 class PDFReport(FPDF):
     def __init__(self, orientation='P', unit='mm', format='A4'):
         super().__init__(orientation, unit, format)
         self.nome_equipe = ""
         self.is_group = False
-        self.logo_custom_path = None 
+        self.logo_custom = None  # bytes da imagem ou caminho do arquivo
         self.info_referencia = "" 
 
+    def imagem_memoria(self, dados, x=None, y=None, w=0, h=0):
+        """Insere uma imagem a partir de bytes (PNG/JPEG), sem ida e volta pelo disco."""
+        # A chave pelo conteúdo faz imagens repetidas (ex: logos em todas as páginas) entrarem uma vez só
+        chave = f"mem_{hashlib.sha1(dados).hexdigest()}.png"
+        if chave not in self.images:
+            info = _info_imagem(dados)
+            info['i'] = len(self.images) + 1
+            self.images[chave] = info
+            # Máscara suave (SMask) só existe a partir do PDF 1.4, como o FPDF faz nos PNGs com alfa
+            if 'smask' in info and self.pdf_version < '1.4':
+                self.pdf_version = '1.4'
+        self.image(chave, x=x, y=y, w=w, h=h)
+
+    def _imagem_logo(self, logo, x, y, w):
+        if isinstance(logo, (bytes, bytearray)):
+            self.imagem_memoria(bytes(logo), x=x, y=y, w=w)
+        elif logo and os.path.exists(logo):
+            self.image(logo, x=x, y=y, w=w)
+
+    # --- DESENHO VETORIAL (sem matplotlib: primitivas do próprio PDF) ---
+    def _salvar_estado(self):
+        self._out('q')
+        return (self.draw_color, self.fill_color, self.text_color, self.color_flag, self.line_width,
+                (self.font_family, self.font_style, self.font_size_pt))
+
+    def _restaurar_estado(self, estado):
+        # 'Q' devolve o estado gráfico do PDF; aqui alinhamos o que o FPDF acha que está ativo
+        self._out('Q')
+        self.draw_color, self.fill_color, self.text_color, self.color_flag, self.line_width, fonte = estado
+        if fonte[0]:
+            self.set_font(*fonte)
+
+    def _poligono(self, pontos, estilo='D'):
+        """Polígono fechado (o FPDF 1.7 não tem polygon). estilo: 'D', 'F' ou 'DF', como no rect()."""
+        op = {'F': 'f', 'DF': 'B', 'FD': 'B'}.get(estilo, 'S')
+        caminho = [f'{x * self.k:.2f} {(self.h - y) * self.k:.2f}' for x, y in pontos]
+        self._out(' '.join([caminho[0] + ' m'] + [c + ' l' for c in caminho[1:]] + ['h', op]))
+
+    def radar_vetorial(self, resultados, x, y, tamanho):
+        """
+        Radar BioMS (mesma geometria do plot_radar_chart) desenhado direto no PDF.
+        (x, y) é o canto superior esquerdo de um quadrado de 'tamanho' mm.
+        """
+        cx, cy = x + tamanho / 2, y + tamanho / 2
+        raio = tamanho * 0.36
+        escala = tamanho / 90  # 90 mm equivale ao radar do relatório individual
+
+        # Z em [-2.5, 2.5] vira raio em [0, raio]; ângulo 0 à direita, sentido anti-horário
+        def ponto(z, angulo):
+            r = (np.clip(z, RADAR_Z_MIN, RADAR_Z_MAX) - RADAR_Z_MIN) / (RADAR_Z_MAX - RADAR_Z_MIN) * raio
+            return cx + r * np.cos(angulo), cy - r * np.sin(angulo)
+
+        angulos = np.linspace(0, 2 * np.pi, len(RADAR_EIXOS), endpoint=False)
+        valores = [float(resultados.get(k, 0)) for _, k in RADAR_EIXOS]
+        valores = [0.0 if np.isnan(v) else v for v in valores]
+
+        estado = self._salvar_estado()
+        try:
+            # Fundo e anéis de referência (-1.5, 0, +1.5)
+            self.set_fill_color(*_cor_rgb('#eeeeee'))
+            self.set_draw_color(*_cor_rgb('#bcbcbc'))
+            self.set_line_width(0.2 * escala)
+            self.ellipse(cx - raio, cy - raio, 2 * raio, 2 * raio, 'DF')
+            self.set_draw_color(*_cor_rgb('#ffffff'))
+            self.set_line_width(0.25 * escala)
+            for z in (-1.5, 1.5):
+                r = (z - RADAR_Z_MIN) / (RADAR_Z_MAX - RADAR_Z_MIN) * raio
+                self.ellipse(cx - r, cy - r, 2 * r, 2 * r, 'D')
+            for ang in angulos:
+                self.line(cx, cy, *ponto(RADAR_Z_MAX, ang))
+
+            # Média Global (Z=0): disco cinza claro com contorno tracejado
+            media = [ponto(0, a) for a in angulos]
+            self.set_fill_color(*_cor_rgb('#e2e8f0', 0.5, '#eeeeee'))
+            self.set_draw_color(*_cor_rgb('#94a3b8', 0.8, '#eeeeee'))
+            self._set_dash(1.2 * escala, 0.8 * escala)
+            self._poligono(media, 'DF')
+            self._set_dash()
+
+            # Performance do atleta: azul da marca "translúcido" (cor já misturada com o fundo)
+            atleta = [ponto(v, a) for v, a in zip(valores, angulos)]
+            self.set_fill_color(*_cor_rgb('#3498db', 0.2, '#eeeeee'))
+            self._poligono(atleta, 'F')
+            self.set_draw_color(*_cor_rgb('#2980b9'))
+            self.set_line_width(0.6 * escala)
+            self._poligono(atleta, 'D')
+
+            # Rótulos dos eixos
+            self.set_font('Arial', '', 8 * escala)
+            self.set_text_color(*_cor_rgb('#4a5568'))
+            for (rotulo, _), ang in zip(RADAR_EIXOS, angulos):
+                lx, ly = ponto(RADAR_Z_MAX, ang)
+                largura = self.get_string_width(clean_text(rotulo))
+                dx, dy = np.cos(ang), -np.sin(ang)
+                tx = lx + dx * 2 * escala - largura * (0.5 - 0.5 * dx)
+                ty = ly + dy * 3 * escala + 1.2 * escala
+                self.text(tx, ty, clean_text(rotulo))
+
+            # Legenda no canto superior direito
+            self.set_font_size(6 * escala)
+            lx, ly = x + tamanho * 0.74, y + tamanho * 0.04
+            self.set_fill_color(*_cor_rgb('#e2e8f0'))
+            self.rect(lx, ly, 4 * escala, 1.6 * escala, 'F')
+            self.text(lx + 5 * escala, ly + 1.5 * escala, clean_text('Média Global'))
+            self.set_draw_color(*_cor_rgb('#2980b9'))
+            self.line(lx, ly + 4 * escala, lx + 4 * escala, ly + 4 * escala)
+            self.text(lx + 5 * escala, ly + 4.7 * escala, 'Sua Performance')
+        finally:
+            self._restaurar_estado(estado)
+
+    def gauge_vetorial(self, valor_z, x, y, largura, altura=3, titulo=None, legendas=True):
+        """Régua de 5 zonas (mesma do gauge_png do app) com o marcador na posição do Z."""
+        def para_x(z):
+            return x + (z - GAUGE_LIMITES[0]) / (GAUGE_LIMITES[-1] - GAUGE_LIMITES[0]) * largura
+
+        estado = self._salvar_estado()
+        try:
+            if titulo:
+                self.set_font('Arial', 'B', 8)
+                self.set_text_color(*_cor_rgb('#2c3e50'))
+                self.text(x, y - 1, clean_text(titulo))
+
+            for i, cor in enumerate(GAUGE_CORES):
+                self.set_fill_color(*_cor_rgb(cor, 0.8))
+                self.rect(para_x(GAUGE_LIMITES[i]), y, para_x(GAUGE_LIMITES[i + 1]) - para_x(GAUGE_LIMITES[i]), altura, 'F')
+
+            z = 0.0 if valor_z is None or np.isnan(valor_z) else float(np.clip(valor_z, -2.9, 2.9))
+            mx = para_x(z)
+            self.set_draw_color(*_cor_rgb('#2c3e50'))
+            self.set_fill_color(*_cor_rgb('#2c3e50'))
+            self.set_line_width(0.4)
+            self.line(mx, y - altura * 0.3, mx, y + altura * 1.3)
+            self.ellipse(mx - altura * 0.35, y + altura * 0.15, altura * 0.7, altura * 0.7, 'F')
+
+            if legendas:
+                self.set_font('Arial', '', 5)
+                self.set_text_color(*_cor_rgb('#64748b'))
+                # Extremos alinhados às bordas da régua para caber mesmo em larguras pequenas
+                esquerda, meio, direita = [clean_text(r) for r in GAUGE_LEGENDAS]
+                self.text(x, y + altura + 2.5, esquerda)
+                self.text(para_x(0) - self.get_string_width(meio) / 2, y + altura + 2.5, meio)
+                self.text(x + largura - self.get_string_width(direita), y + altura + 2.5, direita)
+        finally:
+            self._restaurar_estado(estado)
+
     def header(self):
         # --- 1. Logo do Sistema (Canto Superior Esquerdo - Padrão) ---
-        logo_sys = "logo.png" if os.path.exists("logo.png") else None
+        logo_sys = _bytes_logo_sistema()
         
         # Layout Específico para Grupo
         if self.is_group:
@@ -48,14 +250,14 @@ class PDFReport(FPDF):
 
             # B. Logos (Direita - Lado a Lado)
             # Logo do Clube (Mais à esquerda do bloco direito) -> x=150
-            if self.logo_custom_path and os.path.exists(self.logo_custom_path):
+            if self.logo_custom:
                 try:
-                    self.image(self.logo_custom_path, x=150, y=8, w=20)
+                    self._imagem_logo(self.logo_custom, x=150, y=8, w=20)
                 except: pass
             
             # Logo BioMS (Mais à direita) -> x=175
             if logo_sys:
-                self.image(logo_sys, x=175, y=8, w=25)
+                self.imagem_memoria(logo_sys, x=175, y=8, w=25)
             
             # Linha separadora
             self.set_y(40)
@@ -65,7 +267,7 @@ class PDFReport(FPDF):
         else:
             # --- Cabeçalho Padrão (Individual) ---
             if logo_sys:
-                self.image(logo_sys, x=85, y=8, w=40)
+                self.imagem_memoria(logo_sys, x=85, y=8, w=40)
                 self.ln(35)
             else:
                 self.set_font('Arial', 'B', 12) # <-- A ÚNICA LINHA ADICIONADA: Declara a fonte antes de escrever
@@ -80,7 +282,7 @@ class PDFReport(FPDF):
         self.cell(0, 10, rodape, 0, 0, 'C')
 
 # --- FUNÇÃO AUXILIAR 1: MODO INDIVIDUAL COMPLETO ---
-def _desenhar_pagina_individual(pdf, atleta, res_finais, relatorio_dict, fig_radar, disclaimer):
+def _desenhar_pagina_individual(pdf, atleta, res_finais, relatorio_dict, disclaimer):
     """Gera uma página completa por atleta (usado no botão Individual)"""
     pdf.add_page()
     pdf.set_auto_page_break(auto=True, margin=15)
@@ -91,18 +293,10 @@ def _desenhar_pagina_individual(pdf, atleta, res_finais, relatorio_dict, fig_rad
     pdf.cell(0, 10, clean_text(f"Relatório de Performance: {nome}"), 0, 1, 'C')
     pdf.ln(5)
 
-    tmp_name = None
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            fig_radar.savefig(tmp.name, dpi=100, bbox_inches='tight')
-            tmp_name = tmp.name
-        pdf.image(tmp_name, x=60, w=90)
-    except Exception as e:
-        print(f"Erro ao gerar imagem no PDF: {e}")
-    finally:
-        # O 'Zelador': garante que o arquivo seja apagado de qualquer jeito
-        if tmp_name and os.path.exists(tmp_name):
-            os.remove(tmp_name)
+    # Radar vetorial: nítido em qualquer zoom e sem custo de renderizar/comprimir PNG
+    y_radar = pdf.get_y()
+    pdf.radar_vetorial(res_finais, x=60, y=y_radar, tamanho=90)
+    pdf.set_y(y_radar + 90)
 
     pdf.ln(5)
 
@@ -118,7 +312,13 @@ def _desenhar_pagina_individual(pdf, atleta, res_finais, relatorio_dict, fig_rad
     pdf.set_x(15)
     pdf.set_font('Arial', '', 11)
     for m in metrics: pdf.cell(largura, 10, f"{res_finais.get(f'P_{m}',0):.0f}/100", 1, 0, 'C')
-    pdf.ln(15)
+    pdf.ln(13)
+
+    # Régua de zonas (Z-score) logo abaixo de cada coluna da tabela
+    y_gauge = pdf.get_y()
+    for i, m in enumerate(metrics):
+        pdf.gauge_vetorial(res_finais.get(f'Z_{m}', 0), x=17 + i * largura, y=y_gauge, largura=largura - 4)
+    pdf.set_y(y_gauge + 10)
 
     pdf.set_font('Arial', 'B', 12)
     pdf.cell(0, 8, clean_text("Relatório Técnico"), 0, 1, 'L')
@@ -135,7 +335,7 @@ def _desenhar_pagina_individual(pdf, atleta, res_finais, relatorio_dict, fig_rad
             pdf.ln(3)
 
 # --- FUNÇÃO AUXILIAR 2: MODO GRUPO (Compacto + Diagnóstico Lateral) ---
-def _desenhar_atleta_compacto(pdf, atleta, res_finais, relatorio_dict, fig_radar):
+def _desenhar_atleta_compacto(pdf, atleta, res_finais, relatorio_dict):
     """
     Desenha o atleta no fluxo contínuo da página com layout de 3 colunas:
     [Radar] | [Scores] | [Diagnóstico]
@@ -161,18 +361,7 @@ def _desenhar_atleta_compacto(pdf, atleta, res_finais, relatorio_dict, fig_radar
     pdf.cell(0, 6, clean_text(f"Atleta: {nome}"), 0, 1, 'L')
 
     # --- COLUNA 1: RADAR (Esquerda) ---
-    tmp_name = None
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            fig_radar.set_size_inches(4, 4)
-            fig_radar.savefig(tmp.name, dpi=80, bbox_inches='tight')
-            tmp_name = tmp.name
-        pdf.image(tmp_name, x=10, y=pdf.get_y(), w=45) # Radar ligeiramente menor
-    except Exception as e:
-        print(f"Erro ao gerar imagem no PDF compacto: {e}")
-    finally:
-        if tmp_name and os.path.exists(tmp_name):
-            os.remove(tmp_name)
+    pdf.radar_vetorial(res_finais, x=10, y=pdf.get_y(), tamanho=45) # Radar ligeiramente menor
 
     # --- COLUNA 2: SCORES (Meio) ---
     # Posiciona à direita do radar
@@ -226,11 +415,11 @@ def _desenhar_atleta_compacto(pdf, atleta, res_finais, relatorio_dict, fig_radar
 
 
 # --- FUNÇÃO PRINCIPAL: CRIAÇÃO DO PDF INDIVIDUAL ---
-def criar_pdf(atleta, res_finais, relatorio_dict, fig_radar, disclaimer):
-    """Chamado pelo botão Individual do app.py"""
+def criar_pdf(atleta, res_finais, relatorio_dict, disclaimer):
+    """Chamado pelo botão Individual do app.py (o radar é desenhado em vetor a partir de res_finais)"""
     pdf = PDFReport()
     pdf.set_margins(15, 15, 15)
-    _desenhar_pagina_individual(pdf, atleta, res_finais, relatorio_dict, fig_radar, disclaimer)
+    _desenhar_pagina_individual(pdf, atleta, res_finais, relatorio_dict, disclaimer)
     return pdf.output(dest='S').encode('latin-1', 'ignore')
 
 
@@ -246,15 +435,9 @@ def criar_relatorio_grupo(df_grupo, interpreter, disclaimer, nome_equipe="Time B
     else:
         pdf.info_referencia = "Banco de Elite Global"
 
-    temp_logo = None
     if logo_file:
-        # Pega a extensão do arquivo original (ex: .jpg)
-        ext = os.path.splitext(logo_file.name)[1] if logo_file.name else ".png"
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            tmp.write(logo_file.getvalue())
-            temp_logo = tmp.name
-        pdf.logo_custom_path = temp_logo
+        # A logo vai direto da memória do upload para o PDF
+        pdf.logo_custom = logo_file.getvalue()
 
         
     pdf.set_margins(15, 15, 15)
@@ -276,31 +459,22 @@ def criar_relatorio_grupo(df_grupo, interpreter, disclaimer, nome_equipe="Time B
         'Z_BioMS_9': 'Potencial de Velocidade: Prontidão neuromuscular (corrida).'
     }
 
+    # Times grandes recebem o resumo (distribuição + extremos), que pede um quadro mais largo
+    tamanho = (14, 6.2) if len(df_grupo) > RANKING_MAX_BARRAS else (8, 5)
+
     for metrica, titulo in metrics_info:
+        png = renderizar(lambda: interpreter.plot_ranking_batch(df_grupo, metrica, titulo), dpi=90, tamanho=tamanho)
         # Imprime a descrição antes do gráfico
         texto_desc = descricoes.get(metrica, "")
         pdf.set_font('Arial', 'I', 9)
         pdf.set_text_color(100, 100, 100) # Cinza
         pdf.cell(0, 5, clean_text(texto_desc), 0, 1, 'L')
         
-        # Gera gráfico
-        fig = interpreter.plot_ranking_batch(df_grupo, metrica, titulo)
-        fig.set_size_inches(8, 5) # Mais estreito
-        
-        path = None
         try:
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                fig.savefig(tmp.name, dpi=90, bbox_inches='tight')
-                path = tmp.name
-            
             # Insere imagem
-            pdf.image(path, x=10, w=190, h=85)
+            pdf.imagem_memoria(png, x=10, w=190, h=85)
         except Exception as e:
             print(f"Erro ao inserir gráfico de ranking: {e}")
-        finally:
-            plt.close(fig)
-            if path and os.path.exists(path):
-                os.remove(path)
         
         pdf.ln(1)
 
@@ -311,31 +485,26 @@ def criar_relatorio_grupo(df_grupo, interpreter, disclaimer, nome_equipe="Time B
     pdf.cell(0, 10, clean_text("Detalhamento Individual & Diagnóstico"), 0, 1, 'C')
     pdf.ln(5)
 
+    # Radares em vetor, direto no PDF (sem matplotlib por atleta)
+    metricas = ['BioMS_1', 'BioMS_5', 'BioMS_8', 'BioMS_9']
     for idx, row in df_grupo.iterrows():
         atleta = row.to_dict()
-        res_finais = {f'Z_{k}': row.get(f'Z_{k}', 0) for k in ['BioMS_1','BioMS_5','BioMS_8','BioMS_9']}
-        res_finais.update({f'P_{k}': row.get(f'P_{k}', 50) for k in ['BioMS_1','BioMS_5','BioMS_8','BioMS_9']})
-        
-        dict_txt = interpreter.gerar_relatorio_inteligente(res_finais)
-        fig = interpreter.plot_radar_chart(res_finais)
-        
-        _desenhar_atleta_compacto(pdf, atleta, res_finais, dict_txt, fig)
-        plt.close(fig)
+        res_finais = {f'Z_{k}': row.get(f'Z_{k}', 0) for k in metricas}
+        res_finais.update({f'P_{k}': row.get(f'P_{k}', 50) for k in metricas})
 
-    if temp_logo and os.path.exists(temp_logo):
-        try: os.remove(temp_logo)
-        except: pass
+        dict_txt = interpreter.gerar_relatorio_inteligente(res_finais)
+        _desenhar_atleta_compacto(pdf, atleta, res_finais, dict_txt)
 
     return pdf.output(dest='S').encode('latin-1', 'ignore')
 
 # --- FUNÇÃO NOVA: CRIAÇÃO DO PDF DO Z-SCORE UNIVERSAL ---
-def criar_relatorio_zscore_universal(df_calc, nome_teste, fig_chart, logo_path=None):
-    """Gera um PDF elegante contendo o gráfico customizado e a tabela de dados"""
+def criar_relatorio_zscore_universal(df_calc, nome_teste, png_grafico, logo=None):
+    """Gera um PDF elegante contendo o gráfico customizado (PNG já renderizado) e a tabela de dados"""
     pdf = PDFReport()
     pdf.is_group = True
     pdf.nome_equipe = clean_text(f"Análise de Desempenho: {nome_teste}")
     pdf.info_referencia = "Média do Grupo"
-    pdf.logo_custom_path = logo_path
+    pdf.logo_custom = logo
     
     pdf.set_margins(15, 15, 15)
     pdf.add_page()
@@ -347,19 +516,10 @@ def criar_relatorio_zscore_universal(df_calc, nome_teste, fig_chart, logo_path=N
     pdf.ln(5)
     
     # 2. Inserir o Gráfico
-    # 2. Inserir o Gráfico
-    img_path = None
     try:
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            fig_chart.savefig(tmp.name, dpi=120, bbox_inches='tight')
-            img_path = tmp.name
-            
-        pdf.image(img_path, x=10, w=190)
+        pdf.imagem_memoria(png_grafico, x=10, w=190)
     except Exception as e:
         print(f"Erro no gráfico Z-Score Universal: {e}")
-    finally:
-        if img_path and os.path.exists(img_path):
-            os.remove(img_path)
             
     pdf.ln(10)
     
@@ -379,13 +539,19 @@ def criar_relatorio_zscore_universal(df_calc, nome_teste, fig_chart, logo_path=N
     return pdf.output(dest='S').encode('latin-1', 'ignore')
 
 # --- FUNÇÃO NOVA: CRIAÇÃO DO PDF NORMATIVO LONGITUDINAL ---
-def criar_relatorio_normativo_longitudinal(nome_aluno, idade, dados_exercicios, logo_path=None, titulo_relatorio="Relatório de Progresso e Força Máxima (1RM)"):
-    """Gera um PDF contendo a evolução longitudinal de 1RM ou Performance do aluno"""
+def criar_relatorio_normativo_longitudinal(nome_aluno, idade, dados_exercicios, logo=None, titulo_relatorio="Relatório de Progresso e Força Máxima (1RM)"):
+    """
+    Gera um PDF contendo a evolução longitudinal de 1RM ou Performance do aluno.
+    Cada item de dados_exercicios traz só dados (df, media_grupo, cor): o gráfico é desenhado aqui.
+    """
+    from src.interpretation import BioMSInterpreter
+    interprete = BioMSInterpreter()
+
     pdf = PDFReport()
     pdf.is_group = True # Usamos o layout de grupo porque ele tem aquele cabeçalho bonito
     pdf.nome_equipe = clean_text(f"Relatório BioMS")
     pdf.info_referencia = "Nos baseamos em periódicos de medicina esportiva e fisiologia do exercício"
-    pdf.logo_custom_path = logo_path
+    pdf.logo_custom = logo
     
     pdf.set_margins(15, 15, 15)
     pdf.add_page()
@@ -406,7 +572,6 @@ def criar_relatorio_normativo_longitudinal(nome_aluno, idade, dados_exercicios,
     # Loop inteligente: vai imprimir um gráfico por exercício e pular página se precisar
     for item in dados_exercicios:
         exe = item['exercicio']
-        fig = item['figura']
         evolucao = item['evolucao']
         
         # Se estiver muito perto do fim da página, cria uma nova
@@ -428,22 +593,106 @@ def criar_relatorio_normativo_longitudinal(nome_aluno, idade, dados_exercicios,
             pdf.cell(0, 6, clean_text(f"Progresso Estimado: {evolucao}"), 0, 1, 'L')
             
         # Inserir o Gráfico
-       # Inserir o Gráfico
-        img_path = None
         try:
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                # Reajusta para caber bem na folha A4
-                fig.set_size_inches(7, 2.6)
-                fig.savefig(tmp.name, dpi=120, bbox_inches='tight')
-                img_path = tmp.name
-                
-            pdf.image(img_path, x=30, w=150)
+            # Reajusta para caber bem na folha A4
+            png = renderizar(
+                lambda: interprete.plot_longitudinal_evolution(item['df'], item['media_grupo'], exe, item.get('cor', '#8b5cf6')),
+                dpi=120, tamanho=(7, 2.6)
+            )
+            pdf.imagem_memoria(png, x=30, w=150)
         except Exception as e:
             print(f"Erro no gráfico Normativo: {e}")
-        finally:
-            if img_path and os.path.exists(img_path):
-                os.remove(img_path)
                 
         pdf.ln(5) # Espaço antes do próximo exercício
 
-    return pdf.output(dest='S').encode('latin-1', 'ignore')
\ No newline at end of file
+    return pdf.output(dest='S').encode('latin-1', 'ignore')
+
+# --- RELATÓRIO DA TEMPORADA (EVOLUÇÃO DE EQUIPES) ---
+def criar_relatorio_temporada(nome_equipe, analise, png_evolucao, logo=None, n_extremos=RANKING_EXTREMOS):
+    """
+    PDF da temporada: small multiples da equipe, resumo por distância e, em cada distância,
+    os n_extremos corredores que mais evoluíram e os que mais regrediram (tamanho fixo, mesmo com centenas de atletas).
+    """
+    from src.evolucao_equipes import formatar_tempo
+
+    resumo, tendencias, sessoes = analise['resumo'], analise['tendencias'], analise['sessoes']
+
+    pdf = PDFReport()
+    pdf.is_group = True
+    pdf.nome_equipe = clean_text(nome_equipe)
+    pdf.info_referencia = "Evolução da temporada (cada corredor comparado com ele mesmo)"
+    pdf.logo_custom = logo
+
+    pdf.set_margins(15, 15, 15)
+    pdf.add_page()
+    pdf.set_y(45)
+
+    pdf.set_font('Arial', 'B', 14)
+    pdf.set_text_color(44, 62, 80)
+    pdf.cell(0, 8, clean_text("Relatório da Temporada - Evolução da Equipe"), 0, 1, 'C')
+    pdf.set_font('Arial', '', 10)
+    pdf.set_text_color(100, 100, 100)
+    periodo = f"{sessoes['Data'].min():%d/%m/%Y} a {sessoes['Data'].max():%d/%m/%Y}"
+    pdf.cell(0, 6, clean_text(f"{len(sessoes)} sessões · {sessoes['Nome'].nunique()} corredores · {periodo}"), 0, 1, 'C')
+    pdf.ln(4)
+
+    try:
+        pdf.imagem_memoria(png_evolucao, x=15, w=180)
+    except Exception as e:
+        print(f"Erro no gráfico da temporada: {e}")
+    pdf.ln(6)
+
+    # Resumo por distância
+    colunas = [('Distância', 28), ('Corredores', 26), ('Sessões', 24), ('Melhoraram', 30), ('Tendência/30d', 32), ('Melhor tempo', 40)]
+    pdf.set_font('Arial', 'B', 9)
+    pdf.set_text_color(44, 62, 80)
+    pdf.set_fill_color(240, 240, 240)
+    for titulo, largura in colunas:
+        pdf.cell(largura, 7, clean_text(titulo), 1, 0, 'C', fill=True)
+    pdf.ln()
+    pdf.set_font('Arial', '', 9)
+    for _, row in resumo.iterrows():
+        melhorou = "-" if pd.isna(row['Melhorou_Pct']) else f"{row['Melhorou_Pct']:.0f}%"
+        tendencia = "-" if pd.isna(row['Tendencia_Mediana']) else f"{row['Tendencia_Mediana']:+.1f}%"
+        valores = [row['Distância'], f"{row['Corredores']:.0f}", f"{row['Sessoes']:.0f}", melhorou, tendencia, formatar_tempo(row['Melhor_Tempo'])]
+        for (_, largura), valor in zip(colunas, valores):
+            pdf.cell(largura, 7, clean_text(str(valor)), 1, 0, 'C')
+        pdf.ln()
+
+    # Destaques por distância (só quem tem tendência calculável)
+    colunas_det = [('Corredor', 70), ('Sessões', 22), ('Primeiro', 26), ('Último', 26), ('Tendência/30d', 36)]
+    for dist in resumo['Distância']:
+        tend_dist = tendencias[(tendencias['Distância'] == dist) & tendencias['Tendencia_Pct'].notna()]
+        if tend_dist.empty:
+            continue
+        ordenado = tend_dist.sort_values('Tendencia_Pct', ascending=False)
+        blocos = [("Maiores evoluções", ordenado.head(n_extremos))]
+        if len(ordenado) > n_extremos:
+            blocos.append(("Maiores quedas", ordenado.tail(min(n_extremos, len(ordenado) - n_extremos)).iloc[::-1]))
+
+        pdf.add_page()
+        pdf.set_y(45)
+        pdf.set_font('Arial', 'B', 12)
+        pdf.set_text_color(44, 62, 80)
+        pdf.cell(0, 8, clean_text(f"Distância: {dist}"), 0, 1, 'L')
+
+        for titulo_bloco, df_bloco in blocos:
+            pdf.set_font('Arial', 'B', 10)
+            pdf.set_text_color(100, 100, 100)
+            pdf.cell(0, 7, clean_text(titulo_bloco), 0, 1, 'L')
+            pdf.set_font('Arial', 'B', 9)
+            pdf.set_text_color(44, 62, 80)
+            for titulo, largura in colunas_det:
+                pdf.cell(largura, 7, clean_text(titulo), 1, 0, 'C', fill=True)
+            pdf.ln()
+            pdf.set_font('Arial', '', 9)
+            for _, row in df_bloco.iterrows():
+                valores = [row['Nome'], f"{row['Sessoes']:.0f}", formatar_tempo(row['Primeiro_Tempo']),
+                           formatar_tempo(row['Ultimo_Tempo']), f"{row['Tendencia_Pct']:+.1f}%"]
+                for (_, largura), valor in zip(colunas_det, valores):
+                    pdf.cell(largura, 7, clean_text(str(valor)), 1, 0, 'L' if largura == 70 else 'C')
+                pdf.ln()
+            pdf.ln(4)
+
+    return pdf.output(dest='S').encode('latin-1', 'ignore')
+
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import threading
+
+# Orçamento de partida a frio do container (ms), do início do script até a primeira pintura
+ORCAMENTO_MS = float(os.environ.get("BIOMS_ORCAMENTO_INICIO_MS", 3000))
+
+# Módulos que só devem ser carregados nos modos que precisam deles
+MODULOS_PESADOS = ("matplotlib", "scipy", "fpdf")
+
+# Só o aviso da partida a frio é do processo; as etapas são de cada execução do script
+_partida_a_frio = {"reportada": False}
+_partida_lock = threading.Lock()
+
+
+class PerfilExecucao:
+    """
+    Etapas de UMA execução do app.py (o Streamlit reexecuta o script a cada interação,
+    em paralelo para sessões diferentes). Criado no topo do script e passado ao main().
+    """
+
+    def __init__(self):
+        self.etapas = [("início", time.perf_counter())]
+
+    def marcar(self, etapa):
+        """Registra o fim de uma etapa desta execução."""
+        self.etapas.append((etapa, time.perf_counter()))
+
+    def relatorio(self):
+        """Tempo de cada etapa, total contra o orçamento e quais módulos pesados já estão na memória."""
+        duracoes = [
+            (nome, (fim - ini) * 1000)
+            for (_, ini), (nome, fim) in zip(self.etapas, self.etapas[1:])
+        ]
+        total_ms = (self.etapas[-1][1] - self.etapas[0][1]) * 1000
+        return {
+            "etapas": duracoes,
+            "total_ms": total_ms,
+            "orcamento_ms": ORCAMENTO_MS,
+            "dentro_do_orcamento": total_ms <= ORCAMENTO_MS,
+            "modulos_pesados": [m for m in MODULOS_PESADOS if m in sys.modules],
+        }
+
+
+def iniciar():
+    """Marca o começo de uma execução do app.py e devolve o perfil dela."""
+    return PerfilExecucao()
+
+
+def reportar(perfil):
+    """
+    Fecha a execução e devolve o relatório. Só a primeira execução do processo
+    (a partida a frio) imprime o resumo no log do container.
+    """
+    r = perfil.relatorio()
+    with _partida_lock:
+        primeira = not _partida_a_frio["reportada"]
+        _partida_a_frio["reportada"] = True
+    if primeira:
+        etapas = " · ".join(f"{nome} {ms:.0f} ms" for nome, ms in r["etapas"])
+        situacao = "ok" if r["dentro_do_orcamento"] else "ACIMA DO ORÇAMENTO"
+        print(
+            f"Partida a frio: {r['total_ms']:.0f} ms / {r['orcamento_ms']:.0f} ms ({situacao}) | {etapas} | "
+            f"módulos pesados carregados: {', '.join(r['modulos_pesados']) or 'nenhum'}"
+        )
+    return r
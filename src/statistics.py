@@ -1,75 +1,113 @@
 import numpy as np
 import pandas as pd
-from scipy import stats
+
+METRICAS = ['BioMS_1', 'BioMS_5', 'BioMS_8', 'BioMS_9']
+
+# Chave usada no índice para a base completa (sem filtro por sexo)
+GRUPO_TODOS = None
+
 
 class BioMSStatistics:
     def __init__(self, df_ref):
         # Recebe a base de referência.
         # Pode ser o Banco de Dados Global (Camada 1) OU o DataFrame do Grupo (Camada 2).
         self.df_ref = df_ref.copy()
-        
-    def compare_athlete(self, atleta_metrics):
-        resultados = {}
 
+        # Índice pré-calculado UMA ÚNICA VEZ: para cada sexo (e para a base toda),
+        # guardamos os vetores limpos e ordenados de cada métrica + mu/sigma em cache.
+        # Assim, cada atleta custa apenas uma busca binária por métrica.
+        self._indice = self._construir_indice()
+
+    # --- CONSTRUÇÃO DO ÍNDICE ---
+    def _construir_indice(self):
+        indice = {GRUPO_TODOS: self._indexar_grupo(self.df_ref)}
+
+        if 'SEXO' in self.df_ref.columns:
+            # Filtro robusto para garantir tipos compatíveis
+            col_sexo_db = pd.to_numeric(self.df_ref['SEXO'], errors='coerce').fillna(0).astype(int)
+            for sexo, df_grupo in self.df_ref.groupby(col_sexo_db.values):
+                # [AJUSTE FUNDAMENTAL PARA GRUPOS/TIMES]
+                # Reduzimos o fallback de 10 para 3.
+                # Motivo: Em análises intra-grupo (times), é comum ter poucos atletas (ex: 5 titulares).
+                # Se for < 3, o desvio padrão não é confiável, então aí sim usamos o 'df_ref' (grupo todo misto) como fallback.
+                if len(df_grupo) >= 3:
+                    indice[int(sexo)] = self._indexar_grupo(df_grupo)
+
+        return indice
+
+    def _indexar_grupo(self, df_grupo):
+        grupo = {}
+        for col in METRICAS:
+            if col not in df_grupo.columns:
+                continue
+
+            # LIMPEZA ESTATÍSTICA CRÍTICA:
+            # 1. Converte para numérico
+            # 2. Substitui Infinitos por NaN
+            # 3. Remove NaNs
+            dados = pd.to_numeric(df_grupo[col], errors='coerce') \
+                      .replace([np.inf, -np.inf], np.nan) \
+                      .dropna()
+
+            # Só indexa se sobrar dados válidos após a limpeza
+            if dados.empty:
+                continue
+
+            grupo[col] = {
+                'valores': np.sort(dados.to_numpy(dtype=float)),
+                'mu': dados.mean(),
+                'sigma': dados.std(ddof=1),
+            }
+        return grupo
+
+    def _grupo_do_atleta(self, atleta_metrics):
         # 1. Identificar o Grupo de Comparação (Filtro por Sexo)
         try:
             sexo_atleta = int(atleta_metrics.get('SEXO', 0))
-            
-            # Filtro robusto para garantir tipos compatíveis
-            if 'SEXO' in self.df_ref.columns:
-                col_sexo_db = pd.to_numeric(self.df_ref['SEXO'], errors='coerce').fillna(0).astype(int)
-                df_grupo = self.df_ref[col_sexo_db == sexo_atleta].copy()
-            else:
-                # Se não houver coluna sexo, usa a base toda
-                df_grupo = self.df_ref.copy()
-            
-        except Exception as e:
+        except Exception:
             # Em caso de erro, usa a base completa fornecida
-            df_grupo = self.df_ref.copy()
+            return self._indice[GRUPO_TODOS]
+
+        # Se não houver coluna sexo (ou o grupo for pequeno demais), usa a base toda
+        return self._indice.get(sexo_atleta, self._indice[GRUPO_TODOS])
 
-        # [AJUSTE FUNDAMENTAL PARA GRUPOS/TIMES]
-        # Reduzimos o fallback de 10 para 3. 
-        # Motivo: Em análises intra-grupo (times), é comum ter poucos atletas (ex: 5 titulares).
-        # Se for < 3, o desvio padrão não é confiável, então aí sim usamos o 'df_ref' (grupo todo misto) como fallback.
-        if df_grupo.empty or len(df_grupo) < 3:
-            df_grupo = self.df_ref.copy()
+    @staticmethod
+    def _percentil(valores_ordenados, val):
+        """
+        Percentil por busca binária, equivalente a scipy.stats.percentileofscore(kind='rank').
+        """
+        if np.isnan(val):
+            return 0.0
+        n = len(valores_ordenados)
+        esquerda = np.searchsorted(valores_ordenados, val, side='left')
+        direita = np.searchsorted(valores_ordenados, val, side='right')
+        return (esquerda + direita + (direita > esquerda)) * (50.0 / n)
+
+    def compare_athlete(self, atleta_metrics):
+        resultados = {}
+        grupo = self._grupo_do_atleta(atleta_metrics)
 
         # 2. Cálculos Estatísticos (Z-Score e Percentil)
-        metricas = ['BioMS_1', 'BioMS_5', 'BioMS_8', 'BioMS_9']
-        
-        for col in metricas:
+        for col in METRICAS:
             val = atleta_metrics.get(col)
-            
-            # Só calcula se o valor do atleta existe e a coluna existe no banco/grupo
-            if val is not None and col in df_grupo.columns:
-                
-                # LIMPEZA ESTATÍSTICA CRÍTICA:
-                # 1. Converte para numérico
-                # 2. Substitui Infinitos por NaN
-                # 3. Remove NaNs
-                dados = pd.to_numeric(df_grupo[col], errors='coerce') \
-                          .replace([np.inf, -np.inf], np.nan) \
-                          .dropna()
-                
-                # Só prossegue se sobrar dados válidos após a limpeza
-                if not dados.empty:
-                    mu = dados.mean()
-                    sigma = dados.std(ddof=1)
-                    
-                    # Evita divisão por zero no Z-Score se todos os valores forem iguais (sigma=0)
-                    if sigma > 1e-6:
-                        z_score = (val - mu) / sigma
-                        percentil = stats.percentileofscore(dados, val)
-                    else:
-                        # Se não há variação no grupo (todos iguais), o score é neutro (0)
-                        z_score = 0
-                        percentil = 50
-                    
-                    resultados[f'Z_{col}'] = z_score
-                    resultados[f'P_{col}'] = percentil
+
+            # Só calcula se o valor do atleta existe e a coluna tem dados válidos no banco/grupo
+            if val is not None and col in grupo:
+                ref = grupo[col]
+                mu = ref['mu']
+                sigma = ref['sigma']
+
+                # Evita divisão por zero no Z-Score se todos os valores forem iguais (sigma=0)
+                if sigma > 1e-6:
+                    z_score = (val - mu) / sigma
+                    percentil = self._percentil(ref['valores'], val)
                 else:
-                    resultados[f'Z_{col}'] = 0
-                    resultados[f'P_{col}'] = 50
+                    # Se não há variação no grupo (todos iguais), o score é neutro (0)
+                    z_score = 0
+                    percentil = 50
+
+                resultados[f'Z_{col}'] = z_score
+                resultados[f'P_{col}'] = percentil
             else:
                 resultados[f'Z_{col}'] = 0
                 resultados[f'P_{col}'] = 50
@@ -78,7 +116,75 @@ class BioMSStatistics:
         z1 = resultados.get('Z_BioMS_1', 0)
         z9 = resultados.get('Z_BioMS_9', 0)
         resultados['Classificacao'] = self._definir_quadrante(z1, z9)
-        
+
+        return resultados
+
+    def compare_group(self, df):
+        """
+        Versão vetorizada do compare_athlete para o time inteiro.
+        Devolve um DataFrame (mesmo índice de 'df') com as colunas Z_/P_ e a 'Classificacao'.
+        """
+        resultados = pd.DataFrame(index=df.index)
+
+        # 1. Chave do grupo de cada atleta (mesma regra do compare_athlete)
+        if 'SEXO' in df.columns:
+            sexo = np.trunc(pd.to_numeric(df['SEXO'], errors='coerce').to_numpy(dtype=float))
+        else:
+            sexo = np.zeros(len(df))
+
+        chaves = np.full(len(df), GRUPO_TODOS, dtype=object)
+        for chave in self._indice:
+            if chave is not GRUPO_TODOS:
+                chaves[sexo == chave] = chave
+
+        # 2. Cálculos Estatísticos (Z-Score e Percentil) por grupo, em bloco
+        for col in METRICAS:
+            z_col = np.zeros(len(df))
+            p_col = np.full(len(df), 50.0)
+
+            if col in df.columns:
+                vals = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+
+                for chave in set(chaves):
+                    ref = self._indice[chave].get(col)
+                    if ref is None:
+                        continue
+
+                    mask = chaves == chave
+                    if ref['sigma'] > 1e-6:
+                        v = vals[mask]
+                        ordenados = ref['valores']
+                        esquerda = np.searchsorted(ordenados, v, side='left')
+                        direita = np.searchsorted(ordenados, v, side='right')
+                        percentil = (esquerda + direita + (direita > esquerda)) * (50.0 / len(ordenados))
+
+                        z_col[mask] = (v - ref['mu']) / ref['sigma']
+                        p_col[mask] = np.where(np.isnan(v), 0.0, percentil)
+                    # Sem variação no grupo: mantém o score neutro (Z=0, P=50)
+
+            resultados[f'Z_{col}'] = z_col
+            resultados[f'P_{col}'] = p_col
+
+        # 3. Classificação por Quadrante (mesmos cortes do _definir_quadrante)
+        z1 = resultados['Z_BioMS_1'].to_numpy()
+        z9 = resultados['Z_BioMS_9'].to_numpy()
+        cut = 0.2
+        resultados['Classificacao'] = np.select(
+            [
+                (z1 >= cut) & (z9 >= cut),
+                (z1 >= cut) & (z9 < cut),
+                (z1 < cut) & (z9 >= cut),
+                (z1 < -0.5) & (z9 < -0.5),
+            ],
+            [
+                "💎 Atleta Híbrido (Elite)",
+                "🚜 Trator (Força Pura)",
+                "⚡ Velocista (Motor Leve)",
+                "🚑 Destreinado/Risco",
+            ],
+            default="⚖️ Balanceado (Em Desenvolvimento)"
+        )
+
         return resultados
 
     def _definir_quadrante(self, z_struct, z_power):
@@ -86,16 +192,16 @@ class BioMSStatistics:
         Cruzamento de BioMS-1 (Estrutura/Massa) com BioMS-5 (Potência/Qualidade).
         """
         if z_struct is None or z_power is None: return "Indefinido"
-        
+
         cut = 0.2
-        
+
         if z_struct >= cut and z_power >= cut:
-            return "💎 Atleta Híbrido (Elite)" 
+            return "💎 Atleta Híbrido (Elite)"
         elif z_struct >= cut and z_power < cut:
-            return "🚜 Trator (Força Pura)" 
+            return "🚜 Trator (Força Pura)"
         elif z_struct < cut and z_power >= cut:
-            return "⚡ Velocista (Motor Leve)" 
+            return "⚡ Velocista (Motor Leve)"
         elif z_struct < -0.5 and z_power < -0.5:
-            return "🚑 Destreinado/Risco" 
+            return "🚑 Destreinado/Risco"
         else:
-            return "⚖️ Balanceado (Em Desenvolvimento)"
\ No newline at end of file
+            return "⚖️ Balanceado (Em Desenvolvimento)"
@@ -0,0 +1,113 @@
+import socket
+import threading
+import time
+
+import pytest
+
+import api_client
+from api_client import BioMSApiClient, CircuitBreaker, CircuitoAberto
+
+
+@pytest.fixture
+def servidor_mudo():
+    """Aceita conexões e nunca responde (backend travado): toda leitura estoura o timeout."""
+    escuta = socket.socket()
+    escuta.bind(("127.0.0.1", 0))
+    escuta.listen(64)
+    abertas = []
+
+    def aceitar():
+        while True:
+            try:
+                conexao, _ = escuta.accept()
+            except OSError:
+                return
+            abertas.append(conexao)
+
+    threading.Thread(target=aceitar, daemon=True).start()
+    yield f"http://127.0.0.1:{escuta.getsockname()[1]}"
+    escuta.close()
+    for conexao in abertas:
+        conexao.close()
+
+
+def _cliente_meio_aberto(monkeypatch, erro):
+    cliente = BioMSApiClient(base_url="http://bioms.invalido", tentativas=0)
+    cliente.circuito = CircuitBreaker(falhas_para_abrir=1, resfriamento=0)
+    cliente.circuito.registrar_falha()  # abre o circuito; com resfriamento 0 a próxima chamada é o teste
+
+    def request(*args, **kwargs):
+        raise erro
+
+    monkeypatch.setattr(cliente.session, "request", request)
+    return cliente
+
+
+def test_excecao_fora_do_requests_resolve_chamada_de_teste(monkeypatch):
+    cliente = _cliente_meio_aberto(monkeypatch, ValueError("JSON inválido no adaptador"))
+
+    with pytest.raises(ValueError):
+        cliente._requisitar("GET", "/lista-exercicios", timeout=1)
+
+    # A chamada de teste falhou: o circuito reabre, mas não fica preso com o teste "em andamento"
+    assert cliente.circuito.estado == "aberto"
+    assert cliente.circuito._teste_em_andamento is False
+    assert cliente.circuito.permitir() is True
+
+
+def test_circuito_aberto_nao_toca_na_rede(monkeypatch):
+    cliente = _cliente_meio_aberto(monkeypatch, AssertionError("não deveria chamar a rede"))
+    cliente.circuito.resfriamento = api_client.RESFRIAMENTO_CIRCUITO
+
+    with pytest.raises(CircuitoAberto):
+        cliente._requisitar("GET", "/lista-exercicios", timeout=1)
+
+
+def test_servidor_travado_abre_o_circuito_em_poucos_segundos(servidor_mudo):
+    cliente = BioMSApiClient(base_url=servidor_mudo, tentativas=3, backoff=0, timeouts={"/calcular": 0.2})
+
+    inicio = time.monotonic()
+    respostas = [cliente.calcular({"ID": i}) for i in range(api_client.FALHAS_PARA_ABRIR + 1)]
+    decorrido = time.monotonic() - inicio
+
+    # O circuito abre depois de FALHAS_PARA_ABRIR timeouts; a chamada seguinte falha sem tocar na rede
+    assert cliente.circuito.estado == "aberto"
+    assert decorrido < api_client.FALHAS_PARA_ABRIR * 0.2 + 2
+    assert respostas[-1].get("circuito_aberto") is True
+
+
+def test_novas_tentativas_param_quando_o_circuito_abre(servidor_mudo):
+    cliente = BioMSApiClient(base_url=servidor_mudo, tentativas=20, backoff=0, timeouts={"/lista-exercicios": 0.2})
+
+    inicio = time.monotonic()
+    with pytest.raises(CircuitoAberto):
+        cliente._requisitar("GET", "/lista-exercicios")
+
+    # Uma única chamada com 20 novas tentativas para na 5ª falha, sem esgotar as outras 16
+    assert cliente.circuito.falhas_seguidas == api_client.FALHAS_PARA_ABRIR
+    assert time.monotonic() - inicio < api_client.FALHAS_PARA_ABRIR * 0.2 + 2
+
+
+def test_timeout_de_leitura_em_post_nao_e_repetido(servidor_mudo):
+    cliente = BioMSApiClient(base_url=servidor_mudo, tentativas=3, backoff=0, timeouts={"/calcular": 0.2})
+
+    inicio = time.monotonic()
+    resposta = cliente.calcular({"ID": 1})
+
+    assert "erro" in resposta
+    assert cliente.circuito.falhas_seguidas == 1
+    assert time.monotonic() - inicio < 0.2 * 2
+
+
+def test_timeout_de_cold_start_so_antes_da_primeira_resposta():
+    saude = api_client.SaudeBackend()
+    assert saude.timeout_para("/calcular", 10) == api_client.TIMEOUT_FRIO
+
+    # Depois de uma falha o backend fica 'suspeito' e a rota volta ao seu timeout padrão
+    saude.registrar(10.0, sucesso=False, rota="/calcular")
+    assert saude.estado == "suspeito"
+    assert saude.timeout_para("/calcular", 10) == 10
+
+    saude.registrar(0.5, sucesso=True, rota="/calcular")
+    assert saude.estado == "quente"
+    assert saude.timeout_para("/calcular", 10) == api_client.TIMEOUT_MINIMO
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+import api_client
+from api_client import BioMSApiClient
+from servidor_api_local import calcular_atleta, criar_servidor
+
+
+def _atleta(i):
+    return {"ID": f"A{i:02d}", "HEIGHT": 170 + i, "WEIGHT": 60 + i, "R": 500 + 10 * i, "Xc": 50 + i}
+
+
+def _subir_servidor(monkeypatch, suporta_lote):
+    """Sobe o servidor local numa porta livre e aponta o cliente compartilhado para ele."""
+    servidor = criar_servidor(porta=0, suporta_lote=suporta_lote)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    cliente = BioMSApiClient(base_url=f"http://127.0.0.1:{servidor.server_port}", tentativas=0)
+    monkeypatch.setattr(api_client, "_cliente", cliente)
+    return servidor, cliente
+
+
+@pytest.fixture
+def servidor_com_lote(monkeypatch):
+    servidor, cliente = _subir_servidor(monkeypatch, suporta_lote=True)
+    yield cliente
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def servidor_sem_lote(monkeypatch):
+    servidor, cliente = _subir_servidor(monkeypatch, suporta_lote=False)
+    yield cliente
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_lote_usa_rota_calcular_lote(servidor_com_lote):
+    atletas = [_atleta(i) for i in range(5)]
+
+    resultados = api_client.chamar_api_bioms_batch(atletas)
+
+    assert servidor_com_lote.suporta_lote is True
+    assert resultados == [calcular_atleta(a) for a in atletas]
+
+
+def test_sem_lote_cai_para_chamadas_individuais(servidor_sem_lote):
+    atletas = [_atleta(i) for i in range(5)]
+
+    resultados = api_client.chamar_api_bioms_batch(atletas)
+
+    # O 404 em /calcular-lote fica lembrado e os atletas vão um a um por /calcular
+    assert servidor_sem_lote.suporta_lote is False
+    assert resultados == [calcular_atleta(a) for a in atletas]
+
+
+@pytest.mark.parametrize("fixture", ["servidor_com_lote", "servidor_sem_lote"])
+def test_ordem_preservada_entre_lotes(request, fixture):
+    request.getfixturevalue(fixture)
+    atletas = [_atleta(i) for i in range(10)]
+    # Um atleta inválido no meio não pode deslocar os demais
+    atletas[4] = dict(atletas[4], R=0)
+    recebidos = {}
+    progresso = []
+
+    resultados = api_client.chamar_api_bioms_batch(
+        atletas, tamanho_lote=3, progresso=lambda c, t: progresso.append(c),
+        ao_receber=lambda posicao, res: recebidos.setdefault(posicao, res),
+    )
+
+    if fixture == "servidor_com_lote":
+        assert progresso == [3, 6, 9, 10]
+
+    assert [r.get("ID") for r in resultados if "erro" not in r] == [a["ID"] for i, a in enumerate(atletas) if i != 4]
+    assert "erro" in resultados[4]
+    assert recebidos == dict(enumerate(resultados))